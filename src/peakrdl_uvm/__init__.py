@@ -1,3 +1,8 @@
 from .__about__ import __version__
 
 from .exporter import UVMExporter
+from .profiler import ExportProfiler
+from .address_table import AddressTable
+from .field_access import get_field_access, FIELD_ACCESS_TABLE
+from .register_db import RegisterDB
+from .plan import ExportPlan
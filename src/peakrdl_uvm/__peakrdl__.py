@@ -1,13 +1,52 @@
 from typing import TYPE_CHECKING
+import functools
 
 from peakrdl.plugins.exporter import ExporterSubcommandPlugin #pylint: disable=import-error
 from peakrdl.config import schema #pylint: disable=import-error
 
 from .exporter import UVMExporter
+from .profiler import ExportProfiler
+from .address_table import AddressTable
+from .watch import run_watcher
 
 if TYPE_CHECKING:
     import argparse
+    from typing import List
     from systemrdl.node import AddrmapNode
+    from peakrdl.plugins.importer import ImporterPlugin #pylint: disable=import-error
+
+
+# Keywords that can be used to override export options in --target
+TARGET_OPTIONS = {
+    "package": ("export_as_package", True),
+    "header": ("export_as_package", False),
+    "lexical": ("reuse_class_definitions", True),
+    "hier": ("reuse_class_definitions", False),
+    "factory": ("use_uvm_factory", True),
+    "no-factory": ("use_uvm_factory", False),
+    "lazy-build": ("lazy_build", True),
+    "no-lazy-build": ("lazy_build", False),
+    "decode": ("decode_function", True),
+    "no-decode": ("decode_function", False),
+}
+
+
+def parse_target(spec: str, base_options: dict) -> tuple:
+    """
+    Parse a --target FILE[:OPTIONS] argument into a (path, options) tuple
+    """
+    options = dict(base_options)
+    path, sep, keywords = spec.rpartition(":")
+    if not sep or ("/" in keywords) or ("\\" in keywords):
+        # No options given. The colon, if any, is part of a Windows path
+        return spec, options
+
+    for keyword in keywords.split(","):
+        if keyword not in TARGET_OPTIONS:
+            raise ValueError("Unknown --target option '%s'" % keyword)
+        name, value = TARGET_OPTIONS[keyword]
+        options[name] = value
+    return path, options
 
 
 class Exporter(ExporterSubcommandPlugin):
@@ -16,8 +55,13 @@ class Exporter(ExporterSubcommandPlugin):
     cfg_schema = {
         "user_template_dir": schema.DirectoryPath(),
         "user_template_context": schema.UserMapping(schema.String()),
+        "template_cache_dir": schema.DirectoryPath(shall_exist=False),
     }
 
+    # Exporter re-used by each export of the --watch and --serve modes, so
+    # that templates are only loaded once
+    uvm_exporter = None
+
 
     def add_exporter_arguments(self, arg_group: 'argparse.ArgumentParser') -> None:
         arg_group.add_argument(
@@ -40,6 +84,29 @@ class Exporter(ExporterSubcommandPlugin):
             """
         )
 
+        arg_group.add_argument(
+            "--structural-class-names",
+            dest="structural_class_names",
+            default=False,
+            action="store_true",
+            help="""With the 'lexical' type style, name the classes of anonymous
+            component definitions after their structure, so that identical
+            anonymous definitions share a class
+            """
+        )
+
+        arg_group.add_argument(
+            "--merge-similar-classes",
+            dest="merge_similar_classes",
+            default=False,
+            action="store_true",
+            help="""Share one class between instances that would otherwise get
+            a class each, if they only differ by the reset values or HDL paths
+            of their descendants. The differences are applied after building
+            each instance
+            """
+        )
+
         arg_group.add_argument(
             "--use-factory",
             dest="use_factory",
@@ -48,16 +115,302 @@ class Exporter(ExporterSubcommandPlugin):
             help="If set, class definitions and class instances are created using the UVM factory"
         )
 
+        arg_group.add_argument(
+            "--lazy-build",
+            dest="lazy_build",
+            default=False,
+            action="store_true",
+            help="""If set, register block children are built on first access
+            through generated get_<child>() functions, or by build_all()
+            """
+        )
 
-    def do_export(self, top_node: 'AddrmapNode', options: 'argparse.Namespace') -> None:
-        x = UVMExporter(
-            user_template_dir=self.cfg['user_template_dir'],
-            user_template_context=self.cfg['user_template_context']
+        arg_group.add_argument(
+            "--decode-function",
+            dest="decode_function",
+            default=False,
+            action="store_true",
+            help="""If set, register blocks get a generated decode_reg(offset)
+            function that returns the register at an address offset
+            """
+        )
+
+        arg_group.add_argument(
+            "--burst-helpers",
+            dest="burst_helpers",
+            default=False,
+            action="store_true",
+            help="""If set, register blocks get generated burst_write() and
+            burst_read() tasks that access runs of contiguous registers through
+            an extensible burst hook
+            """
+        )
+
+        arg_group.add_argument(
+            "--register-masks",
+            dest="register_masks",
+            default=False,
+            action="store_true",
+            help="""If set, register classes declare their reset value and
+            field access masks as localparam constants
+            """
+        )
+
+        arg_group.add_argument(
+            "--fast-mirror-check",
+            dest="fast_mirror_check",
+            default=False,
+            action="store_true",
+            help="""If set, register classes override do_check() to compare
+            mirrored values with a precomputed mask of the bits to check
+            """
+        )
+
+        arg_group.add_argument(
+            "--compact-hdl-paths",
+            dest="compact_hdl_paths",
+            default=False,
+            action="store_true",
+            help="""If set, per-bit field HDL path slices of consecutive signal
+            bits are merged, and are loaded by a function of each register
+            class rather than separately for each register instance
+            """
+        )
+
+        arg_group.add_argument(
+            "--include-coverage",
+            dest="include_coverage",
+            default=False,
+            action="store_true",
+            help="""Generate field value (UVM_CVR_FIELD_VALS) and address map
+            (UVM_CVR_ADDR_MAP) coverage models
+            """
+        )
+
+        arg_group.add_argument(
+            "--vreg-array-threshold",
+            dest="vreg_array_threshold",
+            metavar="N",
+            type=int,
+            default=None,
+            help="""Model register arrays with N or more elements as a virtual
+            register mapped onto a uvm_mem instead of an array of uvm_reg objects
+            """
         )
-        x.export(
-            top_node,
-            options.output,
-            export_as_package=(options.file_type == "package"),
-            reuse_class_definitions=(options.type_style == "lexical"),
-            use_uvm_factory=options.use_factory
+
+        arg_group.add_argument(
+            "--build-table-threshold",
+            dest="build_table_threshold",
+            metavar="N",
+            type=int,
+            default=None,
+            help="""Build the registers of blocks that have N or more registers
+            that are not arrays in a loop over a static table, instead of with
+            separate statements for each register
+            """
+        )
+
+        arg_group.add_argument(
+            "--split-by",
+            dest="split_by",
+            choices=['class', 'block'],
+            default=None,
+            help="""Split the register model into multiple files that are
+            included by the output file. 'class' writes one file per class
+            definition. 'block' writes one file per child block of the top-level node,
+            or per descendant block at --split-depth
+            """
+        )
+
+        arg_group.add_argument(
+            "--split-depth",
+            dest="split_depth",
+            metavar="N",
+            type=int,
+            default=1,
+            help="""Depth of the blocks below the top-level node that class
+            definitions are grouped by, for --split-by block and for rendering
+            with --jobs. [1]
+            """
+        )
+
+        arg_group.add_argument(
+            "--jobs", "-j",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="""Number of worker processes used to render the register
+            model, and to export --target variants. [1]
+            """
+        )
+
+        arg_group.add_argument(
+            "--state-dir",
+            dest="state_dir",
+            metavar="DIR",
+            default=None,
+            help="""Export incrementally. Rendered classes are kept in DIR and
+            re-used by later exports if their inputs did not change. Output
+            files are only rewritten if their contents changed
+            """
+        )
+
+        arg_group.add_argument(
+            "--deterministic",
+            dest="deterministic",
+            default=False,
+            action="store_true",
+            help="""Emit class definitions sorted by name, independently of the
+            order of the input, and write a manifest of content hashes of each
+            class and output file to FILE.manifest.json
+            """
+        )
+
+        arg_group.add_argument(
+            "--target",
+            dest="targets",
+            metavar="FILE[:OPTIONS]",
+            action="append",
+            default=[],
+            help="""Also export a variant of the register model to FILE.
+            Variants share a single analysis of the design, and are rendered
+            concurrently if --jobs is set. OPTIONS is a comma-separated list
+            that overrides the options of the main output:
+            %s
+            """ % ", ".join(TARGET_OPTIONS.keys())
+        )
+
+        arg_group.add_argument(
+            "--address-map",
+            dest="address_map",
+            metavar="FILE",
+            default=None,
+            help="""Also write the flattened address map of every register and
+            memory to a CSV file
+            """
+        )
+
+        arg_group.add_argument(
+            "--register-db",
+            dest="register_db",
+            metavar="FILE",
+            default=None,
+            help="""Also write a database of every register and field, with
+            their addresses, access policies, reset values and HDL paths.
+            Written as JSON if FILE ends with .json, otherwise in a compact
+            binary format
+            """
+        )
+
+        arg_group.add_argument(
+            "--watch",
+            dest="watch",
+            default=False,
+            action="store_true",
+            help="""Keep running, and export again whenever the input files, or
+            the RDL files in their directories or in the include search paths,
+            are modified. Exports are incremental, see --state-dir
+            """
+        )
+
+        arg_group.add_argument(
+            "--serve",
+            dest="serve",
+            metavar="ADDRESS",
+            default=None,
+            help="""Keep running, and accept export requests on a local socket.
+            ADDRESS is a TCP port number on the loopback interface, or the path
+            of a Unix domain socket. Each connection sends a single line:
+            'export' to export if the input files were modified, 'force' to
+            export unconditionally, or 'stop'. The server replies with a status
+            line once done
+            """
         )
+
+        arg_group.add_argument(
+            "--poll-interval",
+            dest="poll_interval",
+            metavar="SECONDS",
+            type=float,
+            default=0.5,
+            help="Time between checks for modified input files with --watch. [0.5]"
+        )
+
+        arg_group.add_argument(
+            "--profile",
+            dest="profile",
+            metavar="FILE",
+            default=None,
+            help="""Profile the export and write a JSON report of the time spent
+            in each export phase, template macro and template helper to FILE
+            """
+        )
+
+
+    def main(self, importers: 'List[ImporterPlugin]', options: 'argparse.Namespace') -> None:
+        if options.watch or options.serve:
+            run_watcher(functools.partial(super().main, importers, options), options)
+        else:
+            super().main(importers, options)
+
+
+    def do_export(self, top_node: 'AddrmapNode', options: 'argparse.Namespace') -> None:
+        if self.uvm_exporter is None:
+            self.uvm_exporter = UVMExporter(
+                user_template_dir=self.cfg['user_template_dir'],
+                user_template_context=self.cfg['user_template_context'],
+                template_cache_dir=self.cfg['template_cache_dir']
+            )
+        x = self.uvm_exporter
+        if options.profile:
+            profiler = ExportProfiler()
+        else:
+            profiler = None
+
+        export_options = {
+            "export_as_package": (options.file_type == "package"),
+            "reuse_class_definitions": (options.type_style == "lexical"),
+            "structural_class_names": options.structural_class_names,
+            "merge_similar_classes": options.merge_similar_classes,
+            "use_uvm_factory": options.use_factory,
+            "lazy_build": options.lazy_build,
+            "decode_function": options.decode_function,
+            "burst_helpers": options.burst_helpers,
+            "register_masks": options.register_masks,
+            "fast_mirror_check": options.fast_mirror_check,
+            "compact_hdl_paths": options.compact_hdl_paths,
+            "build_table_threshold": options.build_table_threshold,
+            "include_coverage": options.include_coverage,
+            "vreg_array_threshold": options.vreg_array_threshold,
+            "split_by": options.split_by,
+            "jobs": options.jobs,
+            "split_depth": options.split_depth,
+            "state_dir": options.state_dir,
+            "deterministic": options.deterministic,
+        }
+
+        if options.targets:
+            # Only the main output writes the register database
+            targets = [(options.output, dict(export_options, register_db=options.register_db))]
+            for spec in options.targets:
+                targets.append(parse_target(spec, export_options))
+            x.export_many(
+                top_node,
+                targets,
+                jobs=options.jobs,
+                profiler=profiler
+            )
+        else:
+            x.export(
+                top_node,
+                options.output,
+                profiler=profiler,
+                register_db=options.register_db,
+                **export_options
+            )
+
+        if options.address_map:
+            AddressTable(top_node).dump(options.address_map)
+
+        if profiler is not None:
+            profiler.write_json(options.profile)
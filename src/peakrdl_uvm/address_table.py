@@ -0,0 +1,328 @@
+import csv
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from typing import Iterator, List, Optional
+
+from systemrdl.node import Node, RootNode, AddressableNode, RegNode, MemNode, RegfileNode, AddrmapNode
+
+# Component kind codes stored in the "kind" column
+KIND_NAMES = ("addrmap", "regfile", "reg", "mem")
+
+# Result of AddressTable.lookup()
+#   path: Hierarchical path of the register or memory, including array indexes
+#   node: Register or memory node. For arrays, this is the node of the whole array
+#   address: Absolute address of the register, memory or array element
+#   offset: Offset of the looked up address from `address`
+AddressMatch = namedtuple("AddressMatch", ["path", "node", "address", "offset"])
+
+
+def get_dimension_strides(node: AddressableNode) -> List[int]:
+    """
+    Returns the address increment of each array dimension's index.
+
+    For example, an array allocated as:
+        [A][B][C][D] @ X += Y
+    has the dimension strides:
+        [B*C*D*Y, C*D*Y, D*Y, Y]
+    """
+    strides = []
+    m = node.array_stride
+    for dim in reversed(node.array_dimensions):
+        strides.append(m)
+        m *= dim
+    strides.reverse()
+    return strides
+
+
+class AddressTable:
+    """
+    Address map of a design, stored as columns of packed arrays.
+
+    The table holds one entry per addressable component instance, without
+    unrolling arrays. Entries are stored in breadth-first order, so that the
+    children of each entry are contiguous and sorted by address offset.
+    Virtual registers are not included.
+    """
+
+    def __init__(self, node: Node):
+        if isinstance(node, RootNode):
+            node = node.top
+
+        # Per-entry columns
+        # Index of the parent entry. -1 for the top-level entry
+        self.parent = array("l")
+        # Address offset of element 0, relative to the parent's element.
+        # Absolute address for the top-level entry
+        self.offset = array("Q")
+        # Address increment between array elements
+        self.stride = array("Q")
+        # Size of one element
+        self.size = array("Q")
+        # Number of array elements. 1 if not an array
+        self.n_elements = array("Q")
+        # Index of the entry's first dimension in the dims column
+        self.dim_start = array("L")
+        # Number of array dimensions
+        self.n_dims = array("B")
+        # Index of the entry's first child, and number of children
+        self.child_start = array("L")
+        self.child_count = array("L")
+        # Index into KIND_NAMES
+        self.kind = array("B")
+        # Greatest end offset of the entry and all its preceding siblings
+        self.max_end = array("Q")
+
+        # Array dimensions of all entries, back to back
+        self.dims = array("L")
+
+        self.names = []
+        self.nodes = []
+
+        self._build(node)
+
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+    def _add_entry(self, node: AddressableNode, parent: int, offset: int) -> None:
+        self.parent.append(parent)
+        self.offset.append(offset)
+        self.size.append(node.size)
+        self.n_elements.append(node.n_elements)
+        self.dim_start.append(len(self.dims))
+        if node.is_array:
+            self.stride.append(node.array_stride)
+            self.n_dims.append(len(node.array_dimensions))
+            self.dims.extend(node.array_dimensions)
+        else:
+            self.stride.append(node.size)
+            self.n_dims.append(0)
+        self.child_start.append(0)
+        self.child_count.append(0)
+        self.max_end.append(0)
+        if isinstance(node, AddrmapNode):
+            self.kind.append(0)
+        elif isinstance(node, RegfileNode):
+            self.kind.append(1)
+        elif isinstance(node, RegNode):
+            self.kind.append(2)
+        else:
+            self.kind.append(3)
+        self.names.append(node.inst_name)
+        self.nodes.append(node)
+
+
+    def _build(self, top: AddressableNode) -> None:
+        try:
+            base = top.absolute_address
+        except ValueError:
+            # Top node is an array that was not indexed
+            base = top.raw_absolute_address
+        self._add_entry(top, -1, base)
+
+        # Breadth-first traversal
+        i = 0
+        while i < len(self.nodes):
+            node = self.nodes[i]
+            if isinstance(node, (AddrmapNode, RegfileNode)):
+                children = [
+                    child for child in node.children()
+                    if isinstance(child, (AddrmapNode, RegfileNode, RegNode, MemNode))
+                ]
+                children.sort(key=lambda child: child.raw_address_offset)
+                self.child_start[i] = len(self.nodes)
+                self.child_count[i] = len(children)
+                max_end = 0
+                for child in children:
+                    self._add_entry(child, i, child.raw_address_offset)
+                    max_end = max(max_end, self.get_end(len(self.nodes) - 1))
+                    self.max_end[-1] = max_end
+            i += 1
+
+
+    def get_end(self, i: int) -> int:
+        """
+        Returns the end of the entry's address range, relative to the
+        parent's element
+        """
+        return self.offset[i] + (self.n_elements[i] - 1) * self.stride[i] + self.size[i]
+
+
+    def get_dimensions(self, i: int) -> List[int]:
+        start = self.dim_start[i]
+        return list(self.dims[start:start + self.n_dims[i]])
+
+
+    def _element_suffix(self, i: int, element: int) -> str:
+        """
+        Returns the array suffix of the entry's n-th element
+        """
+        if not self.n_dims[i]:
+            return ""
+        indexes = []
+        for dim in reversed(self.get_dimensions(i)):
+            element, idx = divmod(element, dim)
+            indexes.append(idx)
+        return "".join("[%d]" % idx for idx in reversed(indexes))
+
+
+    def lookup(self, address: int) -> Optional[AddressMatch]:
+        """
+        Find the register or memory that contains the address.
+        Returns an AddressMatch, or None if the address is not mapped.
+        """
+        i = 0
+        base = 0
+        path = ""
+        while True:
+            rel = address - base - self.offset[i]
+            if rel < 0:
+                return None
+            element, elem_offset = divmod(rel, self.stride[i])
+            if (element >= self.n_elements[i]) or (elem_offset >= self.size[i]):
+                return None
+
+            elem_base = address - elem_offset
+            if path:
+                path += "."
+            path += self.names[i] + self._element_suffix(i, element)
+
+            if self.kind[i] >= 2:
+                # Register or memory
+                return AddressMatch(path, self.nodes[i], elem_base, elem_offset)
+
+            # Find the child with the greatest offset that is not past the address
+            lo = self.child_start[i]
+            hi = lo + self.child_count[i]
+            j = bisect_right(self.offset, elem_offset, lo, hi) - 1
+            if j < lo:
+                return None
+
+            # Array elements of an earlier sibling may be interleaved with
+            # later siblings, so check all candidates, closest first
+            base = elem_base
+            for k in range(j, lo - 1, -1):
+                if self.max_end[k] <= elem_offset:
+                    # No earlier sibling reaches the address
+                    return None
+                if self._contains(k, elem_offset):
+                    i = k
+                    break
+            else:
+                return None
+
+
+    def _contains(self, i: int, rel: int) -> bool:
+        """
+        Checks if one of the entry's elements contains the offset, relative to
+        the parent's element
+        """
+        rel -= self.offset[i]
+        if rel < 0:
+            return False
+        element, elem_offset = divmod(rel, self.stride[i])
+        return (element < self.n_elements[i]) and (elem_offset < self.size[i])
+
+
+    def find_overlaps(self) -> List[tuple]:
+        """
+        Find sibling components whose address ranges overlap.
+
+        Returns a list of (path_a, path_b) tuples. Paths are relative to the
+        top-level node, and do not include array indexes.
+        """
+        overlaps = []
+        for i in range(len(self)):
+            lo = self.child_start[i]
+            hi = lo + self.child_count[i]
+            # Children are sorted by offset, so each child can only overlap
+            # with later siblings that start before it ends
+            for a in range(lo, hi):
+                end_a = self.get_end(a)
+                for b in range(a + 1, hi):
+                    if self.offset[b] >= end_a:
+                        break
+                    if self._elements_overlap(a, b):
+                        overlaps.append((self.get_path(a), self.get_path(b)))
+        return overlaps
+
+
+    def _elements_overlap(self, a: int, b: int) -> bool:
+        """
+        Checks if any element of sibling entry a overlaps with an element of b
+        """
+        # Iterate over the entry with fewer elements
+        if self.n_elements[a] > self.n_elements[b]:
+            a, b = b, a
+        for element in range(self.n_elements[a]):
+            start = self.offset[a] + element * self.stride[a]
+            end = start + self.size[a]
+            # Elements of b that may overlap [start, end)
+            first = max(0, (start - self.size[b] - self.offset[b]) // self.stride[b] + 1)
+            last = min(self.n_elements[b] - 1, (end - 1 - self.offset[b]) // self.stride[b])
+            for element_b in range(first, last + 1):
+                start_b = self.offset[b] + element_b * self.stride[b]
+                if (start_b < end) and (start < start_b + self.size[b]):
+                    return True
+        return False
+
+
+    def get_path(self, i: int) -> str:
+        """
+        Returns the hierarchical path of the entry, without array indexes
+        """
+        names = []
+        while i >= 0:
+            names.append(self.names[i])
+            i = self.parent[i]
+        return ".".join(reversed(names))
+
+
+    def iter_flat(self) -> Iterator[tuple]:
+        """
+        Iterates over every register and memory in the design, with arrays
+        unrolled, in the order of the table.
+
+        Yields (path, absolute address, size, kind name) tuples
+        """
+        for i, path, address in self.iter_flat_entries():
+            yield (path, address, self.size[i], KIND_NAMES[self.kind[i]])
+
+
+    def iter_flat_entries(self) -> Iterator[tuple]:
+        """
+        Same as iter_flat(), but yields (entry index, path, absolute address)
+        tuples
+        """
+        # Stack of (entry, absolute base address of the parent element, parent path)
+        stack = [(0, 0, "")]
+        while stack:
+            i, parent_base, parent_path = stack.pop()
+            children = []
+            for element in range(self.n_elements[i]):
+                address = parent_base + self.offset[i] + element * self.stride[i]
+                path = self.names[i] + self._element_suffix(i, element)
+                if parent_path:
+                    path = parent_path + "." + path
+                if self.kind[i] >= 2:
+                    yield (i, path, address)
+                else:
+                    lo = self.child_start[i]
+                    for j in range(lo, lo + self.child_count[i]):
+                        children.append((j, address, path))
+            # Push in reverse so that children are visited in order
+            stack.extend(reversed(children))
+
+
+    def dump(self, path: str) -> None:
+        """
+        Write the flattened address map to a CSV file with the columns:
+        path, address, size, type
+        """
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "address", "size", "type"])
+            for reg_path, address, size, kind in self.iter_flat():
+                writer.writerow([reg_path, "0x%x" % address, size, kind])
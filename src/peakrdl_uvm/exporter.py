@@ -1,13 +1,121 @@
 import os
 import re
+import json
+import hashlib
+import functools
+from contextlib import nullcontext
 
 import jinja2 as jj
 from systemrdl.node import RootNode, Node, RegNode, AddrmapNode, RegfileNode
 from systemrdl.node import FieldNode, MemNode, AddressableNode
-from systemrdl.rdltypes import AccessType, OnReadType, OnWriteType
+from systemrdl.rdltypes import AccessType
 from systemrdl import RDLWalker
 
 from .pre_export_listener import PreExportListener
+from .profiler import get_profiling_environment
+from .parallel import run_tasks
+from .address_table import get_dimension_strides
+from .field_access import get_field_access
+from .register_db import iter_register_records, write_register_db, write_register_db_json
+from .incremental import ExportState, write_if_changed, get_template_fingerprint, get_class_hashes
+from .incremental import get_structural_hash, get_resolved_properties
+from .plan import ExportPlan
+
+
+# Template environments are shared by all exporter instances so that each
+# template is only compiled once per process.
+# key = (user_template_dir, template_cache_dir)
+# value = jinja2 Environment
+_jj_env_cache = {}
+
+def _get_jj_env(user_template_dir, template_cache_dir) -> jj.Environment:
+    if user_template_dir:
+        user_template_dir = os.path.abspath(user_template_dir)
+    if template_cache_dir:
+        template_cache_dir = os.path.abspath(template_cache_dir)
+
+    key = (user_template_dir, template_cache_dir)
+    jj_env = _jj_env_cache.get(key, None)
+    if jj_env is not None:
+        return jj_env
+
+    template_dir = os.path.join(os.path.dirname(__file__), "templates")
+    if user_template_dir:
+        loader = jj.ChoiceLoader([
+            jj.FileSystemLoader(user_template_dir),
+            jj.FileSystemLoader(template_dir),
+            jj.PrefixLoader({
+                'user': jj.FileSystemLoader(user_template_dir),
+                'base': jj.FileSystemLoader(template_dir)
+            }, delimiter=":")
+        ])
+    else:
+        loader = jj.ChoiceLoader([
+            jj.FileSystemLoader(template_dir),
+            jj.PrefixLoader({
+                'base': jj.FileSystemLoader(template_dir)
+            }, delimiter=":")
+        ])
+
+    if template_cache_dir:
+        # Jinja identifies each cached template by its name and file path,
+        # and discards it if the checksum of its source no longer matches.
+        os.makedirs(template_cache_dir, exist_ok=True)
+        bytecode_cache = jj.FileSystemBytecodeCache(template_cache_dir, "peakrdl_uvm_%s.cache")
+    else:
+        bytecode_cache = None
+
+    jj_env = jj.Environment(
+        loader=loader,
+        undefined=jj.StrictUndefined,
+        bytecode_cache=bytecode_cache
+    )
+    _jj_env_cache[key] = jj_env
+    return jj_env
+
+
+# Names that a generated get_<child>() accessor shall not take, since
+# uvm_reg_block already defines them
+_UVM_REG_BLOCK_GETTERS = {
+    "backdoor", "block_by_name", "blocks", "coverage", "default_door",
+    "default_hdl_path", "default_map", "default_path", "field_by_name",
+    "fields", "full_hdl_path", "full_name", "hdl_path", "inst_count", "inst_id",
+    "map_by_name", "maps", "mem_by_name", "memories", "name", "object_type",
+    "parent", "reg_by_name", "registers", "root_blocks", "type", "type_name",
+    "uvm_seeding", "vfield_by_name", "virtual_fields", "virtual_registers",
+    "vreg_by_name",
+}
+
+# HDL path of a single bit of a signal, such as "q[7]"
+_BIT_SELECT_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_$]*)\[(\d+)\]")
+
+# Max number of registers that each function assigns to their members after
+# build() created them from the build table
+_BUILD_TABLE_CHUNK_SIZE = 256
+
+
+def _node_memoized(method):
+    """
+    Decorator for exporter methods that derive a value from a node.
+
+    Results are cached per node during an export, keyed by the node's
+    position in the hierarchy (its component instance), so that templates
+    can query the same value repeatedly at the cost of a dictionary lookup.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, node):
+        cache = self._node_cache.get(name, None)
+        if cache is None:
+            cache = self._node_cache[name] = {}
+        try:
+            return cache[node.inst]
+        except KeyError:
+            value = cache[node.inst] = method(self, node)
+            return value
+    return wrapper
+
 
 class UVMExporter:
 
@@ -21,35 +129,21 @@ class UVMExporter:
             Path to a directory where user-defined template overrides are stored.
         user_template_context: dict
             Additional context variables to load into the template namespace.
+        template_cache_dir: str
+            Path to a directory where compiled templates are cached, so that
+            later runs do not need to compile them again.
+            Cached templates are re-compiled automatically if their source
+            changes.
         """
         user_template_dir = kwargs.pop("user_template_dir", None)
         self.user_template_context = kwargs.pop("user_template_context", {})
+        template_cache_dir = kwargs.pop("template_cache_dir", None)
 
         # Check for stray kwargs
         if kwargs:
             raise TypeError("got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
 
-        if user_template_dir:
-            loader = jj.ChoiceLoader([
-                jj.FileSystemLoader(user_template_dir),
-                jj.FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
-                jj.PrefixLoader({
-                    'user': jj.FileSystemLoader(user_template_dir),
-                    'base': jj.FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates"))
-                }, delimiter=":")
-            ])
-        else:
-            loader = jj.ChoiceLoader([
-                jj.FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
-                jj.PrefixLoader({
-                    'base': jj.FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates"))
-                }, delimiter=":")
-            ])
-
-        self.jj_env = jj.Environment(
-            loader=loader,
-            undefined=jj.StrictUndefined
-        )
+        self.jj_env = _get_jj_env(user_template_dir, template_cache_dir)
 
         # Define variables used during export
 
@@ -64,12 +158,39 @@ class UVMExporter:
 
         # Dictionary of root-level type definitions
         # key = definition type name
-        # value = representative object
-        #   components, this is the original_def (which can be None in some cases)
+        # value = representative object. See _get_class_identity()
         self.namespace_db = {}
 
+        # Ordered dictionary of class definitions to emit, in the order they
+        # shall be emitted.
+        # key = class type name
+        # value = representative node of the class
+        self.type_table = {}
+
         self.reuse_class_definitions = True
 
+        self.vreg_array_threshold = None
+
+        self.structural_class_names = False
+
+        self.merge_similar_classes = False
+
+        # Class names of merged classes
+        # key = similarity key. See _get_similarity_key()
+        # value = class name of the first node with this key
+        self.merged_class_names = {}
+
+        # Per-export cache of values derived from nodes. See _node_memoized()
+        # key = method name
+        # value = dictionary of node.inst --> value
+        self._node_cache = {}
+
+        # Class naming options of the current analysis. See _analyze()
+        self._analysis_key = None
+
+        # Overlay of jj_env that is used for profiled exports
+        self._profiling_jj_env = None
+
 
     def export(self, node: Node, path: str, **kwargs):
         """
@@ -79,7 +200,7 @@ class UVMExporter:
         ----------
         node: systemrdl.Node
             Top-level node to export. Can be the top-level `RootNode` or any
-            internal `AddrmapNode`.
+            internal `AddrmapNode`, or an ``ExportPlan``.
         path: str
             Output file.
         export_as_package: bool
@@ -94,21 +215,362 @@ class UVMExporter:
 
             If False, class definitions are not reused. Class names are based on
             the instance's hierarchical path.
+
+            Components whose lexical scope is not known, such as ones
+            imported from other formats, share a class with all instances
+            that have the same structure: fields, widths, resets, access
+            policies, offsets and child classes.
+        structural_class_names: bool
+            If True, anonymous component definitions are also named after
+            their structure rather than after their instance, so that
+            identical anonymous definitions share a class. Only applies if
+            ``reuse_class_definitions`` is set.
+
+            If False (Default), each anonymous definition gets its own class.
+        merge_similar_classes: bool
+            If True, instances that would get classes of their own, because
+            ``reuse_class_definitions`` is not set or because their type is
+            named after their structure, share a class with other instances
+            that only differ by the reset values or HDL paths of their
+            descendants. The differences are applied by the parent after
+            building each instance.
+            Cannot be combined with ``lazy_build``.
+
+            If False (Default), these instances get a class each.
         use_uvm_factory: bool
             If True, class definitions and class instances are created using the
             UVM factory.
 
             If False (Default), UVM factory is disabled. Classes are created
             directly via new() constructors.
+        profiler: ExportProfiler
+            If set, the export is instrumented and the time spent in each
+            phase, template macro and template context helper is recorded
+            into this profiler.
+        split_by: str
+            If None (Default), the register model is written to a single file.
+
+            If "class", each class definition is written to its own file.
+            If "block", class definitions are grouped into one file per
+            child of the top-level node, plus one for the top-level class.
+
+            Split files are written alongside the output file, and are named
+            ``<name>__<unit>.svh``, where ``<name>`` is the output file's base
+            name. The output file includes them in dependency order.
+        split_depth: int
+            Depth of the descendants of the top-level node that class
+            definitions are grouped by, for ``split_by="block"`` and for
+            rendering with several jobs. Default is 1, the children of the
+            top-level node. Classes of shallower nodes each get their own
+            group.
+        jobs: int
+            Number of worker processes used to render the register model.
+            If the model is split, each worker writes whole files.
+            Otherwise, the class definitions are partitioned by
+            ``split_depth``, rendered by the workers, and merged into the
+            output file in dependency order. Requires a platform that
+            supports forking processes. Otherwise, and while profiling, the
+            model is rendered in the current process.
+            Default is 1.
+        state_dir: str
+            If set, the export is incremental. Rendered class definitions are
+            stored in this directory along with a hash of everything they
+            were rendered from. Later exports re-use the stored text of
+            classes whose hash did not change, and only rewrite output files
+            whose contents changed.
+        vreg_array_threshold: int
+            If set, register arrays with at least this many elements are
+            modeled as a ``uvm_mem`` with a ``uvm_vreg`` mapped onto it, rather
+            than as an array of ``uvm_reg`` objects. This greatly reduces the
+            time and memory needed to build the model in simulation, at the
+            cost of the features virtual registers lack, such as mirrored
+            values and per-field access policies.
+
+            Arrays are only modeled this way if their stride is a multiple of
+            the register width. Elements of multi-dimensional arrays are
+            indexed in row-major order.
+        lazy_build: bool
+            If True, the ``build()`` function of register blocks only creates
+            the block's address map. Each child instance, or array element,
+            is created and mapped on first access through a generated
+            ``get_<child>()`` accessor function. ``build_all()`` builds all
+            descendants that were not built yet.
+
+            Since UVM does not allow adding registers to a locked model,
+            accessors must be called before ``lock_model()``.
+
+            If False (Default), all children are built by ``build()``.
+        decode_function: bool
+            If True, each register block class gets a generated
+            ``decode_reg(offset)`` function that returns the register that
+            contains an address offset, relative to the block, or null.
+            Offsets are decoded by a precomputed range tree rather than
+            through the address map's lookup tables, so it is much faster
+            than ``get_reg_by_offset()`` in deep hierarchies.
+
+            Memories and registers modeled as virtual registers are not
+            decoded.
+        compact_hdl_paths: bool
+            If True, per-bit field HDL path slices that select consecutive
+            bits of the same signal are merged into a single part-select
+            slice. Field slices are loaded by an
+            ``add_field_hdl_path_slices()`` function of the register class,
+            rather than by separate calls for each register instance.
+        build_table_threshold: int
+            If set, register blocks with at least this many registers that
+            are not arrays build them in a loop over static tables of their
+            names, offsets and types, rather than with separate statements
+            for each register. This keeps the ``build()`` function of large
+            flat blocks small. These registers are added to the block's
+            address map before its other children.
+
+            Registers with their own ``hdl_path`` or ``hdl_path_gate`` are
+            built individually. Ignored if ``lazy_build`` is set.
+        burst_helpers: bool
+            If True, register blocks get ``burst_write()`` and
+            ``burst_read()`` tasks that access the block's registers, and
+            the ones of its child blocks, one run of contiguous registers at
+            a time. Runs are accessed by a ``peakrdl_uvm_burst_hook``, which
+            accesses each register individually by default, and can be
+            extended to issue bus bursts. ``burst_read()`` returns the
+            values it read, in the order it read them.
+            Cannot be combined with ``lazy_build``.
+
+            If False (Default), no burst helpers are generated.
+        register_masks: bool
+            If True, register classes declare their combined reset value,
+            and the masks of their bits that have a reset value, are
+            volatile, readable, writable, or are not compared by
+            ``mirror()``, as ``localparam`` constants.
+            Cannot be combined with ``merge_similar_classes``.
+        fast_mirror_check: bool
+            If True, register classes override ``do_check()`` to compare
+            mirrored values against their precomputed don't-care mask, and
+            only run the per-field checks of ``uvm_reg`` to report a
+            mismatch. Assumes the compare policy of fields is not changed
+            with ``set_compare()``.
+        include_coverage: bool
+            If True, register classes get a field value coverage model
+            (``UVM_CVR_FIELD_VALS``), and register block classes get an
+            address map coverage model (``UVM_CVR_ADDR_MAP``) of their
+            registers and memories.
+
+            As with any UVM coverage model, covergroups are only created for
+            the blocks and registers where the model was enabled with
+            ``uvm_reg::include_coverage()`` before the model was built, and
+            only sampled while enabled with ``set_coverage()``.
+        deterministic: bool
+            If True, the output only depends on the content of the design,
+            and not on the order in which its components were defined.
+            Class definitions are sorted by name, and preceded by forward
+            declarations of all classes. Split files are included in order
+            of their names.
+
+            A manifest with the content hash of each class definition and of
+            each output file is written to ``<path>.manifest.json``, for
+            build caches that track the generated files.
+        register_db: str
+            If set, a database of every register and field in the design is
+            written to this path, for tools that need to decode addresses
+            without parsing the register model. Each register has its path,
+            absolute address, width, and the access policy, reset value and
+            HDL path slices of its fields.
+
+            Paths ending in ``.json`` are written as JSON. Otherwise, the
+            database is written in a compact binary format that can be
+            opened with ``RegisterDB``.
+        """
+        profiler = kwargs.pop("profiler", None)
+        if isinstance(node, ExportPlan):
+            kwargs = dict(node.options, **kwargs)
+        options = self._pop_export_options(kwargs)
+
+        # Check for stray kwargs
+        if kwargs:
+            raise TypeError("got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
+
+        self._set_top(node)
+
+        try:
+            self._analyze(options, profiler)
+            self._export_target(path, options, profiler)
+        finally:
+            # Values derived from nodes are only valid during this export
+            self._node_cache.clear()
+            self._analysis_key = None
+
+
+    def export_many(self, node: Node, targets: list, **kwargs):
+        """
+        Export several variants of the register model at once.
+
+        The model is only analyzed once for all targets that share the same
+        class naming options (``reuse_class_definitions``,
+        ``structural_class_names``, ``merge_similar_classes`` and
+        ``vreg_array_threshold``), and values derived from nodes are shared
+        by all targets.
+
+        Parameters
+        ----------
+        node: systemrdl.Node
+            Top-level node to export. Can be the top-level `RootNode` or any
+            internal `AddrmapNode`, or an ``ExportPlan``.
+        targets: list
+            List of ``(path, options)`` tuples, where ``options`` is a
+            dictionary of any of the keyword arguments of ``export()``,
+            except ``profiler``.
+        jobs: int
+            Number of worker processes used to render targets concurrently.
+            Requires a platform that supports forking processes. If greater
+            than 1, the ``jobs`` option of each target is ignored.
+            Default is 1.
+        profiler: ExportProfiler
+            If set, the export is instrumented and the results of all targets
+            are recorded into this profiler. Targets are then rendered in
+            the current process.
+        """
+        jobs = kwargs.pop("jobs", 1)
+        profiler = kwargs.pop("profiler", None)
+
+        # Check for stray kwargs
+        if kwargs:
+            raise TypeError("got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
+
+        if profiler is not None:
+            jobs = 1
+
+        # Group targets by the options that affect the analysis, so that each
+        # analysis only runs once
+        # key = (reuse_class_definitions, structural_class_names, merge_similar_classes, vreg_array_threshold)
+        # value = list of (path, options)
+        groups = {}
+        for path, target_options in targets:
+            if isinstance(node, ExportPlan):
+                target_options = dict(node.options, **target_options)
+            else:
+                target_options = dict(target_options)
+            options = self._pop_export_options(target_options)
+            if target_options:
+                raise TypeError("got an unexpected export option '%s'" % list(target_options.keys())[0])
+            if jobs > 1:
+                options['jobs'] = 1
+            groups.setdefault(self._get_analysis_key(options), []).append((path, options))
+        ordered_targets = [target for group in groups.values() for target in group]
+
+        self._set_top(node)
+
+        try:
+            if ordered_targets:
+                # Worker processes inherit the first analysis
+                self._analyze(ordered_targets[0][1], profiler)
+            run_tasks(self._export_many_target, (ordered_targets, profiler), len(ordered_targets), jobs)
+        finally:
+            # Values derived from nodes are only valid during this export
+            self._node_cache.clear()
+            self._analysis_key = None
+
+
+    def build_plan(self, node: Node, **kwargs) -> ExportPlan:
+        """
+        Analyze a design once, so that it can be exported later, or by other
+        processes, without the elaborated design.
+
+        Parameters
+        ----------
+        node: systemrdl.Node
+            Top-level node to export. Can be the top-level `RootNode` or any
+            internal `AddrmapNode`.
+        reuse_class_definitions: bool
+        structural_class_names: bool
+        merge_similar_classes: bool
+        vreg_array_threshold: int
+            Class naming options, as in ``export()``. Exports of the plan
+            use them unless they are overridden, in which case the plan is
+            analyzed again.
+        profiler: ExportProfiler
+            If set, the analysis is instrumented and recorded into this
+            profiler.
+
+        Returns an ``ExportPlan``. Use ``ExportPlan.save()`` to write it to a
+        file.
         """
-        export_as_package = kwargs.pop("export_as_package", True)
-        use_uvm_factory = kwargs.pop("use_uvm_factory", False)
-        self.reuse_class_definitions = kwargs.pop("reuse_class_definitions", True)
+        profiler = kwargs.pop("profiler", None)
+        analysis_options = {}
+        for name in ("reuse_class_definitions", "structural_class_names", "merge_similar_classes", "vreg_array_threshold"):
+            if name in kwargs:
+                analysis_options[name] = kwargs.pop(name)
 
         # Check for stray kwargs
         if kwargs:
             raise TypeError("got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
 
+        options = self._pop_export_options(analysis_options)
+        self._set_top(node)
+
+        try:
+            self._analyze(options, profiler)
+            return ExportPlan(
+                self.top,
+                self._analysis_key,
+                bus_width_db=self.bus_width_db,
+                type_table=self.type_table,
+                merged_class_names=self.merged_class_names,
+                node_cache=self._node_cache,
+            )
+        finally:
+            self._node_cache = {}
+            self._analysis_key = None
+
+
+    @staticmethod
+    def _pop_export_options(kwargs: dict) -> dict:
+        """
+        Removes the export options from kwargs.
+        Returns them as a dictionary, with defaults for the ones not set.
+        """
+        options = {
+            'export_as_package': kwargs.pop("export_as_package", True),
+            'use_uvm_factory': kwargs.pop("use_uvm_factory", False),
+            'reuse_class_definitions': kwargs.pop("reuse_class_definitions", True),
+            'structural_class_names': kwargs.pop("structural_class_names", False),
+            'merge_similar_classes': kwargs.pop("merge_similar_classes", False),
+            'vreg_array_threshold': kwargs.pop("vreg_array_threshold", None),
+            'lazy_build': kwargs.pop("lazy_build", False),
+            'decode_function': kwargs.pop("decode_function", False),
+            'compact_hdl_paths': kwargs.pop("compact_hdl_paths", False),
+            'build_table_threshold': kwargs.pop("build_table_threshold", None),
+            'include_coverage': kwargs.pop("include_coverage", False),
+            'burst_helpers': kwargs.pop("burst_helpers", False),
+            'register_masks': kwargs.pop("register_masks", False),
+            'fast_mirror_check': kwargs.pop("fast_mirror_check", False),
+            'split_by': kwargs.pop("split_by", None),
+            'jobs': kwargs.pop("jobs", 1),
+            'split_depth': kwargs.pop("split_depth", 1),
+            'state_dir': kwargs.pop("state_dir", None),
+            'register_db': kwargs.pop("register_db", None),
+            'deterministic': kwargs.pop("deterministic", False),
+        }
+
+        if options['split_by'] not in (None, "class", "block"):
+            raise ValueError("Invalid split_by value: '%s'" % options['split_by'])
+        if options['split_depth'] < 1:
+            raise ValueError("split_depth must be at least 1")
+        if options['merge_similar_classes'] and options['lazy_build']:
+            raise ValueError("merge_similar_classes cannot be combined with lazy_build")
+        if options['burst_helpers'] and options['lazy_build']:
+            raise ValueError("burst_helpers cannot be combined with lazy_build")
+        if options['register_masks'] and options['merge_similar_classes']:
+            # Merged classes do not have a single reset value
+            raise ValueError("register_masks cannot be combined with merge_similar_classes")
+
+        return options
+
+
+    def _set_top(self, node: Node) -> None:
+        if isinstance(node, ExportPlan):
+            self._load_plan(node)
+            return
+
         # If it is the root node, skip to top addrmap
         if isinstance(node, RootNode):
             node = node.top
@@ -120,12 +582,99 @@ class UVMExporter:
                 node.property_src_ref.get('bridge', node.inst_src_ref)
             )
 
-        # First, traverse the model and collect some information
+
+    def _load_plan(self, plan: ExportPlan) -> None:
+        """
+        Restore the results of an analysis from a plan
+        """
+        self.top = plan.top
+        (
+            self.reuse_class_definitions,
+            self.structural_class_names,
+            self.merge_similar_classes,
+            self.vreg_array_threshold,
+        ) = plan.analysis_key
+        self.bus_width_db = plan.bus_width_db
+        self.type_table = plan.type_table
+        self.merged_class_names = dict(plan.merged_class_names)
+
+        # Copied, so that the plan is not modified if it is analyzed again
+        self._node_cache = {name: dict(cache) for name, cache in plan.node_cache.items()}
+        self._analysis_key = plan.analysis_key
+
+
+    @staticmethod
+    def _get_analysis_key(options: dict) -> tuple:
+        return (
+            options['reuse_class_definitions'],
+            options['structural_class_names'],
+            options['merge_similar_classes'],
+            options['vreg_array_threshold'],
+        )
+
+
+    def _analyze(self, options: dict, profiler) -> None:
+        """
+        Traverse the model and collect information that is shared by all
+        exports with the same class naming options
+        """
+        key = self._get_analysis_key(options)
+        if key == self._analysis_key:
+            return
+
+        # Drop the values that depend on the class naming options
+        for name in ("_get_class_name", "_get_class_friendly_name", "_is_vreg_array", "_get_structural_hash",
+                     "_get_similarity_key", "_get_class_overrides"):
+            self._node_cache.pop(name, None)
+        self._analysis_key = key
+
+        self.reuse_class_definitions = options['reuse_class_definitions']
+        self.vreg_array_threshold = options['vreg_array_threshold']
+        self.structural_class_names = options['structural_class_names']
+        self.merge_similar_classes = options['merge_similar_classes']
+        self.merged_class_names = {}
+
         self.bus_width_db = {}
-        RDLWalker().walk(self.top, PreExportListener(self))
+        self.namespace_db = {}
+        self.type_table = {}
+        with self._profile_phase(profiler, "pre_export_walk"):
+            RDLWalker().walk(self.top, PreExportListener(self))
+
+        # Only used to compute the structural hashes. Not worth keeping in
+        # export plans
+        self._node_cache.pop("_get_resolved_properties", None)
+
+
+    def _export_many_target(self, task_state: tuple, i: int) -> None:
+        targets, profiler = task_state
+        path, options = targets[i]
+        self._analyze(options, profiler)
+        self._export_target(path, options, profiler)
+
+
+    def _export_target(self, path: str, options: dict, profiler) -> None:
+        """
+        Render and write one output file, based on the results of _analyze()
+        """
+        use_uvm_factory = options['use_uvm_factory']
+        lazy_build = options['lazy_build']
+        split_by = options['split_by']
+        state_dir = options['state_dir']
+        jobs = options['jobs']
+        split_depth = options['split_depth']
+        deterministic = options['deterministic']
+
+        # Cleared for each target since the namespace is populated while
+        # rendering
+        self.namespace_db = {}
+
+        if lazy_build:
+            self._check_accessor_names()
 
         context = {
-            'top_node': node,
+            'top_node': self.top,
+            'class_definitions': list(self.type_table.values()),
+            'include_files': [],
             'RegNode': RegNode,
             'RegfileNode': RegfileNode,
             'AddrmapNode': AddrmapNode,
@@ -133,29 +682,359 @@ class UVMExporter:
             'AddressableNode': AddressableNode,
             'isinstance': isinstance,
             'class_needs_definition': self._class_needs_definition,
+            'is_vreg_array': self._is_vreg_array,
             'get_class_name': self._get_class_name,
             'get_class_friendly_name': self._get_class_friendly_name,
             'get_inst_name': self._get_inst_name,
             'get_field_access': self._get_field_access,
             'get_array_address_offset_expr': self._get_array_address_offset_expr,
+            'get_decode_groups': self._get_decode_groups,
+            'get_build_table': self._get_build_table,
+            'get_class_overrides': self._get_class_overrides,
+            'get_coverage_bins': self._get_coverage_bins,
+            'get_burst_runs': self._get_burst_runs,
+            'get_register_masks': self._get_register_masks,
+            'get_array_index_exprs': self._get_array_index_exprs,
+            'get_field_hdl_path_slices': self._get_field_hdl_path_slices,
+            'has_class_hdl_path_slices': self._has_class_hdl_path_slices,
             'get_endianness': self._get_endianness,
             'get_bus_width': self._get_bus_width,
             'get_mem_access': self._get_mem_access,
             'roundup_to': self._roundup_to,
             'roundup_pow2': self._roundup_pow2,
             'use_uvm_factory': use_uvm_factory,
+            'lazy_build': lazy_build,
+            'decode_function': options['decode_function'],
+            'compact_hdl_paths': options['compact_hdl_paths'],
+            'build_table_threshold': options['build_table_threshold'],
+            'include_coverage': options['include_coverage'],
+            'burst_helpers': options['burst_helpers'],
+            'register_masks': options['register_masks'],
+            'fast_mirror_check': options['fast_mirror_check'],
+            'forward_declarations': [],
         }
 
+        if options['compact_hdl_paths']:
+            context['get_field_hdl_path_slices'] = self._get_compact_field_hdl_path_slices
+
         context.update(self.user_template_context)
 
-        if export_as_package:
-            context['package_name'] = self._get_package_name(path)
-            template = self.jj_env.get_template("top_pkg.sv")
+        if profiler is None:
+            jj_env = self.jj_env
+        else:
+            if self._profiling_jj_env is None:
+                self._profiling_jj_env = get_profiling_environment(self.jj_env)
+            jj_env = self._profiling_jj_env
+            jj_env.peakrdl_profiler = profiler
+            for name, value in context.items():
+                if getattr(value, "__self__", None) is self:
+                    context[name] = profiler.wrap_helper(name, value)
+
+        if state_dir is None:
+            state = None
+            class_hashes = None
+        else:
+            with self._profile_phase(profiler, "hash"):
+                state = ExportState(state_dir, path)
+                options_key = repr((
+                    use_uvm_factory,
+                    lazy_build,
+                    options['decode_function'],
+                    options['compact_hdl_paths'],
+                    options['build_table_threshold'],
+                    options['include_coverage'],
+                    options['burst_helpers'],
+                    options['register_masks'],
+                    options['fast_mirror_check'],
+                    self.reuse_class_definitions,
+                    self.structural_class_names,
+                    self.merge_similar_classes,
+                    self.vreg_array_threshold,
+                    sorted((k, repr(v)) for k, v in self.user_template_context.items()),
+                    get_template_fingerprint(jj_env),
+                ))
+                class_hashes = get_class_hashes(self, options_key)
+
+        if profiler is not None:
+            jobs = 1
+
+        # Content hash of each class definition, for the manifest
+        # key = class name
+        # value = hash
+        text_hashes = {} if deterministic else None
+
+        if deterministic:
+            # Class order no longer depends on the order of the input
+            class_nodes = sorted(self.type_table.values(), key=self._get_class_name)
+            context['forward_declarations'] = [self._get_class_name(node) for node in class_nodes]
         else:
-            context['include_guard'] = self._get_include_guard(path)
-            template = self.jj_env.get_template("top_include.svh")
-        stream = template.stream(context)
-        stream.dump(path)
+            class_nodes = list(self.type_table.values())
+
+        if (split_by is None) and (jobs > 1):
+            # Render partitions of the class definitions in worker processes,
+            # and merge them into the single output file
+            if deterministic:
+                units = [(None, [node]) for node in class_nodes]
+            else:
+                units = self._get_split_units("block", split_depth)
+            batches = self._get_render_batches(units, jobs)
+            results = run_tasks(
+                self._render_batch,
+                (jj_env, context, batches, state, class_hashes),
+                len(batches), jobs
+            )
+            texts = []
+            for batch, batch_texts in zip(batches, results):
+                for node, text in zip(batch, batch_texts):
+                    if state is not None:
+                        state.current[class_hashes[self._get_class_name(node)]] = text
+                    if text_hashes is not None:
+                        text_hashes[self._get_class_name(node)] = self._get_text_hash(text)
+                    texts.append(text)
+            context['class_definition_texts'] = texts
+        else:
+            context['class_definition_texts'] = self._render_class_definitions(
+                jj_env, context, class_nodes, state, class_hashes, text_hashes=text_hashes
+            )
+
+        with self._profile_phase(profiler, "load_templates"):
+            if options['export_as_package']:
+                context['package_name'] = self._get_package_name(path)
+                template = jj_env.get_template("top_pkg.sv")
+            else:
+                context['include_guard'] = self._get_include_guard(path)
+                template = jj_env.get_template("top_include.svh")
+
+        if split_by is not None:
+            with self._profile_phase(profiler, "load_templates"):
+                unit_template = jj_env.get_template("split_unit.svh")
+            units = self._get_split_units(split_by, split_depth)
+            if deterministic:
+                units = sorted(
+                    (name, sorted(nodes, key=self._get_class_name))
+                    for name, nodes in units
+                )
+            unit_paths = self._get_split_unit_paths(path, units)
+            context['include_files'] = [os.path.basename(p) for p in unit_paths]
+            results = run_tasks(
+                self._write_split_unit,
+                (jj_env, unit_template, context, units, unit_paths, profiler, state, class_hashes, deterministic),
+                len(units), jobs
+            )
+            # Collect the results of each unit, in case they were rendered by
+            # worker processes
+            for unit_definitions, unit_text_hashes in results:
+                if state is not None:
+                    state.current.update(unit_definitions)
+                if text_hashes is not None:
+                    text_hashes.update(unit_text_hashes)
+        else:
+            unit_paths = []
+
+        self._write_template(template, context, path, profiler, state is not None)
+
+        if state is not None:
+            state.save()
+
+        if deterministic:
+            self._write_manifest(path, unit_paths, text_hashes)
+
+        if options['register_db'] is not None:
+            with self._profile_phase(profiler, "register_db"):
+                self._write_register_db(options['register_db'])
+
+
+    def _write_register_db(self, path: str) -> None:
+        records = iter_register_records(self.top, self._get_field_access)
+        if path.endswith(".json"):
+            write_register_db_json(records, path)
+        else:
+            write_register_db(records, path)
+
+
+    def _check_accessor_names(self) -> None:
+        for node in self.type_table.values():
+            if not isinstance(node, (AddrmapNode, RegfileNode)):
+                continue
+            for child in node.children():
+                if isinstance(child, AddressableNode) and child.inst_name in _UVM_REG_BLOCK_GETTERS:
+                    child.env.msg.fatal(
+                        "Instance name '%s' conflicts with uvm_reg_block::get_%s(). Lazy build requires a different name."
+                        % (child.inst_name, child.inst_name),
+                        child.inst_src_ref
+                    )
+
+
+    @staticmethod
+    def _write_template(template: jj.Template, context: dict, path: str, profiler, only_if_changed: bool = False) -> None:
+        if only_if_changed:
+            with UVMExporter._profile_phase(profiler, "render"):
+                write_if_changed(template.generate(context), path)
+        elif profiler is None:
+            stream = template.stream(context)
+            stream.dump(path)
+        else:
+            profiler.dump(template.generate(context), path)
+
+
+    def _get_split_units(self, split_by: str, split_depth: int = 1) -> list:
+        """
+        Partitions the class definitions into output files.
+        Returns a list of (unit name, [representative nodes]) tuples, in the
+        order that the files shall be included.
+        """
+        if split_by == "class":
+            return [(name, [node]) for name, node in self.type_table.items()]
+
+        # Group each class by the descendant of the top-level node, split_depth
+        # levels down, that it was first defined in. Classes of shallower nodes
+        # get their own group. Since the type table is in post-order, each
+        # group is contiguous, and groups only depend on classes of earlier
+        # groups.
+        units = {}
+        for name, node in self.type_table.items():
+            if node.inst is self.top.inst:
+                unit_name = name
+            else:
+                ancestors = [node]
+                while ancestors[-1].parent.inst is not self.top.inst:
+                    ancestors.append(ancestors[-1].parent)
+                if len(ancestors) > split_depth:
+                    ancestor = ancestors[-split_depth]
+                else:
+                    ancestor = node
+                unit_name = ancestor.get_rel_path(
+                    self.top, hier_separator="__", array_suffix="", empty_array_suffix=""
+                )
+            units.setdefault(unit_name, []).append(node)
+        return list(units.items())
+
+
+    def _get_split_unit_paths(self, path: str, units: list) -> list:
+        prefix = self._get_package_name(path)
+        out_dir = os.path.dirname(path)
+        return [
+            os.path.join(out_dir, "%s__%s.svh" % (prefix, unit_name))
+            for unit_name, _ in units
+        ]
+
+
+    def _write_split_unit(self, task_state: tuple, i: int) -> dict:
+        """
+        Writes the i-th split file.
+        Returns a tuple of:
+            - The class definitions that it contains, keyed by class hash,
+              if the export is incremental.
+            - The content hashes of the class definitions, keyed by class
+              name, if the export is deterministic. Otherwise None.
+        """
+        jj_env, template, context, units, unit_paths, profiler, state, class_hashes, deterministic = task_state
+        nodes = units[i][1]
+        text_hashes = {} if deterministic else None
+        unit_context = dict(context)
+        unit_context['unit_definitions'] = self._render_class_definitions(
+            jj_env, context, nodes, state, class_hashes, text_hashes=text_hashes
+        )
+        unit_context['include_guard'] = self._get_include_guard(unit_paths[i])
+        self._write_template(template, unit_context, unit_paths[i], profiler, state is not None)
+
+        if state is None:
+            return {}, text_hashes
+        unit_hashes = [class_hashes[self._get_class_name(node)] for node in nodes]
+        return {h: state.current[h] for h in unit_hashes}, text_hashes
+
+
+    @staticmethod
+    def _get_render_batches(units: list, jobs: int) -> list:
+        """
+        Combines consecutive units into batches of about the same number of
+        classes, a few per job, so that workers share the load without
+        paying the overhead of a task for each small unit.
+        Returns a list of node lists
+        """
+        n_classes = sum(len(nodes) for _, nodes in units)
+        batch_size = max(1, n_classes // (jobs * 4))
+        batches = []
+        batch = []
+        for _, nodes in units:
+            batch.extend(nodes)
+            if len(batch) >= batch_size:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+    def _render_batch(self, task_state: tuple, i: int) -> list:
+        """
+        Renders the class definitions of the i-th batch.
+        Returns the list of rendered texts
+        """
+        jj_env, context, batches, state, class_hashes = task_state
+        return list(self._render_class_definitions(
+            jj_env, context, batches[i], state, class_hashes
+        ))
+
+
+    def _render_class_definitions(self, jj_env: jj.Environment, context: dict, nodes, state, class_hashes, *, text_hashes=None):
+        """
+        Generator that yields the rendered definition of each node's class.
+
+        If the export is incremental, definitions are re-used from the
+        previous export if their class hash did not change.
+
+        If text_hashes is a dictionary, the content hash of each definition
+        is stored into it, keyed by class name.
+        """
+        module = None
+        for node in nodes:
+            text = None
+            if state is not None:
+                class_hash = class_hashes[self._get_class_name(node)]
+                text = state.get(class_hash)
+
+            if text is None:
+                if module is None:
+                    module = jj_env.get_template("main.sv").make_module(context)
+                text = str(module.child_def(node))
+                if state is not None:
+                    state.put(class_hash, text)
+
+            if text_hashes is not None:
+                text_hashes[self._get_class_name(node)] = self._get_text_hash(text)
+            yield text
+
+
+    @staticmethod
+    def _get_text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+    def _write_manifest(self, path: str, unit_paths: list, text_hashes: dict) -> None:
+        """
+        Writes the content hash of each class definition and of each output
+        file to <path>.manifest.json
+        """
+        file_hashes = {}
+        for file_path in [path] + unit_paths:
+            with open(file_path, "rb") as f:
+                file_hashes[os.path.basename(file_path)] = hashlib.sha256(f.read()).hexdigest()
+
+        manifest = {
+            "classes": text_hashes,
+            "files": file_hashes,
+        }
+        with open(path + ".manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+    @staticmethod
+    def _profile_phase(profiler, name: str):
+        if profiler is None:
+            return nullcontext()
+        return profiler.phase(name)
 
 
     def _get_package_name(self, path: str) -> str:
@@ -170,21 +1049,24 @@ class UVMExporter:
         return s
 
 
+    @_node_memoized
     def _get_class_name(self, node: Node) -> str:
         """
         Returns the class type name.
         Shall be unique enough to prevent type name collisions
         """
         if self.reuse_class_definitions:
-            scope_path = node.get_global_type_name("__")
+            scope_path = self._get_scoped_type_name(node, "__")
 
             if scope_path is not None:
                 class_name = scope_path
             else:
-                # Unable to determine a reusable type name. Fall back to hierarchical path
-                class_name = node.get_rel_path(
-                    self.top.parent,
-                    hier_separator="__", array_suffix="", empty_array_suffix=""
+                # Unable to determine a reusable type name. Name the class
+                # after the node's structure, so that identical instances
+                # share it
+                class_name = "%s_%s" % (
+                    self._get_declared_type_name(node) or node.component_type_name,
+                    self._get_structural_hash(node)[:12]
                 )
                 # Add prefix to prevent collision when mixing namespace methods
                 class_name = "xtern__" + class_name
@@ -194,22 +1076,31 @@ class UVMExporter:
                 hier_separator="__", array_suffix="", empty_array_suffix=""
             )
 
+        if self._is_vreg_array(node):
+            # Virtual register variant of the register's class
+            class_name += "__vreg"
+
+        if self._is_mergeable(node):
+            # Share the class of the first similar node
+            class_name = self.merged_class_names.setdefault(self._get_similarity_key(node), class_name)
+
         return class_name
 
 
+    @_node_memoized
     def _get_class_friendly_name(self, node: Node) -> str:
         """
         Returns a useful string that helps identify the class definition in
         a comment
         """
         if self.reuse_class_definitions:
-            scope_path = node.get_global_type_name("::")
+            scope_path = self._get_scoped_type_name(node, "::")
 
             if scope_path is not None:
                 friendly_name = scope_path
             else:
-                # Unable to determine a reusable type name. Fall back to hierarchical path
-                friendly_name = node.get_rel_path(self.top.parent)
+                # Class is shared by all instances with the same structure
+                friendly_name = (self._get_declared_type_name(node) or "anonymous") + " (structural)"
         else:
             friendly_name = node.get_rel_path(self.top.parent)
 
@@ -238,7 +1129,7 @@ class UVMExporter:
             obj = self.namespace_db[type_name]
 
             # Sanity-check for collisions
-            if (obj is None) or (obj is not node.original_def):
+            if (obj is None) or (obj != self._get_class_identity(node)):
                 raise RuntimeError("Namespace collision! Type-name generation is not robust enough to create unique names!")
 
             # This object likely represents the existing class definition
@@ -247,84 +1138,165 @@ class UVMExporter:
 
         # Need to emit a new definition
         # First, register it in the namespace
-        self.namespace_db[type_name] = node.original_def
+        self.namespace_db[type_name] = self._get_class_identity(node)
         return True
 
 
-    def _get_field_access(self, field: FieldNode) -> str:
+    def _get_class_identity(self, node: Node):
         """
-        Get field's UVM access string
+        Returns what nodes that share a class have in common, to check class
+        names for collisions: the structural hash for classes named after the
+        node's structure, otherwise the original component definition.
+        Can be None if the definition is not known.
         """
-        sw = field.get_property("sw")
-        onread = field.get_property("onread")
-        onwrite = field.get_property("onwrite")
-
-        if sw == AccessType.rw:
-            if (onwrite is None) and (onread is None):
-                return "RW"
-            elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.woset):
-                return "W1SRC"
-            elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wzs):
-                return "W0SRC"
-            elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wset):
-                return "WSRC"
-            elif (onread == OnReadType.rset) and (onwrite == OnWriteType.woclr):
-                return "W1CRS"
-            elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wzc):
-                return "W0CRS"
-            elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wclr):
-                return "WCRS"
-            elif onwrite == OnWriteType.woclr:
-                return "W1C"
-            elif onwrite == OnWriteType.woset:
-                return "W1S"
-            elif onwrite == OnWriteType.wot:
-                return "W1T"
-            elif onwrite == OnWriteType.wzc:
-                return "W0C"
-            elif onwrite == OnWriteType.wzs:
-                return "W0S"
-            elif onwrite == OnWriteType.wzt:
-                return "W0T"
-            elif onwrite == OnWriteType.wclr:
-                return "WC"
-            elif onwrite == OnWriteType.wset:
-                return "WS"
-            elif onread == OnReadType.rclr:
-                return "WRC"
-            elif onread == OnReadType.rset:
-                return "WRS"
-            else:
-                return "RW"
-
-        elif sw == AccessType.r:
-            if onread is None:
-                return "RO"
-            elif onread == OnReadType.rclr:
-                return "RC"
-            elif onread == OnReadType.rset:
-                return "RS"
-            else:
-                return "RO"
-
-        elif sw == AccessType.w:
-            if onwrite is None:
-                return "WO"
-            elif onwrite == OnWriteType.wclr:
-                return "WOC"
-            elif onwrite == OnWriteType.wset:
-                return "WOS"
-            else:
-                return "WO"
+        if self._is_mergeable(node):
+            return self._get_similarity_key(node)
+        if self.reuse_class_definitions and (self._get_scoped_type_name(node, "__") is None):
+            return self._get_structural_hash(node)
+        return node.inst.original_def
+
+
+    def _get_declared_type_name(self, node: Node):
+        """
+        Returns the type name the node's component was declared with, or None
+        if its definition is anonymous.
+        The compiler names the types of anonymous definitions after their
+        instance.
+        """
+        if (node.inst.original_def is not None) and (node.inst.original_def.type_name is None):
+            return None
+        return node.type_name
+
+
+    def _get_scoped_type_name(self, node: Node, separator: str):
+        """
+        Returns the node's type name, prefixed by its lexical scope, or None if
+        it cannot be reused and the class shall be named after the node's
+        structure instead.
+        """
+        if self.structural_class_names and (self._get_declared_type_name(node) is None):
+            return None
+        return node.get_global_type_name(separator)
+
+
+    @_node_memoized
+    def _get_structural_hash(self, node: Node) -> str:
+        return get_structural_hash(self, node)
+
+
+    @_node_memoized
+    def _get_resolved_properties(self, node: Node) -> list:
+        return get_resolved_properties(node)
+
+
+    def _is_mergeable(self, node: Node) -> bool:
+        """
+        Checks if the node's class can be merged with the ones of similar
+        nodes. Classes named after a lexical type are already shared.
+        """
+        if not self.merge_similar_classes:
+            return False
+        return (not self.reuse_class_definitions) or (self._get_scoped_type_name(node, "__") is None)
+
+
+    @_node_memoized
+    def _get_similarity_key(self, node: Node) -> tuple:
+        """
+        Returns a key that is the same for nodes that can share a class, and
+        only differ by the reset values or HDL paths of their descendants
+        """
+        return (get_structural_hash(self, node, relaxed=True), self._is_vreg_array(node))
+
+
+    @_node_memoized
+    def _get_class_overrides(self, node: Node) -> list:
+        """
+        Returns what differs between the node and the node its class is
+        rendered from, as a list of (loops, ref, target, kind) tuples, to be
+        applied by the parent after building the node:
+            loops: List of (array ref, iterator list) of the arrays that
+                contain the target, outermost first
+            ref: Reference to the target, relative to the node
+            target: Field, register or block node
+            kind: "reset" to set the reset value of a field, "hdl_path" to
+                replace the HDL paths of a register or block
+        """
+        if not self._is_mergeable(node):
+            return []
+        rep = self.type_table.get(self._get_class_name(node), None)
+        if (rep is None) or (rep.inst is node.inst):
+            return []
+        overrides = []
+        self._collect_class_overrides(node, rep, "", [], overrides)
+        return overrides
+
+
+    def _collect_class_overrides(self, node: Node, rep: Node, ref: str, loops: list, overrides: list) -> None:
+        if isinstance(node, RegNode):
+            if node.is_virtual or self._is_vreg_array(node):
+                # Virtual register fields have no reset
+                return
+            for field, rep_field in zip(node.fields(), rep.fields()):
+                reset = field.get_property('reset')
+                if isinstance(reset, int) and (reset != rep_field.get_property('reset')):
+                    overrides.append((loops, ref + "." + self._get_inst_name(field), field, "reset"))
+            return
+
+        if not isinstance(node, (RegfileNode, AddrmapNode)):
+            return
+
+        for child, rep_child in zip(node.children(), rep.children()):
+            if not isinstance(child, AddressableNode):
+                continue
+            child_ref = ref + "." + self._get_inst_name(child)
+            child_loops = loops
+            if child.is_array and not self._is_vreg_array(child):
+                # Iterators shall not shadow the ones of enclosing loops
+                first = sum(len(loop_iterators) for _, loop_iterators in loops)
+                iterators = ["j%d" % i for i in range(first, first + len(child.array_dimensions))]
+                child_loops = loops + [(child_ref, iterators)]
+                child_ref += "".join("[%s]" % iterator for iterator in iterators)
+
+            if self._hdl_paths_differ(child, rep_child):
+                overrides.append((child_loops, child_ref, child, "hdl_path"))
+
+            self._collect_class_overrides(child, rep_child, child_ref, child_loops, overrides)
+
+
+    def _hdl_paths_differ(self, node: Node, rep: Node) -> bool:
+        if isinstance(node, MemNode) or self._is_vreg_array(node):
+            # HDL paths are not modeled
+            return False
+        for prop in ('hdl_path', 'hdl_path_gate'):
+            if node.get_property(prop) != rep.get_property(prop):
+                return True
+        if isinstance(node, RegNode):
+            return self._get_field_hdl_path_slices(node) != self._get_field_hdl_path_slices(rep)
+        return False
+
 
-        elif sw == AccessType.rw1:
-            return "W1"
+    @_node_memoized
+    def _is_vreg_array(self, node: Node) -> bool:
+        """
+        Checks if the node is a register array that shall be modeled as a
+        virtual register mapped onto a memory
+        """
+        if self.vreg_array_threshold is None:
+            return False
+        if not isinstance(node, RegNode) or node.is_virtual or not node.is_array:
+            return False
+        if node.n_elements < self.vreg_array_threshold:
+            return False
+
+        # Each element shall start at a memory entry boundary
+        return node.array_stride % (node.get_property('regwidth') // 8) == 0
 
-        elif sw == AccessType.w1:
-            return "WO1"
 
-        else: # na
-            return "NOACCESS"
+    def _get_field_access(self, field: FieldNode) -> str:
+        """
+        Get field's UVM access string
+        """
+        return get_field_access(field)
 
 
     def _get_mem_access(self, mem: MemNode) -> str:
@@ -335,6 +1307,100 @@ class UVMExporter:
             return "RW"
 
 
+    def _get_field_hdl_path_slice_groups(self, node: RegNode) -> list:
+        """
+        Returns the HDL path slices of the register's fields, as a list with
+        one list of (path, lsb, width, kind) tuples per field and kind.
+        kind is None for RTL slices, or "GATE" for gate-level slices.
+
+        A field's hdl path slice list either contains a single entry that
+        covers the whole field, or one entry per bit, ordered from msb.
+        """
+        groups = []
+        for prop, kind in (('hdl_path_slice', None), ('hdl_path_gate_slice', "GATE")):
+            for field in node.fields():
+                paths = field.get_property(prop)
+                if paths is None:
+                    continue
+                if len(paths) == 1:
+                    groups.append([(paths[0], field.lsb, field.width, kind)])
+                elif len(paths) == field.width:
+                    group = []
+                    for i, path in enumerate(paths):
+                        if field.msb > field.lsb:
+                            group.append((path, field.msb - i, 1, kind))
+                        else:
+                            group.append((path, field.msb + i, 1, kind))
+                    groups.append(group)
+        return groups
+
+
+    @_node_memoized
+    def _get_field_hdl_path_slices(self, node: RegNode) -> list:
+        """
+        Returns the HDL path slices of all the register's fields, as a list of
+        (path, lsb, width, kind) tuples.
+        See _get_field_hdl_path_slice_groups()
+        """
+        slices = []
+        for group in self._get_field_hdl_path_slice_groups(node):
+            slices.extend(group)
+        return slices
+
+
+    @_node_memoized
+    def _get_compact_field_hdl_path_slices(self, node: RegNode) -> list:
+        """
+        Same as _get_field_hdl_path_slices(), but the per-bit slices of a
+        field are merged into a single part-select slice if they select
+        consecutive bits of the same HDL signal.
+        For example, slices "q[7]" ... "q[0]" for bits 15 to 8 become the
+        slice "q[7:0]" for bits 15 to 8.
+
+        Slices are only merged if each of them is a bit-select of a simple
+        identifier. Otherwise, the field's slices are kept as they are.
+        """
+        slices = []
+        for group in self._get_field_hdl_path_slice_groups(node):
+            if len(group) == 1:
+                slices.extend(group)
+                continue
+
+            signal = None
+            indexes = []
+            for path, _, _, _ in group:
+                m = _BIT_SELECT_RE.fullmatch(path)
+                if (m is None) or (signal not in (None, m.group(1))):
+                    break
+                signal = m.group(1)
+                indexes.append(int(m.group(2)))
+
+            # Per-bit slices are ordered from msb, so each bit of a run is
+            # one below the previous one
+            if (
+                (len(indexes) == len(group))
+                and all(index == indexes[0] - i for i, index in enumerate(indexes))
+                and all(lsb == group[0][1] - i for i, (_, lsb, _, _) in enumerate(group))
+            ):
+                path = "%s[%d:%d]" % (signal, indexes[0], indexes[-1])
+                slices.append((path, group[-1][1], len(group), group[0][3]))
+            else:
+                slices.extend(group)
+        return slices
+
+
+    def _has_class_hdl_path_slices(self, node: RegNode) -> bool:
+        """
+        Checks if the register's field HDL path slices are the same as the
+        ones of its class definition, so that they can be loaded by the
+        class's add_field_hdl_path_slices() function
+        """
+        rep = self.type_table[self._get_class_name(node)]
+        slices = self._get_compact_field_hdl_path_slices(node)
+        return bool(slices) and (slices == self._get_compact_field_hdl_path_slices(rep))
+
+
+    @_node_memoized
     def _get_array_address_offset_expr(self, node: AddressableNode) -> str:
         """
         Returns an expression to calculate the address offset
@@ -345,14 +1411,220 @@ class UVMExporter:
         """
         s = "'h%x" % node.raw_address_offset
         if node.is_array:
-            for i in range(len(node.array_dimensions)):
-                m = node.array_stride
-                for j in range(i+1, len(node.array_dimensions)):
-                    m *= node.array_dimensions[j]
+            for i, m in enumerate(get_dimension_strides(node)):
                 s += " + i%d*'h%x" % (i, m)
         return s
 
 
+    def _get_build_table(self, node: Node) -> dict:
+        """
+        Returns the register children of a block that build() can create
+        from a table rather than with separate statements for each one:
+        registers that are not arrays and whose fields have the same HDL path
+        slices as the other registers of their class.
+        What else differs between these registers, their HDL paths and the
+        reset values of merged classes, is stored in the table.
+
+        Returns a dictionary with:
+            children: list of (child, type index, reset, reset mask) tuples.
+                The reset mask selects the fields whose reset value differs
+                from the one of the class.
+            types: Child node that represents each type index
+            chunks: list of lists of (table index, child) tuples, of at most
+                chunk_size children each
+            chunk_size: Max number of children per chunk
+            has_hdl_paths: True if any child has its own HDL path
+            has_resets: True if any child has a reset mask
+            names: Set of the children's instance names
+        """
+        children = []
+        types = []
+        # key = class name
+        # value = type index
+        type_indexes = {}
+        for child in node.children():
+            if not isinstance(child, RegNode) or child.is_array:
+                continue
+
+            class_name = self._get_class_name(child)
+            type_index = type_indexes.get(class_name, None)
+            if type_index is None:
+                type_index = type_indexes[class_name] = len(types)
+                types.append(child)
+            elif self._get_field_hdl_path_slices(child) != self._get_field_hdl_path_slices(types[type_index]):
+                # Field slices are loaded once per type
+                continue
+
+            reset = 0
+            reset_mask = 0
+            for _, _, field, _ in self._get_class_overrides(child):
+                field_mask = (1 << field.width) - 1
+                reset |= (field.get_property('reset') & field_mask) << field.lsb
+                reset_mask |= field_mask << field.lsb
+            children.append((child, type_index, reset, reset_mask))
+
+        members = [(i, child) for i, (child, _, _, _) in enumerate(children)]
+        chunks = [
+            members[i:i + _BUILD_TABLE_CHUNK_SIZE]
+            for i in range(0, len(members), _BUILD_TABLE_CHUNK_SIZE)
+        ]
+
+        return {
+            'children': children,
+            'types': types,
+            'chunks': chunks,
+            'chunk_size': _BUILD_TABLE_CHUNK_SIZE,
+            'has_hdl_paths': any(
+                child.get_property('hdl_path') or child.get_property('hdl_path_gate')
+                for child, _, _, _ in children
+            ),
+            'has_resets': any(reset_mask for _, _, _, reset_mask in children),
+            'names': {child.inst_name for child, _, _, _ in children},
+        }
+
+
+    def _get_coverage_bins(self, node: Node) -> list:
+        """
+        Returns the address map coverage bins of a register block: one for
+        each register or memory child, or for each register array.
+
+        Returns a list of (name, start offset, end offset) tuples
+        """
+        bins = []
+        for child in node.children():
+            if isinstance(child, RegNode) and not child.is_array:
+                # Accesses are sampled at the register's offset
+                end = child.raw_address_offset + 1
+            elif isinstance(child, (RegNode, MemNode)):
+                end = child.raw_address_offset + child.total_size
+            else:
+                continue
+            bins.append((self._get_inst_name(child), child.raw_address_offset, end))
+        return bins
+
+
+    @_node_memoized
+    def _get_burst_runs(self, node: Node) -> list:
+        """
+        Returns the runs of registers of a block that can be accessed in a
+        single burst: registers that are readable and writable, have the
+        same width, and are at consecutive addresses. Register arrays are
+        included if their elements are contiguous.
+
+        Returns a list of runs, each a list of register nodes in address
+        order
+        """
+        runs = []
+        run = []
+        end = None
+        width = None
+        children = sorted(
+            (child for child in node.children() if isinstance(child, RegNode)),
+            key=lambda child: child.raw_address_offset
+        )
+        for child in children:
+            if self._is_vreg_array(child):
+                continue
+            if child.is_array and (child.array_stride != child.size):
+                # Elements are not contiguous
+                continue
+            if not (child.has_sw_readable and child.has_sw_writable):
+                continue
+
+            regwidth = child.get_property('regwidth')
+            if run and ((child.raw_address_offset != end) or (regwidth != width)):
+                runs.append(run)
+                run = []
+            run.append(child)
+            end = child.raw_address_offset + child.total_size
+            width = regwidth
+        if run:
+            runs.append(run)
+        return runs
+
+
+    @_node_memoized
+    def _get_register_masks(self, node: RegNode) -> dict:
+        """
+        Combines the reset values and access policies of a register's fields
+        into values of the whole register.
+
+        Returns a dictionary of constant names and values
+        """
+        masks = {
+            'RESET_VALUE': 0,
+            'HAS_RESET_MASK': 0,
+            'VOLATILE_MASK': 0,
+            'READ_MASK': 0,
+            'WRITE_MASK': 0,
+        }
+        checked_mask = 0
+        for field in node.fields():
+            mask = ((1 << field.width) - 1) << field.lsb
+            reset = field.get_property('reset')
+            if reset is not None:
+                masks['RESET_VALUE'] |= (reset << field.lsb) & mask
+                masks['HAS_RESET_MASK'] |= mask
+            if field.is_volatile:
+                masks['VOLATILE_MASK'] |= mask
+            if field.is_sw_readable:
+                masks['READ_MASK'] |= mask
+            if field.is_sw_writable:
+                masks['WRITE_MASK'] |= mask
+            # Same bits as uvm_reg::do_check() compares: volatile fields are
+            # configured with UVM_NO_CHECK, and write-only ones are never
+            # compared
+            if not (field.is_volatile or self._get_field_access(field).startswith("WO")):
+                checked_mask |= mask
+        # Bits that are not implemented by any field are not compared either
+        masks['DONT_CARE_MASK'] = ((1 << node.get_property('regwidth')) - 1) & ~checked_mask
+        return masks
+
+
+    def _get_decode_groups(self, node: Node) -> list:
+        """
+        Returns the children that decode_reg() can return a register from,
+        grouped into disjoint address ranges, sorted by address.
+        Children whose ranges overlap, such as interleaved arrays, share the
+        same group.
+
+        Returns a list of (start, end, [children]) tuples
+        """
+        children = []
+        for child in node.children():
+            if isinstance(child, RegNode):
+                if self._is_vreg_array(child):
+                    continue
+            elif not isinstance(child, (RegfileNode, AddrmapNode)):
+                continue
+            end = child.raw_address_offset + child.total_size
+            children.append((child.raw_address_offset, end, child))
+        children.sort(key=lambda c: c[0])
+
+        groups = []
+        for start, end, child in children:
+            if groups and (start < groups[-1][1]):
+                groups[-1][1] = max(groups[-1][1], end)
+                groups[-1][2].append(child)
+            else:
+                groups.append([start, end, [child]])
+        return [tuple(group) for group in groups]
+
+
+    def _get_array_index_exprs(self, node: AddressableNode, rel: str) -> list:
+        """
+        Returns expressions for each array index of the element that contains
+        the offset ``rel``, relative to the start of the array
+        """
+        exprs = []
+        for i, m in enumerate(get_dimension_strides(node)):
+            expr = "%s / 'h%x" % (rel, m)
+            if i > 0:
+                expr = "(%s) %% %d" % (expr, node.array_dimensions[i])
+            exprs.append(expr)
+        return exprs
+
+
     def _get_endianness(self, node: Node) -> str:
         amap = node.owning_addrmap
         if amap.get_property("bigendian"):
@@ -363,6 +1635,7 @@ class UVMExporter:
             return "UVM_NO_ENDIAN"
 
 
+    @_node_memoized
     def _get_bus_width(self, node: Node) -> int:
         """
         Returns group-like node's bus width (in bytes)
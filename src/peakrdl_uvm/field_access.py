@@ -0,0 +1,97 @@
+from itertools import product
+from typing import Optional
+
+from systemrdl.node import FieldNode
+from systemrdl.rdltypes import AccessType, OnReadType, OnWriteType
+
+
+def _compute_field_access(sw: AccessType, onread: Optional[OnReadType], onwrite: Optional[OnWriteType]) -> str:
+    if sw == AccessType.rw:
+        if (onwrite is None) and (onread is None):
+            return "RW"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.woset):
+            return "W1SRC"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wzs):
+            return "W0SRC"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wset):
+            return "WSRC"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.woclr):
+            return "W1CRS"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wzc):
+            return "W0CRS"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wclr):
+            return "WCRS"
+        elif onwrite == OnWriteType.woclr:
+            return "W1C"
+        elif onwrite == OnWriteType.woset:
+            return "W1S"
+        elif onwrite == OnWriteType.wot:
+            return "W1T"
+        elif onwrite == OnWriteType.wzc:
+            return "W0C"
+        elif onwrite == OnWriteType.wzs:
+            return "W0S"
+        elif onwrite == OnWriteType.wzt:
+            return "W0T"
+        elif onwrite == OnWriteType.wclr:
+            return "WC"
+        elif onwrite == OnWriteType.wset:
+            return "WS"
+        elif onread == OnReadType.rclr:
+            return "WRC"
+        elif onread == OnReadType.rset:
+            return "WRS"
+        else:
+            return "RW"
+
+    elif sw == AccessType.r:
+        if onread is None:
+            return "RO"
+        elif onread == OnReadType.rclr:
+            return "RC"
+        elif onread == OnReadType.rset:
+            return "RS"
+        else:
+            return "RO"
+
+    elif sw == AccessType.w:
+        if onwrite is None:
+            return "WO"
+        elif onwrite == OnWriteType.wclr:
+            return "WOC"
+        elif onwrite == OnWriteType.wset:
+            return "WOS"
+        else:
+            return "WO"
+
+    elif sw == AccessType.rw1:
+        return "W1"
+
+    elif sw == AccessType.w1:
+        return "WO1"
+
+    else: # na
+        return "NOACCESS"
+
+
+# UVM access string of every combination of the sw, onread and onwrite
+# properties
+# key = (sw, onread, onwrite). onread and onwrite are None if not set
+# value = UVM access string
+FIELD_ACCESS_TABLE = {
+    (sw, onread, onwrite): _compute_field_access(sw, onread, onwrite)
+    for sw, onread, onwrite in product(
+        AccessType, [None] + list(OnReadType), [None] + list(OnWriteType)
+    )
+}
+
+
+def get_field_access(field: FieldNode) -> str:
+    """
+    Get the UVM access string of a field, such as "RW" or "W1C"
+    """
+    return FIELD_ACCESS_TABLE[(
+        field.get_property("sw"),
+        field.get_property("onread"),
+        field.get_property("onwrite"),
+    )]
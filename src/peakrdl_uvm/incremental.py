@@ -0,0 +1,333 @@
+import os
+import json
+import hashlib
+import functools
+from typing import TYPE_CHECKING, Optional
+
+from systemrdl.node import Node, AddressableNode, FieldNode, RegNode, RegfileNode, AddrmapNode
+from systemrdl.rdltypes import PropertyReference, UserStruct
+from systemrdl.properties.bases import PropertyRule
+from systemrdl.properties.user_defined import ExternalUserProperty
+
+from .__about__ import __version__
+
+if TYPE_CHECKING:
+    import jinja2 as jj
+    from .exporter import UVMExporter
+
+
+class ExportState:
+    """
+    Rendered class definitions from a previous export, keyed by class hash.
+
+    The state of each output file is kept in its own file within the state
+    directory, and only holds the classes used by the most recent export.
+    State files are named after a hash of the output file's absolute path, so
+    that outputs with the same name in different directories can share a
+    state directory.
+    """
+    def __init__(self, state_dir: str, path: str):
+        path_hash = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(
+            state_dir,
+            "%s.%s.peakrdl_uvm.json" % (os.path.basename(path), path_hash)
+        )
+
+        # Class definitions available from the previous export
+        # key = class hash
+        # value = rendered text
+        self.previous = {}
+
+        # Class definitions used by the current export
+        self.current = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except ValueError:
+                # Unreadable state. Start over
+                state = {}
+            if state.get("version", None) == __version__:
+                self.previous = state.get("classes", {})
+
+
+    def get(self, class_hash: str) -> Optional[str]:
+        text = self.previous.get(class_hash, None)
+        if text is not None:
+            self.current[class_hash] = text
+        return text
+
+
+    def put(self, class_hash: str, text: str) -> None:
+        self.current[class_hash] = text
+
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = {
+            "version": __version__,
+            "classes": self.current,
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+
+def write_if_changed(chunks, path: str, encoding: str = "utf-8") -> bool:
+    """
+    Write text chunks to a file, unless the file already has the same contents.
+    Leaving unchanged files untouched preserves their timestamps for build
+    tools that track dependencies.
+
+    The text is streamed to a temporary file that replaces the original only
+    if it differs, so that memory usage does not depend on the file size.
+
+    Returns True if the file was written.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk.encode(encoding))
+
+    if os.path.exists(path) and _same_contents(tmp_path, path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def _same_contents(path_a: str, path_b: str) -> bool:
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open(path_a, "rb") as fa, open(path_b, "rb") as fb:
+        while True:
+            a = fa.read(65536)
+            if a != fb.read(65536):
+                return False
+            if not a:
+                return True
+
+
+def get_template_fingerprint(jj_env: 'jj.Environment') -> str:
+    """
+    Hash of the source of all templates visible to the environment
+    """
+    h = hashlib.sha256()
+    for name in jj_env.list_templates():
+        source = jj_env.loader.get_source(jj_env, name)[0]
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(source.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def get_class_hashes(exporter: 'UVMExporter', options_key: str) -> dict:
+    """
+    Computes a hash for each class in the exporter's type table.
+
+    A class hash covers everything its definition is rendered from:
+    the export options, the representative node's properties and the ones
+    of its direct children, the hashes of the children's classes, and the
+    values that the children's class overrides apply.
+    A change anywhere in the subtree therefore changes the hash of every
+    enclosing class.
+
+    Returns a dictionary of class name --> hash
+    """
+    hashes = {}
+    # Type table is in post-order, so child class hashes are always known
+    for class_name, node in exporter.type_table.items():
+        h = hashlib.sha256()
+        h.update(options_key.encode("utf-8"))
+        _update_node_hash(h, exporter, node)
+        for child in node.children():
+            _update_node_hash(h, exporter, child)
+            if isinstance(child, AddressableNode):
+                h.update(hashes[exporter._get_class_name(child)].encode("utf-8"))
+                # Differences from the child's class are rendered by this class
+                _update_overrides_hash(h, exporter, child)
+        hashes[class_name] = h.hexdigest()
+    return hashes
+
+
+def _update_overrides_hash(h, exporter: 'UVMExporter', node: Node) -> None:
+    for _, ref, target, kind in exporter._get_class_overrides(node):
+        items = [ref, kind]
+        if isinstance(target, FieldNode):
+            items.append(target.get_property('reset'))
+        else:
+            items.append(target.get_property('hdl_path'))
+            items.append(target.get_property('hdl_path_gate'))
+            if isinstance(target, RegNode):
+                items.append(exporter._get_field_hdl_path_slices(target))
+        h.update(repr(items).encode("utf-8"))
+
+
+def _update_node_hash(h, exporter: 'UVMExporter', node: Node) -> None:
+    items = [
+        node.component_type_name,
+        node.inst_name,
+    ]
+    if isinstance(node, FieldNode):
+        items.extend([node.lsb, node.msb])
+    else:
+        items.append(exporter._get_class_name(node))
+        items.append(exporter._get_endianness(node))
+    if isinstance(node, (AddrmapNode, RegfileNode)):
+        items.append(exporter._get_bus_width(node))
+    if isinstance(node, AddressableNode):
+        items.extend([
+            node.raw_address_offset,
+            node.array_dimensions,
+            node.array_stride,
+            node.size,
+        ])
+    for prop, value in exporter._get_resolved_properties(node):
+        items.append(prop)
+        items.append(_stable_repr(value))
+
+    h.update(repr(items).encode("utf-8"))
+    h.update(b"\0")
+
+
+# Properties that are not rendered into any class definition
+_UNRENDERED_PROPERTIES = ("name", "desc")
+
+# Properties of a node that are only rendered by its parent's class
+# definition
+_INSTANCE_PROPERTIES = ("hdl_path", "hdl_path_gate")
+
+# Properties of children that a merged class can override per instance.
+# See UVMExporter._get_class_overrides()
+_OVERRIDABLE_PROPERTIES = ("hdl_path", "hdl_path_gate", "hdl_path_slice", "hdl_path_gate_slice")
+
+
+def get_structural_hash(exporter: 'UVMExporter', node: Node, relaxed: bool = False) -> str:
+    """
+    Computes a hash of the content of a node's class definition:
+    its own properties, and the instance names, addressing, properties and
+    class names of its children.
+
+    Unlike class hashes, it does not depend on the node's instance name,
+    its class name or the export options, so that structurally identical
+    nodes get the same hash.
+
+    If relaxed is set, the HDL paths of the children and the values of
+    their static resets are left out, so that nodes that only differ by them
+    get the same hash.
+    """
+    h = hashlib.sha256()
+    items = [
+        node.component_type_name,
+        exporter._get_endianness(node),
+    ]
+    for prop, value in exporter._get_resolved_properties(node):
+        if (prop in _UNRENDERED_PROPERTIES) or (prop in _INSTANCE_PROPERTIES):
+            continue
+        items.append(prop)
+        items.append(_stable_repr(value))
+    h.update(repr(items).encode("utf-8"))
+    h.update(b"\0")
+
+    for child in node.children():
+        items = [
+            child.component_type_name,
+            child.inst_name,
+        ]
+        if isinstance(child, FieldNode):
+            items.extend([child.lsb, child.msb])
+        if isinstance(child, AddressableNode):
+            items.extend([
+                exporter._get_class_name(child),
+                child.raw_address_offset,
+                child.array_dimensions,
+                child.array_stride,
+                child.size,
+            ])
+        for prop, value in exporter._get_resolved_properties(child):
+            if prop in _UNRENDERED_PROPERTIES:
+                continue
+            if relaxed and (prop in _OVERRIDABLE_PROPERTIES):
+                continue
+            items.append(prop)
+            if relaxed and (prop == "reset") and isinstance(value, int):
+                # Only whether the reset is static matters
+                items.append("<static>")
+            else:
+                items.append(_stable_repr(value))
+        h.update(repr(items).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# Properties that are left out of hashes. The default value of resetsignal is
+# searched for in the enclosing hierarchy, which is slow, and is not used by
+# the exporter
+_UNHASHED_PROPERTIES = ("resetsignal",)
+
+
+def get_resolved_properties(node: Node) -> list:
+    """
+    Returns (name, value) of the properties of a node that differ from their
+    default value, sorted by name.
+
+    Values are resolved, so a property that is explicitly assigned its
+    default value is left out, like one that is not assigned. Nodes of the
+    same component type have the same list if all of their properties
+    resolve to the same values.
+    """
+    assigned = node.inst.properties
+    props = []
+    for prop, default, is_derived in _get_property_defaults(node.env.property_rules, type(node.inst)):
+        if (prop not in assigned) and not is_derived:
+            # Resolves to its default value
+            continue
+        value = node.get_property(prop)
+        if (type(value) is not type(default)) or (value != default):
+            props.append((prop, value))
+    return props
+
+
+@functools.lru_cache(maxsize=16)
+def _get_property_defaults(property_rules, comp_type: type) -> tuple:
+    """
+    Returns (name, default value, is_derived) of every property a component
+    type can have, sorted by name.
+
+    is_derived is set if the default value of the property is derived from
+    other properties, rather than a constant.
+    """
+    rules = []
+    for prop, rule in property_rules.rdl_properties.items():
+        if (comp_type in rule.bindable_to) and (prop not in _UNHASHED_PROPERTIES):
+            rules.append((prop, rule))
+    for prop, rule in property_rules.user_properties.items():
+        if isinstance(rule, ExternalUserProperty) and rule.is_soft:
+            continue
+        if comp_type in rule.bindable_to:
+            rules.append((prop, rule))
+
+    defaults = []
+    for prop, rule in sorted(rules, key=lambda item: item[0]):
+        is_derived = type(rule).get_default is not PropertyRule.get_default
+        defaults.append((prop, rule.default, is_derived))
+    return tuple(defaults)
+
+
+def _stable_repr(value) -> str:
+    """
+    repr() of a property value that does not depend on object identity
+    """
+    if isinstance(value, Node):
+        return "<node %s>" % value.get_path()
+    if isinstance(value, PropertyReference):
+        return "<ref %s->%s>" % (value.node.get_path(), value.name)
+    if isinstance(value, (list, tuple)):
+        return "[%s]" % ", ".join(_stable_repr(v) for v in value)
+    if isinstance(value, UserStruct):
+        return "<struct %s {%s}>" % (
+            value.type_name,
+            ", ".join("%s: %s" % (name, _stable_repr(v)) for name, v in value.members.items())
+        )
+    return repr(value)
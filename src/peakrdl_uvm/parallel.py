@@ -0,0 +1,41 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# State shared with forked worker processes.
+# Worker processes inherit it from the parent process instead of receiving it
+# through pickling, which would not be possible for the register model.
+_fork_state = None
+
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def run_tasks(func, state, n_tasks: int, jobs: int = 1) -> list:
+    """
+    Calls ``func(state, i)`` for each task index ``i`` in ``range(n_tasks)``,
+    and returns the results in task order.
+
+    If ``jobs`` is greater than 1, tasks are distributed across that many
+    forked worker processes. Task results must be picklable.
+    Platforms that cannot fork run all tasks in the current process.
+    """
+    global _fork_state # pylint: disable=global-statement
+
+    if (jobs <= 1) or (n_tasks <= 1) or not can_fork():
+        return [func(state, i) for i in range(n_tasks)]
+
+    _fork_state = (func, state)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, n_tasks),
+            mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            return list(executor.map(_run_task, range(n_tasks)))
+    finally:
+        _fork_state = None
+
+
+def _run_task(i):
+    func, state = _fork_state
+    return func(state, i)
@@ -0,0 +1,147 @@
+import gc
+import pickle
+import copyreg
+from collections import OrderedDict
+
+from systemrdl import component as comp
+from systemrdl.compiler import RDLEnvironment
+from systemrdl.source_ref import SourceRefBase
+
+from .__about__ import __version__
+
+# Plan file layout: a pickled (MAGIC, __version__) header, followed by the
+# pickled user-defined property rules and ExportPlan
+MAGIC = "peakrdl-uvm-plan"
+
+
+class ExportPlan:
+    """
+    Results of the analysis of a design, from ``UVMExporter.build_plan()``.
+
+    A plan can be exported by ``UVMExporter.export()`` and
+    ``UVMExporter.export_many()`` in place of the node it was built from,
+    with any of the options that do not affect class naming.
+    """
+    def __init__(self, top, analysis_key: tuple, *, bus_width_db: dict, type_table: dict,
+                 merged_class_names: dict, node_cache: dict):
+        # Top-level node
+        self.top = top
+
+        # Class naming options the plan was analyzed with.
+        # See UVMExporter._get_analysis_key()
+        self.analysis_key = analysis_key
+
+        # Results of UVMExporter._analyze()
+        self.bus_width_db = bus_width_db
+        self.type_table = type_table
+        self.merged_class_names = merged_class_names
+
+        # Values derived from nodes. See _node_memoized()
+        self.node_cache = node_cache
+
+
+    @property
+    def options(self) -> dict:
+        """
+        Export options of the plan's class naming
+        """
+        return dict(zip(
+            ("reuse_class_definitions", "structural_class_names", "merge_similar_classes", "vreg_array_threshold"),
+            self.analysis_key
+        ))
+
+
+    def save(self, path: str) -> None:
+        """
+        Write the plan to a file.
+
+        Only the parts of the design that templates can use are saved:
+        source references, parameters and the contents of component
+        definitions are left out. Property values, including the ones of
+        user-defined properties, are kept along with the user-defined
+        property rules, so that user templates render the same output from a
+        plan as from the design.
+        """
+        env = self.top.env
+        with open(path, "wb") as f:
+            pickle.dump((MAGIC, __version__), f)
+            _PlanPickler(f).dump((env.property_rules.user_properties, self))
+
+
+    @classmethod
+    def load(cls, path: str) -> 'ExportPlan':
+        """
+        Read a plan written by ``save()``.
+
+        The plan's nodes are attached to a new compiler environment. Plans
+        can only be loaded by the version of PeakRDL-uvm that saved them.
+        Plans are pickled, so only load them from trusted sources.
+        """
+        with open(path, "rb") as f:
+            try:
+                magic, version = pickle.load(f)
+            except Exception as e:
+                raise ValueError("'%s' is not an export plan" % path) from e
+            if magic != MAGIC:
+                raise ValueError("'%s' is not an export plan" % path)
+            if version != __version__:
+                raise ValueError(
+                    "Export plan '%s' was saved by PeakRDL-uvm %s. Expected %s"
+                    % (path, version, __version__)
+                )
+            # Loading creates many objects at once. Collecting garbage in
+            # the meantime only slows it down
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            env = RDLEnvironment({})
+            try:
+                user_properties, plan = _PlanUnpickler(f, env).load()
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            env.property_rules.user_properties.update(user_properties)
+            return plan
+
+
+class _PlanPickler(pickle.Pickler):
+    def __init__(self, f):
+        super().__init__(f, pickle.HIGHEST_PROTOCOL)
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        for cls in (comp.Root, comp.Addrmap, comp.Regfile, comp.Reg, comp.Field, comp.Mem, comp.Signal):
+            self.dispatch_table[cls] = self._reduce_component
+
+    def persistent_id(self, obj):
+        # The environment holds the compiler's message handler and property
+        # rules, and is replaced on load. Source references are only used by
+        # compiler messages
+        if isinstance(obj, RDLEnvironment):
+            return "env"
+        if isinstance(obj, SourceRefBase):
+            return "src_ref"
+        return None
+
+    def _reduce_component(self, obj: comp.Component) -> tuple:
+        state = dict(obj.__dict__)
+        state['parameters_dict'] = OrderedDict()
+        state['inst_src_ref'] = None
+        state['def_src_ref'] = None
+        state['property_src_ref'] = {}
+        if isinstance(obj, comp.Root):
+            state['comp_defs'] = OrderedDict()
+        elif not obj.is_instance:
+            # Definitions are only referenced for their type and scope names,
+            # or as the root of component references
+            state['children'] = []
+            state['properties'] = {}
+        return (copyreg.__newobj__, (type(obj),), state)
+
+
+class _PlanUnpickler(pickle.Unpickler):
+    def __init__(self, f, env: RDLEnvironment):
+        super().__init__(f)
+        self.env = env
+
+    def persistent_load(self, pid):
+        if pid == "env":
+            return self.env
+        return None
@@ -1,5 +1,4 @@
-
-from systemrdl import RDLListener
+from systemrdl import RDLListener, WalkerAction
 
 class PreExportListener(RDLListener):
     def __init__(self, exporter):
@@ -8,14 +7,18 @@ class PreExportListener(RDLListener):
         # Max width in bits
         self.max_width_stack = []
 
+        # Class type name of each node being visited.
+        # None if the node's class was already registered in the type table
+        self.class_name_stack = []
+
     def enter_Addrmap(self, node):
-        self.enter_group(node)
+        return self.enter_group(node)
 
     def exit_Addrmap(self, node):
         self.exit_group(node)
 
     def enter_Regfile(self, node):
-        self.enter_group(node)
+        return self.enter_group(node)
 
     def exit_Regfile(self, node):
         self.exit_group(node)
@@ -23,14 +26,51 @@ class PreExportListener(RDLListener):
     def enter_Reg(self, node):
         # Update max width in stack
         self.max_width_stack[-1] = max(node.get_property("accesswidth"), self.max_width_stack[-1])
+        if self.enter_class(node) is not None:
+            return WalkerAction.SkipDescendants
+        return None
+
+    def exit_Reg(self, node):
+        self.exit_class(node)
 
     def enter_Mem(self, node):
         # Update max width in stack
         self.max_width_stack[-1] = max(node.get_property("memwidth"), self.max_width_stack[-1])
+        if self.enter_class(node) is not None:
+            return WalkerAction.SkipDescendants
+        return None
+
+    def exit_Mem(self, node):
+        self.exit_class(node)
 
 
-    def enter_group(self, node): # pylint: disable=unused-argument
-        self.max_width_stack.append(0)
+    def enter_group(self, node):
+        rep = self.enter_class(node)
+        if rep is None:
+            self.check_vreg_mem_names(node)
+            self.max_width_stack.append(0)
+            return None
+
+        # Descendants are identical to the ones of the existing class
+        # definition, and so is the bus width
+        self.max_width_stack.append(self.exporter.bus_width_db[rep.get_path()])
+        return WalkerAction.SkipDescendants
+
+    def check_vreg_mem_names(self, node):
+        """
+        Register arrays that are modeled as virtual registers add a
+        "<name>_mem" memory to their parent's class. Check that it does not
+        clash with a sibling of the same name.
+        """
+        names = set(child.inst_name for child in node.children())
+        for child in node.children():
+            if self.exporter._is_vreg_array(child) and (child.inst_name + "_mem") in names:
+                child.env.msg.fatal(
+                    "Register array '%s' is modeled as a virtual register, and its memory '%s_mem' conflicts "
+                    "with the instance of the same name. Rename one of them, or raise vreg_array_threshold."
+                    % (child.inst_name, child.inst_name),
+                    child.inst_src_ref
+                )
 
     def exit_group(self, node):
         max_width = self.max_width_stack.pop()
@@ -41,3 +81,36 @@ class PreExportListener(RDLListener):
         # Propagate max width to parent
         if self.max_width_stack:
             self.max_width_stack[-1] = max(max_width, self.max_width_stack[-1])
+
+        self.exit_class(node)
+
+
+    def enter_class(self, node):
+        """
+        Look up the node's class in the type table.
+
+        Returns the node that represents the existing class definition, or None
+        if this node needs a new one.
+        If an equivalent class was already registered, its definition already
+        covers everything below this node, so the walk can skip the descendants.
+        """
+        class_name = self.exporter._get_class_name(node)
+        rep = self.exporter.type_table.get(class_name, None)
+        if rep is None:
+            self.class_name_stack.append(class_name)
+            return None
+
+        # Sanity-check for collisions
+        identity = self.exporter._get_class_identity(rep)
+        if (identity is None) or (identity != self.exporter._get_class_identity(node)):
+            raise RuntimeError("Namespace collision! Type-name generation is not robust enough to create unique names!")
+
+        self.class_name_stack.append(None)
+        return rep
+
+    def exit_class(self, node):
+        class_name = self.class_name_stack.pop()
+        if class_name is not None:
+            # Register in post-order so that a class is always defined after
+            # the classes it depends on
+            self.exporter.type_table[class_name] = node
@@ -0,0 +1,163 @@
+import os
+import time
+import json
+from contextlib import contextmanager
+
+import jinja2 as jj
+
+
+class ExportProfiler:
+
+    def __init__(self):
+        """
+        Collects wall time and call counts while exporting.
+
+        Pass an instance to ``UVMExporter.export(profiler=...)``. The same
+        profiler can be re-used across several exports, in which case the
+        results accumulate.
+
+        All times are in seconds, and are inclusive of any nested calls.
+        For example, the time reported for ``uvm_reg_block.class_definition``
+        also contains the time spent in the ``uvm_reg_block.build_instance``
+        calls that it makes.
+        """
+        # key = phase name
+        # value = [call count, time]
+        self.phases = {}
+
+        # key = <template>.<macro name>
+        # value = [call count, time]
+        self.macros = {}
+
+        # key = template context helper name
+        # value = [call count, time]
+        self.helpers = {}
+
+        # Cache of macro function code object --> macro report name
+        self._macro_names = {}
+
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager that times the enclosed block as an export phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(self.phases, name, time.perf_counter() - start)
+
+
+    def dump(self, chunks, path: str, encoding: str = "utf-8") -> None:
+        """
+        Write rendered template output to a file.
+        Equivalent to ``TemplateStream.dump()``, except that the time spent
+        rendering and the time spent writing the file are recorded as
+        separate phases.
+        """
+        render = self.phases.setdefault("render", [0, 0.0])
+        write = self.phases.setdefault("write", [0, 0.0])
+        render[0] += 1
+        write[0] += 1
+
+        it = iter(chunks)
+        with open(path, "wb") as f:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    render[1] += time.perf_counter() - start
+                    break
+                end = time.perf_counter()
+                render[1] += end - start
+                f.write(chunk.encode(encoding))
+                write[1] += time.perf_counter() - end
+
+
+    def wrap_helper(self, name: str, func):
+        """
+        Returns a wrapper around a template context helper function that
+        records its call count and time.
+        """
+        stat = self.helpers.setdefault(name, [0, 0.0])
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stat[0] += 1
+                stat[1] += time.perf_counter() - start
+        return wrapper
+
+
+    def record_macro(self, macro: jj.runtime.Macro, elapsed: float) -> None:
+        code = macro._func.__code__
+        name = self._macro_names.get(code, None)
+        if name is None:
+            template_name = os.path.splitext(os.path.basename(code.co_filename))[0]
+            name = "%s.%s" % (template_name, macro.name)
+            self._macro_names[code] = name
+        self._add(self.macros, name, elapsed)
+
+
+    def _add(self, db: dict, name: str, elapsed: float) -> None:
+        stat = db.setdefault(name, [0, 0.0])
+        stat[0] += 1
+        stat[1] += elapsed
+
+
+    def report(self) -> dict:
+        """
+        Returns the collected results as a JSON-compatible dictionary
+        """
+        def to_dict(db):
+            items = sorted(db.items(), key=lambda kv: kv[1][1], reverse=True)
+            return {
+                name: {"calls": calls, "time": elapsed}
+                for name, (calls, elapsed) in items
+            }
+
+        return {
+            "phases": to_dict(self.phases),
+            "macros": to_dict(self.macros),
+            "helpers": to_dict(self.helpers),
+        }
+
+
+    def write_json(self, path: str) -> None:
+        """
+        Write the report to a JSON file
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=4)
+
+
+def get_profiling_environment(jj_env: jj.Environment) -> jj.Environment:
+    """
+    Create an overlay of the template environment that reports each macro
+    call to the profiler assigned to its ``peakrdl_profiler`` attribute.
+
+    The overlay keeps its own template cache since templates are bound to the
+    environment that compiled them.
+    """
+    env = jj_env.overlay(cache_size=400)
+    env.context_class = _ProfilingContext
+    env.peakrdl_profiler = None
+    return env
+
+
+class _ProfilingContext(jj.runtime.Context):
+    """
+    Template context that times every macro call made from within templates
+    """
+    def call(__self, __obj, *args, **kwargs): # pylint: disable=no-self-argument
+        if not isinstance(__obj, jj.runtime.Macro):
+            return super().call(__obj, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return super().call(__obj, *args, **kwargs)
+        finally:
+            __self.environment.peakrdl_profiler.record_macro(__obj, time.perf_counter() - start)
@@ -0,0 +1,289 @@
+import json
+import mmap
+import struct
+from collections import namedtuple
+from typing import Callable, Iterator, List, Optional
+
+from systemrdl.node import RegNode, FieldNode
+
+from .address_table import AddressTable
+
+# Binary register database layout. All values are little-endian.
+#
+#   Header
+#   Register records, sorted by address
+#   Field records
+#   String table: NUL-terminated UTF-8 strings
+#
+# String references are byte offsets into the string table. NO_STRING marks
+# an absent string.
+MAGIC = b"PRDLUVM\0"
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+
+# magic, version, n_regs, n_fields, regs offset, fields offset, strings offset, strings size
+_HEADER = struct.Struct("<8sIIIQQQQ")
+
+# address, size, path, width, first field, n_fields
+# Memories are stored as records without fields
+_REG = struct.Struct("<QQIIII")
+
+# name, lsb, width, access, flags, reset, hdl_path, hdl_path_gate
+_FIELD = struct.Struct("<IHHIB3xQII")
+
+# Field record flags
+FLAG_HAS_RESET = 0x1
+FLAG_VOLATILE = 0x2
+
+RegisterRecord = namedtuple("RegisterRecord", ["path", "address", "size", "width", "fields"])
+
+# hdl_path and hdl_path_gate hold the field's HDL path slices, separated by
+# commas. For per-bit slices, the first one is for the field's msb
+FieldRecord = namedtuple(
+    "FieldRecord",
+    ["name", "lsb", "width", "access", "reset", "has_reset", "is_volatile", "hdl_path", "hdl_path_gate"]
+)
+
+
+def iter_register_records(node, get_field_access: Callable[[FieldNode], str]) -> Iterator[RegisterRecord]:
+    """
+    Yields a RegisterRecord for every register and memory in the design, with
+    arrays unrolled, in address map order.
+    """
+    table = AddressTable(node)
+
+    # Fields are the same for all elements of an array
+    # key = table entry index
+    # value = list of FieldRecord
+    entry_fields = {}
+
+    for i, path, address in table.iter_flat_entries():
+        entry_node = table.nodes[i]
+        fields = entry_fields.get(i, None)
+        if fields is None:
+            if isinstance(entry_node, RegNode):
+                fields = [_get_field_record(field, get_field_access) for field in entry_node.fields()]
+            else:
+                fields = []
+            entry_fields[i] = fields
+
+        if isinstance(entry_node, RegNode):
+            width = entry_node.get_property('regwidth')
+        else:
+            width = entry_node.get_property('memwidth')
+
+        yield RegisterRecord(path, address, table.size[i], width, fields)
+
+
+def _get_field_record(field: FieldNode, get_field_access: Callable[[FieldNode], str]) -> FieldRecord:
+    reset = field.get_property('reset')
+    hdl_path = field.get_property('hdl_path_slice')
+    hdl_path_gate = field.get_property('hdl_path_gate_slice')
+    return FieldRecord(
+        field.inst_name,
+        field.lsb,
+        field.width,
+        get_field_access(field),
+        # Resets that refer to other components have no static value
+        reset if isinstance(reset, int) else 0,
+        reset is not None,
+        field.is_volatile,
+        ",".join(hdl_path) if hdl_path else None,
+        ",".join(hdl_path_gate) if hdl_path_gate else None,
+    )
+
+
+def write_register_db(records: Iterator[RegisterRecord], path: str) -> None:
+    """
+    Write register records to a binary register database file.
+    Records are sorted by address so that the file can be searched in place.
+
+    Reset values wider than 64 bits are truncated.
+    """
+    records = sorted(records, key=lambda record: record.address)
+
+    strings = bytearray()
+    string_offsets = {}
+    def add_string(s: Optional[str]) -> int:
+        if s is None:
+            return NO_STRING
+        offset = string_offsets.get(s, None)
+        if offset is None:
+            offset = string_offsets[s] = len(strings)
+            strings.extend(s.encode("utf-8"))
+            strings.append(0)
+        return offset
+
+    reg_data = bytearray()
+    field_data = bytearray()
+    # Field records are shared by records that have the same field list,
+    # such as array elements
+    # key = id of the field list
+    # value = index of the first field record
+    field_starts = {}
+    n_fields = 0
+    for record in records:
+        field_start = field_starts.get(id(record.fields), None)
+        if field_start is None:
+            field_start = field_starts[id(record.fields)] = n_fields
+            for field in record.fields:
+                flags = 0
+                if field.has_reset:
+                    flags |= FLAG_HAS_RESET
+                if field.is_volatile:
+                    flags |= FLAG_VOLATILE
+                field_data.extend(_FIELD.pack(
+                    add_string(field.name),
+                    field.lsb,
+                    field.width,
+                    add_string(field.access),
+                    flags,
+                    field.reset & 0xFFFFFFFFFFFFFFFF,
+                    add_string(field.hdl_path),
+                    add_string(field.hdl_path_gate),
+                ))
+            n_fields += len(record.fields)
+
+        reg_data.extend(_REG.pack(
+            record.address,
+            record.size,
+            add_string(record.path),
+            record.width,
+            field_start,
+            len(record.fields),
+        ))
+
+    regs_offset = _HEADER.size
+    fields_offset = regs_offset + len(reg_data)
+    strings_offset = fields_offset + len(field_data)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, len(records), n_fields,
+            regs_offset, fields_offset, strings_offset, len(strings)
+        ))
+        f.write(reg_data)
+        f.write(field_data)
+        f.write(strings)
+
+
+def write_register_db_json(records: Iterator[RegisterRecord], path: str) -> None:
+    """
+    Write register records to a JSON register database file
+    """
+    registers = []
+    for record in sorted(records, key=lambda record: record.address):
+        registers.append({
+            "path": record.path,
+            "address": record.address,
+            "size": record.size,
+            "width": record.width,
+            "fields": [field._asdict() for field in record.fields],
+        })
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, "registers": registers}, f)
+
+
+class RegisterDB:
+    """
+    Reader for binary register database files.
+
+    The file is memory-mapped, and records are only decoded when accessed,
+    so opening large databases is fast.
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, version, self._n_regs, self._n_fields,
+            self._regs_offset, self._fields_offset, self._strings_offset, _
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError("'%s' is not a register database file" % path)
+        if version != VERSION:
+            raise ValueError("Unsupported register database version: %d" % version)
+
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self._n_regs
+
+
+    def __getitem__(self, i: int) -> RegisterRecord:
+        if i < 0:
+            i += self._n_regs
+        if not 0 <= i < self._n_regs:
+            raise IndexError("register index out of range")
+        address, size, path, width, field_start, n_fields = _REG.unpack_from(
+            self._mm, self._regs_offset + i * _REG.size
+        )
+        return RegisterRecord(
+            self._get_string(path), address, size, width,
+            self._get_fields(field_start, n_fields)
+        )
+
+
+    def __iter__(self) -> Iterator[RegisterRecord]:
+        for i in range(self._n_regs):
+            yield self[i]
+
+
+    def _get_address(self, i: int) -> int:
+        return struct.unpack_from("<Q", self._mm, self._regs_offset + i * _REG.size)[0]
+
+
+    def _get_string(self, offset: int) -> Optional[str]:
+        if offset == NO_STRING:
+            return None
+        start = self._strings_offset + offset
+        end = self._mm.find(b"\0", start)
+        return self._mm[start:end].decode("utf-8")
+
+
+    def _get_fields(self, field_start: int, n_fields: int) -> List[FieldRecord]:
+        fields = []
+        for i in range(field_start, field_start + n_fields):
+            name, lsb, width, access, flags, reset, hdl_path, hdl_path_gate = _FIELD.unpack_from(
+                self._mm, self._fields_offset + i * _FIELD.size
+            )
+            fields.append(FieldRecord(
+                self._get_string(name), lsb, width, self._get_string(access),
+                reset, bool(flags & FLAG_HAS_RESET), bool(flags & FLAG_VOLATILE),
+                self._get_string(hdl_path), self._get_string(hdl_path_gate),
+            ))
+        return fields
+
+
+    def lookup(self, address: int) -> Optional[RegisterRecord]:
+        """
+        Find the register or memory that contains the address.
+        Returns None if the address is not mapped.
+        """
+        # Binary search for the last record that starts at or before the address
+        lo = 0
+        hi = self._n_regs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_address(mid) <= address:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+
+        record = self[lo - 1]
+        if address >= record.address + record.size:
+            return None
+        return record
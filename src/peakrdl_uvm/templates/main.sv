@@ -4,17 +4,73 @@
 {% import 'uvm_reg_block.sv' as uvm_reg_block with context %}
 
 
-{% macro top() -%}
-    {%- for node in top_node.descendants(in_post_order=True) -%}
-        {{child_def(node)}}
-    {%- endfor -%}
-    {{child_def(top_node)}}
+{% macro include_list() %}
+{%- for file in include_files %}
+`include "{{file}}"
+{%- endfor %}
+{% endmacro %}
+
+
+{% macro forward_declaration_list() -%}
+// Forward declarations
+{%- for name in forward_declarations %}
+typedef class {{name}};
+{%- endfor %}
+{%- endmacro %}
+
+
+{% macro burst_hook_class(include_guard=false) -%}
+{%- if include_guard -%}
+`ifndef PEAKRDL_UVM_BURST_HOOK
+`define PEAKRDL_UVM_BURST_HOOK
+{% endif -%}
+// Accesses runs of contiguous registers for the burst_write() and
+// burst_read() tasks of register blocks.
+// By default, each register is accessed individually through its frontdoor.
+// Extend write_run() and read_run() to issue a single bus burst per run.
+class peakrdl_uvm_burst_hook extends uvm_object;
+    function new(string name = "peakrdl_uvm_burst_hook");
+        super.new(name);
+    endfunction : new
+
+    virtual task write_run(output uvm_status_e status, input uvm_reg regs[$], input uvm_reg_data_t values[$], input uvm_reg_map map, input uvm_sequence_base parent);
+        status = UVM_IS_OK;
+        foreach(regs[i]) begin
+            regs[i].write(status, values[i], UVM_FRONTDOOR, map, parent);
+            if (status != UVM_IS_OK)
+                return;
+        end
+    endtask : write_run
+
+    virtual task read_run(output uvm_status_e status, input uvm_reg regs[$], output uvm_reg_data_t values[$], input uvm_reg_map map, input uvm_sequence_base parent);
+        status = UVM_IS_OK;
+        values.delete();
+        foreach(regs[i]) begin
+            uvm_reg_data_t value;
+            regs[i].read(status, value, UVM_FRONTDOOR, map, parent);
+            values.push_back(value);
+            if (status != UVM_IS_OK)
+                return;
+        end
+    endtask : read_run
+
+    // Updates the mirrors of a run that was accessed without the registers'
+    // frontdoor. Not needed if the map's mirrors are updated by a predictor
+    // that monitors the bus.
+    function void predict_run(uvm_reg regs[$], uvm_reg_data_t values[$], uvm_predict_e kind, uvm_reg_map map);
+        foreach(regs[i])
+            void'(regs[i].predict(values[i], -1, kind, UVM_FRONTDOOR, map));
+    endfunction : predict_run
+endclass : peakrdl_uvm_burst_hook
+{%- if include_guard %}
+`endif
+{%- endif %}
 {%- endmacro %}
 
 
 {% macro child_def(node) -%}
     {%- if isinstance(node, RegNode) -%}
-        {%- if node.is_virtual -%}
+        {%- if node.is_virtual or is_vreg_array(node) -%}
             {{uvm_vreg.class_definition(node)}}
         {%- else -%}
             {{uvm_reg.class_definition(node)}}
@@ -3,6 +3,18 @@
 package {{package_name}};
     `include "uvm_macros.svh"
     import uvm_pkg::*;
-    {{ main.top()|indent}}
+    {% if burst_helpers -%}
+    {{ main.burst_hook_class()|indent }}
+    {% endif -%}
+    {% if forward_declarations -%}
+    {{ main.forward_declaration_list()|indent }}
+    {% endif -%}
+    {% if include_files -%}
+    {{ main.include_list()|indent }}
+    {%- else -%}
+    {%- for text in class_definition_texts -%}
+    {{ text|indent }}
+    {%- endfor -%}
+    {%- endif %}
 endpackage: {{package_name}}
 
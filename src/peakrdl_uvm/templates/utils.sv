@@ -53,3 +53,33 @@
         {%- endfor -%}
     {%- endif -%}
 {%- endmacro %}
+
+
+/*
+ * If node is an array, emit a list of iterator function arguments
+ * for example, a 3-dimensional array:
+ *  int i0, int i1, int i2
+ */
+{% macro array_iterator_args(node) -%}
+    {%- if node.is_array -%}
+        {%- for dim in node.array_dimensions -%}
+            {{- "int i%d" % loop.index0 -}}
+            {%- if not loop.last %}, {% endif -%}
+        {%- endfor -%}
+    {%- endif -%}
+{%- endmacro %}
+
+
+/*
+ * Emit an expression for the name of the instance, or of the array element
+ * selected by the iterators
+ * for example, a 2-dimensional array:
+ *  $sformatf("foo[%0d][%0d]", i0, i1)
+ */
+{% macro inst_name_expr(node) -%}
+    {%- if node.is_array -%}
+        $sformatf("{{get_inst_name(node)}}{{array_suffix_format(node)}}", {{array_iterator_list(node)}})
+    {%- else -%}
+        "{{get_inst_name(node)}}"
+    {%- endif -%}
+{%- endmacro %}
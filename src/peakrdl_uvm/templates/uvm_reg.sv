@@ -11,9 +11,27 @@ class {{get_class_name(node)}} extends uvm_reg;
     `uvm_object_utils({{get_class_name(node)}})
 {%- endif %}
     {{child_insts(node)|indent}}
+{%- if register_masks or fast_mirror_check %}
+    {{register_mask_params(node)|indent}}
+{%- endif %}
+{%- if include_coverage %}
+    {{field_value_coverage(node)|indent}}
+{%- endif %}
     {{function_new(node)|indent}}
 
     {{function_build(node)|indent}}
+{%- if fast_mirror_check %}
+
+    {{function_do_check(node)|indent}}
+{%- endif %}
+{%- if include_coverage %}
+
+    {{function_sample_values(node)|indent}}
+{%- endif %}
+{%- if compact_hdl_paths and get_field_hdl_path_slices(node) %}
+
+    {{function_add_field_hdl_path_slices(node)|indent}}
+{%- endif %}
 endclass : {{get_class_name(node)}}
 {% endif -%}
 {%- endmacro %}
@@ -29,16 +47,58 @@ rand uvm_reg_field {{get_inst_name(field)}};
 {%- endmacro %}
 
 
+//------------------------------------------------------------------------------
+// Register reset value and masks, combined from the fields
+//------------------------------------------------------------------------------
+{% macro register_mask_params(node) -%}
+{%- for name, value in get_register_masks(node).items() if register_masks or name == "DONT_CARE_MASK" -%}
+localparam uvm_reg_data_t {{name}} = {{"'h%x" % value}};
+{% endfor -%}
+{%- endmacro %}
+
+
 //------------------------------------------------------------------------------
 // new() function
 //------------------------------------------------------------------------------
 {% macro function_new(node) -%}
 function new(string name = "{{get_class_name(node)}}");
+{%- if include_coverage %}
+    super.new(name, {{node.get_property('regwidth')}}, build_coverage(UVM_CVR_FIELD_VALS));
+    if (has_coverage(UVM_CVR_FIELD_VALS))
+        cg_vals = new();
+{%- else %}
     super.new(name, {{node.get_property('regwidth')}}, UVM_NO_COVERAGE);
+{%- endif %}
 endfunction : new
 {%- endmacro %}
 
 
+//------------------------------------------------------------------------------
+// Field value coverage (UVM_CVR_FIELD_VALS)
+//------------------------------------------------------------------------------
+{% macro field_value_coverage(node) -%}
+covergroup cg_vals;
+    option.per_instance = 1;
+    {%- for field in node.fields() %}
+    {{get_inst_name(field)}}_cp: coverpoint {{get_inst_name(field)}}.value[{{field.width - 1}}:0];
+    {%- endfor %}
+endgroup
+{% endmacro %}
+
+
+//------------------------------------------------------------------------------
+// sample_values() function
+// Samples field value coverage, if enabled for this register
+//------------------------------------------------------------------------------
+{% macro function_sample_values(node) -%}
+virtual function void sample_values();
+    super.sample_values();
+    if (get_coverage(UVM_CVR_FIELD_VALS))
+        cg_vals.sample();
+endfunction : sample_values
+{%- endmacro %}
+
+
 //------------------------------------------------------------------------------
 // build() function
 //------------------------------------------------------------------------------
@@ -56,74 +116,140 @@ endfunction : build
 {%- endmacro %}
 
 
+//------------------------------------------------------------------------------
+// do_check() function
+// Compares the mirrored value with the precomputed don't-care mask. The
+// per-field checks of uvm_reg are only needed to report a mismatch
+//------------------------------------------------------------------------------
+{% macro function_do_check(node) -%}
+virtual function bit do_check(uvm_reg_data_t expected, uvm_reg_data_t actual, uvm_reg_map map);
+    if ((actual | DONT_CARE_MASK) === (expected | DONT_CARE_MASK))
+        return 1;
+    return super.do_check(expected, actual, map);
+endfunction : do_check
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// add_field_hdl_path_slices() function
+// Loads the HDL path slices of the fields. Shared by all instances of the
+// class, rather than repeated for each one
+//------------------------------------------------------------------------------
+{% macro function_add_field_hdl_path_slices(node) -%}
+virtual function void add_field_hdl_path_slices();
+    {%- for path, lsb, width, kind in get_field_hdl_path_slices(node) %}
+    {%- if kind %}
+    this.add_hdl_path_slice("{{path}}", {{lsb}}, {{width}}, 0, "{{kind}}");
+    {%- else %}
+    this.add_hdl_path_slice("{{path}}", {{lsb}}, {{width}});
+    {%- endif %}
+    {%- endfor %}
+endfunction : add_field_hdl_path_slices
+{%- endmacro %}
+
+
 //------------------------------------------------------------------------------
 // build() actions for uvm_reg instance (called by parent)
 //------------------------------------------------------------------------------
 {% macro build_instance(node) -%}
+{%- set inst_name = get_inst_name(node) -%}
 {%- if node.is_array %}
-foreach(this.{{get_inst_name(node)}}[{{utils.array_iterator_list(node)}}]) begin
-    {%- if use_uvm_factory %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = {{get_class_name(node)}}::type_id::create($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
-    {%- else %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = new($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
-    {%- endif %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.configure(this);
-    {{add_hdl_path_slices(node, get_inst_name(node) + utils.array_iterator_suffix(node))|trim|indent}}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.build();
-    this.default_map.add_reg(this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}, {{get_array_address_offset_expr(node)}});
+foreach(this.{{inst_name}}[{{utils.array_iterator_list(node)}}]) begin
+    {{build_element(node)|indent(blank=True)}}
 end
 {%- else %}
-{%- if use_uvm_factory %}
-this.{{get_inst_name(node)}} = {{get_class_name(node)}}::type_id::create("{{get_inst_name(node)}}");
-{%- else %}
-this.{{get_inst_name(node)}} = new("{{get_inst_name(node)}}");
+{{build_element(node)}}
 {%- endif %}
-this.{{get_inst_name(node)}}.configure(this);
-{{add_hdl_path_slices(node, get_inst_name(node))|trim}}
-this.{{get_inst_name(node)}}.build();
-this.default_map.add_reg(this.{{get_inst_name(node)}}, {{"'h%x" % node.raw_address_offset}});
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for a single uvm_reg instance, or for the array element
+// selected by the iterators (called by parent)
+//------------------------------------------------------------------------------
+{% macro build_element(node) -%}
+{%- set inst_ref = get_inst_name(node) ~ utils.array_iterator_suffix(node) -%}
+{%- if use_uvm_factory -%}
+this.{{inst_ref}} = {{get_class_name(node)}}::type_id::create({{utils.inst_name_expr(node)}});
+{%- else -%}
+this.{{inst_ref}} = new({{utils.inst_name_expr(node)}});
 {%- endif %}
+this.{{inst_ref}}.configure(this);
+{{add_hdl_path_slices(node, inst_ref)|trim}}
+this.{{inst_ref}}.build();
+{{- apply_class_overrides(node, inst_ref)}}
+this.default_map.add_reg(this.{{inst_ref}}, {{get_array_address_offset_expr(node)}});
 {%- endmacro %}
 
 //------------------------------------------------------------------------------
 // Load HDL path slices for this reg instance
 //------------------------------------------------------------------------------
 {% macro add_hdl_path_slices(node, inst_ref) -%}
-{%- if node.get_property('hdl_path') %}
-{{inst_ref}}.add_hdl_path_slice("{{node.get_property('hdl_path')}}", -1, -1);
+{%- set hdl_path = node.get_property('hdl_path') -%}
+{%- set hdl_path_gate = node.get_property('hdl_path_gate') -%}
+{%- if hdl_path %}
+{{inst_ref}}.add_hdl_path_slice("{{hdl_path}}", -1, -1);
 {%- endif -%}
 
-{%- if node.get_property('hdl_path_gate') %}
-{{inst_ref}}.add_hdl_path_slice("{{node.get_property('hdl_path_gate')}}", -1, -1, 0, "GATE");
+{%- if hdl_path_gate %}
+{{inst_ref}}.add_hdl_path_slice("{{hdl_path_gate}}", -1, -1, 0, "GATE");
 {%- endif -%}
 
-{%- for field in node.fields() %}
-{%- if field.get_property('hdl_path_slice') is none -%}
-{%- elif field.get_property('hdl_path_slice')|length == 1 %}
-{{inst_ref}}.add_hdl_path_slice("{{field.get_property('hdl_path_slice')[0]}}", {{field.lsb}}, {{field.width}});
-{%- elif field.get_property('hdl_path_slice')|length == field.width %}
-{%- for slice in field.get_property('hdl_path_slice') %}
-{%- if field.msb > field.lsb %}
-{{inst_ref}}.add_hdl_path_slice("{{slice}}", {{field.msb - loop.index0}}, 1);
+{{- add_field_hdl_path_slices(node, inst_ref)}}
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// Load HDL path slices of the fields for this reg instance
+//------------------------------------------------------------------------------
+{% macro add_field_hdl_path_slices(node, inst_ref) -%}
+{%- if compact_hdl_paths and has_class_hdl_path_slices(node) %}
+{{inst_ref}}.add_field_hdl_path_slices();
 {%- else %}
-{{inst_ref}}.add_hdl_path_slice("{{slice}}", {{field.msb + loop.index0}}, 1);
+{%- for path, lsb, width, kind in get_field_hdl_path_slices(node) %}
+{%- if kind %}
+{{inst_ref}}.add_hdl_path_slice("{{path}}", {{lsb}}, {{width}}, 0, "{{kind}}");
+{%- else %}
+{{inst_ref}}.add_hdl_path_slice("{{path}}", {{lsb}}, {{width}});
 {%- endif %}
 {%- endfor %}
 {%- endif %}
-{%- endfor -%}
-
-{%- for field in node.fields() %}
-{%- if field.get_property('hdl_path_gate_slice') is none -%}
-{%- elif field.get_property('hdl_path_gate_slice')|length == 1 %}
-{{inst_ref}}.add_hdl_path_slice("{{field.get_property('hdl_path_gate_slice')[0]}}", {{field.lsb}}, {{field.width}}, 0, "GATE");
-{%- elif field.get_property('hdl_path_gate_slice')|length == field.width %}
-{%- for slice in field.get_property('hdl_path_gate_slice') %}
-{%- if field.msb > field.lsb %}
-{{inst_ref}}.add_hdl_path_slice("{{slice}}", {{field.msb - loop.index0}}, 1, 0, "GATE");
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// Apply the reset values and HDL paths in which an instance differs from the
+// node its class was rendered from (called by parent, after build).
+// Fields are reset again, so that their mirrored and desired values match
+// the overridden reset value
+//------------------------------------------------------------------------------
+{% macro apply_class_overrides(node, inst_ref) -%}
+{%- for loops, ref, target, kind in get_class_overrides(node) %}
+{%- set ns = namespace(body=class_override("this." ~ inst_ref ~ ref, target, kind)|trim) %}
+{%- for array_ref, iterators in loops|reverse %}
+{%- set ns.body = "foreach(this.%s%s[%s]) begin\n    %s\nend" % (inst_ref, array_ref, iterators|join(", "), ns.body|indent) %}
+{%- endfor %}
+{{ns.body}}
+{%- endfor %}
+{%- endmacro %}
+
+
+{% macro class_override(ref, target, kind) -%}
+{%- if kind == "reset" %}
+{{ref}}.set_reset({{"'h%x" % target.get_property('reset')}});
+{{ref}}.reset();
+{%- elif isinstance(target, RegNode) %}
+{{ref}}.clear_hdl_path("ALL");
+{{add_hdl_path_slices(target, ref)|trim}}
 {%- else %}
-{{inst_ref}}.add_hdl_path_slice("{{slice}}", {{field.msb + loop.index0}}, 1, 0, "GATE");
+{%- set hdl_path = target.get_property('hdl_path') -%}
+{%- set hdl_path_gate = target.get_property('hdl_path_gate') %}
+{{ref}}.clear_hdl_path("ALL");
+{%- if hdl_path %}
+{{ref}}.add_hdl_path("{{hdl_path}}");
+{%- endif %}
+{%- if hdl_path_gate %}
+{{ref}}.add_hdl_path("{{hdl_path_gate}}", "GATE");
 {%- endif %}
-{%- endfor %}
 {%- endif %}
-{%- endfor %}
 {%- endmacro %}
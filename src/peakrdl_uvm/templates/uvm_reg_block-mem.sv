@@ -45,7 +45,7 @@ endfunction : new
 //------------------------------------------------------------------------------
 {% macro function_build(node) -%}
 virtual function void build();
-    this.default_map = create_map("reg_map", 0, {{roundup_to(node.get_property('memwidth'), 8) / 8}}, {{get_endianness(node)}});
+    this.default_map = create_map("reg_map", 0, {{roundup_to(node.get_property('memwidth'), 8) // 8}}, {{get_endianness(node)}});
     this.m_mem = new("m_mem", {{node.get_property('mementries')}}, {{node.get_property('memwidth')}}, "{{get_mem_access(node)}}");
     this.m_mem.configure(this);
     this.default_map.add_mem(this.m_mem, 0);
@@ -60,25 +60,29 @@ endfunction : build
 // build() actions for uvm_reg_block instance (called by parent)
 //------------------------------------------------------------------------------
 {% macro build_instance(node) -%}
+{%- set inst_name = get_inst_name(node) -%}
 {%- if node.is_array %}
-foreach(this.{{get_inst_name(node)}}[{{utils.array_iterator_list(node)}}]) begin
-    {%- if use_uvm_factory %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = {{get_class_name(node)}}::type_id::create($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
-    {%- else %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = new($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
-    {%- endif %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.configure(this);
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.build();
-    this.default_map.add_submap(this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.default_map, {{get_array_address_offset_expr(node)}});
+foreach(this.{{inst_name}}[{{utils.array_iterator_list(node)}}]) begin
+    {{build_element(node)|indent}}
 end
 {%- else %}
-{%- if use_uvm_factory %}
-this.{{get_inst_name(node)}} = {{get_class_name(node)}}::type_id::create("{{get_inst_name(node)}}");
-{%- else %}
-this.{{get_inst_name(node)}} = new("{{get_inst_name(node)}}");
+{{build_element(node)}}
 {%- endif %}
-this.{{get_inst_name(node)}}.configure(this);
-this.{{get_inst_name(node)}}.build();
-this.default_map.add_submap(this.{{get_inst_name(node)}}.default_map, {{"'h%x" % node.raw_address_offset}});
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for a single memory instance, or for the array element
+// selected by the iterators (called by parent)
+//------------------------------------------------------------------------------
+{% macro build_element(node) -%}
+{%- set inst_ref = get_inst_name(node) ~ utils.array_iterator_suffix(node) -%}
+{%- if use_uvm_factory -%}
+this.{{inst_ref}} = {{get_class_name(node)}}::type_id::create({{utils.inst_name_expr(node)}});
+{%- else -%}
+this.{{inst_ref}} = new({{utils.inst_name_expr(node)}});
 {%- endif %}
+this.{{inst_ref}}.configure(this);
+this.{{inst_ref}}.build();
+this.default_map.add_submap(this.{{inst_ref}}.default_map, {{get_array_address_offset_expr(node)}});
 {%- endmacro %}
@@ -4,6 +4,13 @@
 // uvm_reg_block definition
 //------------------------------------------------------------------------------
 {% macro class_definition(node) -%}
+{%- set build_table = none -%}
+{%- if (build_table_threshold is not none) and not lazy_build -%}
+    {%- set build_table = get_build_table(node) -%}
+    {%- if build_table.children|length < build_table_threshold -%}
+        {%- set build_table = none -%}
+    {%- endif -%}
+{%- endif -%}
 {%- if class_needs_definition(node) %}
 // {{get_class_friendly_name(node)}}
 class {{get_class_name(node)}} extends uvm_reg_block;
@@ -11,9 +18,45 @@ class {{get_class_name(node)}} extends uvm_reg_block;
     `uvm_object_utils({{get_class_name(node)}})
 {%- endif %}
     {{child_insts(node)|indent}}
+{%- if build_table %}
+    {{build_table_decls(build_table)|indent}}
+{%- endif %}
+{%- if include_coverage and get_coverage_bins(node) %}
+    {{address_map_coverage(node)|indent}}
+{%- endif %}
     {{function_new(node)|indent}}
 
-    {{function_build(node)|indent}}
+    {{function_build(node, build_table)|indent}}
+{%- if build_table %}
+    {%- for chunk in build_table.chunks %}
+
+    {{function_set_build_table_members(chunk, loop.index0)|indent}}
+    {%- endfor %}
+{%- endif %}
+{%- if lazy_build %}
+
+    {{function_build_all(node)|indent}}
+    {%- for child in node.children() if isinstance(child, AddressableNode) %}
+
+    {{child_accessor(child)|indent}}
+    {%- endfor %}
+{%- endif %}
+{%- if decode_function %}
+
+    {{function_decode_reg(node)|indent}}
+{%- endif %}
+{%- if burst_helpers %}
+
+    {{function_get_burst_run(node)|indent}}
+
+    {{task_burst_access(node, "write")|indent}}
+
+    {{task_burst_access(node, "read")|indent}}
+{%- endif %}
+{%- if include_coverage and get_coverage_bins(node) %}
+
+    {{function_sample(node)|indent}}
+{%- endif %}
 endclass : {{get_class_name(node)}}
 {% endif -%}
 {%- endmacro %}
@@ -24,7 +67,12 @@ endclass : {{get_class_name(node)}}
 //------------------------------------------------------------------------------
 {% macro child_insts(node) -%}
 {%- for child in node.children() if isinstance(child, AddressableNode) -%}
+{%- if is_vreg_array(child) -%}
+rand uvm_mem {{get_inst_name(child)}}_mem;
+rand {{get_class_name(child)}} {{get_inst_name(child)}};
+{% else -%}
 rand {{get_class_name(child)}} {{get_inst_name(child)}}{{utils.array_inst_suffix(child)}};
+{% endif -%}
 {% endfor -%}
 {%- endmacro %}
 
@@ -34,19 +82,68 @@ rand {{get_class_name(child)}} {{get_inst_name(child)}}{{utils.array_inst_suffix
 //------------------------------------------------------------------------------
 {% macro function_new(node) -%}
 function new(string name = "{{get_class_name(node)}}");
+{%- if include_coverage and get_coverage_bins(node) %}
+    super.new(name, build_coverage(UVM_CVR_ADDR_MAP));
+    if (has_coverage(UVM_CVR_ADDR_MAP))
+        cg_addr = new();
+{%- else %}
     super.new(name);
+{%- endif %}
 endfunction : new
 {%- endmacro %}
 
 
+//------------------------------------------------------------------------------
+// Address map coverage (UVM_CVR_ADDR_MAP)
+// One bin for each register or memory of the block, or for each register
+// array
+//------------------------------------------------------------------------------
+{% macro address_map_coverage(node) -%}
+covergroup cg_addr with function sample(uvm_reg_addr_t offset, bit is_read);
+    option.per_instance = 1;
+    offset_cp: coverpoint offset {
+        {%- for name, start, end in get_coverage_bins(node) %}
+        {%- if end - start > 1 %}
+        bins {{name}} = {['h{{"%x" % start}}:'h{{"%x" % (end - 1)}}]};
+        {%- else %}
+        bins {{name}} = {'h{{"%x" % start}}};
+        {%- endif %}
+        {%- endfor %}
+    }
+    is_read_cp: coverpoint is_read;
+    access: cross offset_cp, is_read_cp;
+endgroup
+{% endmacro %}
+
+
+//------------------------------------------------------------------------------
+// sample() function
+// Samples address map coverage, if enabled for this block
+//------------------------------------------------------------------------------
+{% macro function_sample(node) -%}
+protected virtual function void sample(uvm_reg_addr_t offset, bit is_read, uvm_reg_map map);
+    if (get_coverage(UVM_CVR_ADDR_MAP))
+        cg_addr.sample(offset, is_read);
+endfunction : sample
+{%- endmacro %}
+
+
 //------------------------------------------------------------------------------
 // build() function
 //------------------------------------------------------------------------------
-{% macro function_build(node) -%}
+{% macro function_build(node, build_table=none) -%}
 virtual function void build();
     this.default_map = create_map("reg_map", 0, {{get_bus_width(node)}}, {{get_endianness(node)}});
+    {%- if build_table %}
+    {{build_table_loop(build_table)|indent}}
+    {%- endif %}
+    {%- if not lazy_build -%}
     {%- for child in node.children() -%}
-        {%- if isinstance(child, RegNode) -%}
+        {%- if build_table and child.inst_name in build_table.names -%}
+            {#- Built from the table -#}
+        {%- elif is_vreg_array(child) -%}
+            {{uvm_vreg.build_array_instance(child)|indent}}
+        {%- elif isinstance(child, RegNode) -%}
             {{uvm_reg.build_instance(child)|indent}}
         {%- elif isinstance(child, (RegfileNode, AddrmapNode)) -%}
             {{build_instance(child)|indent}}
@@ -54,47 +151,377 @@ virtual function void build();
             {{uvm_reg_block_mem.build_instance(child)|indent}}
         {%- endif -%}
     {%- endfor %}
+    {%- endif %}
 endfunction : build
 {%- endmacro %}
 
 
 //------------------------------------------------------------------------------
-// build() actions for uvm_reg_block instance (called by parent)
+// Table of the registers that build() creates in a loop
 //------------------------------------------------------------------------------
-{% macro build_instance(node) -%}
-{%- if node.is_array %}
-foreach(this.{{get_inst_name(node)}}[{{utils.array_iterator_list(node)}}]) begin
-    {%- if use_uvm_factory %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = {{get_class_name(node)}}::type_id::create($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
+{% macro build_table_decls(build_table) -%}
+typedef struct {
+    string name;
+    uvm_reg_addr_t offset;
+    int unsigned type_index;
+    {%- if build_table.has_hdl_paths %}
+    string hdl_path;
+    string hdl_path_gate;
+    {%- endif %}
+    {%- if build_table.has_resets %}
+    uvm_reg_data_t reset;
+    uvm_reg_data_t reset_mask;
+    {%- endif %}
+} build_table_entry_t;
+local static const build_table_entry_t m_build_table[{{build_table.children|length}}] = '{
+    {%- for child, type_index, reset, reset_mask in build_table.children %}
+    '{"{{get_inst_name(child)}}", 'h{{"%x" % child.raw_address_offset}}, {{type_index}}
+        {%- if build_table.has_hdl_paths %}, "{{child.get_property('hdl_path') or ''}}", "{{child.get_property('hdl_path_gate') or ''}}"{% endif %}
+        {%- if build_table.has_resets %}, 'h{{"%x" % reset}}, 'h{{"%x" % reset_mask}}{% endif -%}
+    }{% if not loop.last %},{% endif %}
+    {%- endfor %}
+};
+{% endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for the registers in the build table
+// The statements do not depend on the number of registers: what differs
+// between them is read from the table, and their members are assigned by
+// set_build_table_members_<n>()
+//------------------------------------------------------------------------------
+{% macro build_table_loop(build_table) -%}
+foreach(m_build_table[i]) begin
+    uvm_reg rg;
+    case(m_build_table[i].type_index)
+        {%- for type_node in build_table.types %}
+        {{loop.index0}}: begin
+            {%- if use_uvm_factory %}
+            {{get_class_name(type_node)}} type_rg = {{get_class_name(type_node)}}::type_id::create(m_build_table[i].name);
+            {%- else %}
+            {{get_class_name(type_node)}} type_rg = new(m_build_table[i].name);
+            {%- endif %}
+            type_rg.configure(this);
+            {%- if build_table.has_hdl_paths %}
+            if (m_build_table[i].hdl_path != "")
+                type_rg.add_hdl_path_slice(m_build_table[i].hdl_path, -1, -1);
+            if (m_build_table[i].hdl_path_gate != "")
+                type_rg.add_hdl_path_slice(m_build_table[i].hdl_path_gate, -1, -1, 0, "GATE");
+            {%- endif %}
+            {{-uvm_reg.add_field_hdl_path_slices(type_node, "type_rg")|indent(12)}}
+            type_rg.build();
+            rg = type_rg;
+        end
+        {%- endfor %}
+    endcase
+    {%- if build_table.has_resets %}
+    if (m_build_table[i].reset_mask != 0) begin
+        uvm_reg_field fields[$];
+        rg.get_fields(fields);
+        foreach(fields[j]) begin
+            if (m_build_table[i].reset_mask[fields[j].get_lsb_pos()]) begin
+                fields[j].set_reset(m_build_table[i].reset >> fields[j].get_lsb_pos());
+                fields[j].reset();
+            end
+        end
+    end
+    {%- endif %}
+    this.default_map.add_reg(rg, m_build_table[i].offset);
+    case(i / {{build_table.chunk_size}})
+        {%- for chunk in build_table.chunks %}
+        {{loop.index0}}: set_build_table_members_{{loop.index0}}(i, rg);
+        {%- endfor %}
+    endcase
+end
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// set_build_table_members_<n>() function
+// Assigns a register that build() created from the table to its member
+//------------------------------------------------------------------------------
+{% macro function_set_build_table_members(chunk, chunk_index) -%}
+local function void set_build_table_members_{{chunk_index}}(int unsigned i, uvm_reg rg);
+    case(i)
+        {%- for i, child in chunk %}
+        {{i}}: $cast(this.{{get_inst_name(child)}}, rg);
+        {%- endfor %}
+    endcase
+endfunction : set_build_table_members_{{chunk_index}}
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build_all() function (lazy build)
+// Builds every descendant that was not built yet
+//------------------------------------------------------------------------------
+{% macro function_build_all(node) -%}
+virtual function void build_all();
+    {%- for child in node.children() if isinstance(child, AddressableNode) %}
+    {%- set inst_name = get_inst_name(child) %}
+    {%- if child.is_array and not is_vreg_array(child) %}
+    foreach(this.{{inst_name}}[{{utils.array_iterator_list(child)}}]) begin
+        void'(this.get_{{inst_name}}({{utils.array_iterator_list(child)}}));
+        {%- if isinstance(child, (RegfileNode, AddrmapNode)) %}
+        this.{{inst_name}}{{utils.array_iterator_suffix(child)}}.build_all();
+        {%- endif %}
+    end
+    {%- else %}
+    void'(this.get_{{inst_name}}());
+    {%- if isinstance(child, (RegfileNode, AddrmapNode)) %}
+    this.{{inst_name}}.build_all();
+    {%- endif %}
+    {%- endif %}
+    {%- endfor %}
+endfunction : build_all
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// Child accessor function (lazy build)
+// Builds the child instance, or array element, on first access
+//------------------------------------------------------------------------------
+{% macro child_accessor(node) -%}
+{%- set inst_name = get_inst_name(node) -%}
+{%- if is_vreg_array(node) -%}
+virtual function {{get_class_name(node)}} get_{{inst_name}}();
+    if (this.{{inst_name}} == null) begin
+        {{uvm_vreg.build_array_instance(node)|trim|indent(8)}}
+    end
+    return this.{{inst_name}};
+endfunction : get_{{inst_name}}
+{%- else -%}
+{%- set inst_ref = inst_name ~ utils.array_iterator_suffix(node) -%}
+virtual function {{get_class_name(node)}} get_{{inst_name}}({{utils.array_iterator_args(node)}});
+    if (this.{{inst_ref}} == null) begin
+        {%- if isinstance(node, RegNode) %}
+        {{uvm_reg.build_element(node)|indent(8)}}
+        {%- elif isinstance(node, (RegfileNode, AddrmapNode)) %}
+        {{build_element(node)|indent(8)}}
+        {%- elif isinstance(node, MemNode) %}
+        {{uvm_reg_block_mem.build_element(node)|indent(8)}}
+        {%- endif %}
+    end
+    return this.{{inst_ref}};
+endfunction : get_{{inst_name}}
+{%- endif -%}
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// decode_reg() function
+// Returns the register that contains the address offset, or null.
+// Children are found with a binary search over their address ranges.
+//------------------------------------------------------------------------------
+{% macro function_decode_reg(node) -%}
+{%- set groups = get_decode_groups(node) -%}
+virtual function uvm_reg decode_reg(uvm_reg_addr_t offset);
+    {%- if groups %}
+    uvm_reg_addr_t rel;
+    {{- decode_tree(groups, 0, groups|length)|indent}}
+    {%- endif %}
+    return null;
+endfunction : decode_reg
+{%- endmacro %}
+
+
+{% macro decode_tree(groups, lo, hi) -%}
+{%- if hi - lo <= 4 -%}
+    {%- for start, end, children in groups[lo:hi] -%}
+        {%- for child in children %}
+{{decode_child(child)}}
+        {%- endfor -%}
+    {%- endfor -%}
+{%- else -%}
+{%- set mid = (lo + hi) // 2 %}
+if (offset < 'h{{"%x" % groups[mid][0]}}) begin
+    {{-decode_tree(groups, lo, mid)|indent}}
+end else begin
+    {{-decode_tree(groups, mid, hi)|indent}}
+end
+{%- endif -%}
+{%- endmacro %}
+
+
+{% macro decode_child(node) -%}
+{%- set start = "'h%x" % node.raw_address_offset -%}
+{%- set end = "'h%x" % (node.raw_address_offset + node.total_size) -%}
+{%- if node.raw_address_offset -%}
+    {%- set range_cond = "offset >= %s && offset < %s" % (start, end) -%}
+{%- else -%}
+    {%- set range_cond = "offset < %s" % end -%}
+{%- endif -%}
+{%- set gap_cond = "" -%}
+{%- if node.is_array -%}
+    {%- set inst_ref = get_inst_name(node) ~ "[" ~ get_array_index_exprs(node, "rel")|join("][") ~ "]" -%}
+    {%- set sub_offset = "rel %% 'h%x" % node.array_stride -%}
+    {%- if node.array_stride != node.size -%}
+        {%- set gap_cond = "%s < 'h%x" % (sub_offset, node.size) -%}
+    {%- endif -%}
+{%- else -%}
+    {%- set inst_ref = get_inst_name(node) -%}
+    {%- set sub_offset = "offset - %s" % start -%}
+{%- endif -%}
+{%- set null_cond = "" -%}
+{%- if isinstance(node, (RegfileNode, AddrmapNode)) -%}
+    {%- if lazy_build -%}
+        {%- set null_cond = "this.%s != null" % inst_ref -%}
+    {%- endif -%}
+    {%- set result = "this.%s.decode_reg(%s)" % (inst_ref, sub_offset) -%}
+{%- else -%}
+    {%- set result = "this.%s" % inst_ref -%}
+{%- endif -%}
+{%- if node.is_array -%}
+{%- set conds = [gap_cond, null_cond]|select|list -%}
+if ({{range_cond}}) begin
+    rel = offset - {{start}};
+    {%- if conds %}
+    if ({{conds|join(" && ")}}) return {{result}};
     {%- else %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}} = new($sformatf("{{get_inst_name(node)}}{{utils.array_suffix_format(node)}}", {{utils.array_iterator_list(node)}}));
+    return {{result}};
+    {%- endif %}
+end
+{%- else -%}
+if ({{[range_cond, null_cond]|select|join(" && ")}}) return {{result}};
+{%- endif -%}
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// get_n_burst_runs() and get_burst_run() functions
+// Return the runs of contiguous registers of this block, in address order
+//------------------------------------------------------------------------------
+{% macro function_get_burst_run(node) -%}
+{%- set runs = get_burst_runs(node) -%}
+virtual function int unsigned get_n_burst_runs();
+    return {{runs|length}};
+endfunction : get_n_burst_runs
+
+virtual function void get_burst_run(int unsigned idx, ref uvm_reg regs[$]);
+    {%- if runs %}
+    case(idx)
+        {%- for run in runs %}
+        {{loop.index0}}: begin
+            {%- for child in run %}
+            {%- if child.is_array %}
+            foreach(this.{{get_inst_name(child)}}[{{utils.array_iterator_list(child)}}])
+                regs.push_back(this.{{get_inst_name(child)}}{{utils.array_iterator_suffix(child)}});
+            {%- else %}
+            regs.push_back(this.{{get_inst_name(child)}});
+            {%- endif %}
+            {%- endfor %}
+        end
+        {%- endfor %}
+    endcase
     {%- endif %}
-    {%- if node.get_property('hdl_path') %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.configure(this, "{{node.get_property('hdl_path')}}");
+endfunction : get_burst_run
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// burst_write() and burst_read() tasks
+// Access each run of contiguous registers through the burst hook, then the
+// ones of the child blocks. burst_read() returns the values it read in the
+// same order
+//------------------------------------------------------------------------------
+{% macro task_burst_access(node, kind) -%}
+{%- set ns = namespace(has_child_blocks=false) %}
+{%- for child in node.children() if isinstance(child, (RegfileNode, AddrmapNode)) %}
+{%- set ns.has_child_blocks = true %}
+{%- endfor %}
+{%- if kind == "write" -%}
+virtual task burst_write(output uvm_status_e status, input peakrdl_uvm_burst_hook hook = null, input uvm_reg_map map = null, input uvm_sequence_base parent = null);
+{%- else -%}
+virtual task burst_read(output uvm_status_e status, output uvm_reg_data_t values[$], input peakrdl_uvm_burst_hook hook = null, input uvm_reg_map map = null, input uvm_sequence_base parent = null);
+    {%- if ns.has_child_blocks %}
+    uvm_reg_data_t child_values[$];
+    {%- endif %}
+    values.delete();
+{%- endif %}
+    status = UVM_IS_OK;
+    if (hook == null)
+        hook = new();
+    for (int unsigned i = 0; i < get_n_burst_runs(); i++) begin
+        uvm_reg regs[$];
+        uvm_reg_data_t run_values[$];
+        get_burst_run(i, regs);
+        {%- if kind == "write" %}
+        foreach(regs[j])
+            run_values.push_back(regs[j].get());
+        hook.write_run(status, regs, run_values, map, parent);
+        {%- else %}
+        hook.read_run(status, regs, run_values, map, parent);
+        values = {values, run_values};
+        {%- endif %}
+        if (status != UVM_IS_OK)
+            return;
+    end
+    {%- for child in node.children() if isinstance(child, (RegfileNode, AddrmapNode)) %}
+    {%- set inst_name = get_inst_name(child) %}
+    {%- if kind == "write" %}
+    {%- set args = "status, hook, map, parent" %}
     {%- else %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.configure(this);
+    {%- set args = "status, child_values, hook, map, parent" %}
     {%- endif %}
-    {%- if node.get_property('hdl_path_gate') %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.add_hdl_path("{{node.get_property('hdl_path_gate')}}", "GATE");
+    {%- if child.is_array %}
+    foreach(this.{{inst_name}}[{{utils.array_iterator_list(child)}}]) begin
+        this.{{inst_name}}{{utils.array_iterator_suffix(child)}}.burst_{{kind}}({{args}});
+        {%- if kind == "read" %}
+        values = {values, child_values};
+        {%- endif %}
+        if (status != UVM_IS_OK)
+            return;
+    end
+    {%- else %}
+    this.{{inst_name}}.burst_{{kind}}({{args}});
+    {%- if kind == "read" %}
+    values = {values, child_values};
+    {%- endif %}
+    if (status != UVM_IS_OK)
+        return;
     {%- endif %}
-    this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.build();
-    this.default_map.add_submap(this.{{get_inst_name(node)}}{{utils.array_iterator_suffix(node)}}.default_map, {{get_array_address_offset_expr(node)}});
+    {%- endfor %}
+endtask : burst_{{kind}}
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for uvm_reg_block instance (called by parent)
+//------------------------------------------------------------------------------
+{% macro build_instance(node) -%}
+{%- set inst_name = get_inst_name(node) -%}
+{%- if node.is_array %}
+foreach(this.{{inst_name}}[{{utils.array_iterator_list(node)}}]) begin
+    {{build_element(node)|indent}}
 end
 {%- else %}
-{%- if use_uvm_factory %}
-this.{{get_inst_name(node)}} = {{get_class_name(node)}}::type_id::create("{{get_inst_name(node)}}");
-{%- else %}
-this.{{get_inst_name(node)}} = new("{{get_inst_name(node)}}");
+{{build_element(node)}}
 {%- endif %}
-{%- if node.get_property('hdl_path') %}
-this.{{get_inst_name(node)}}.configure(this, "{{node.get_property('hdl_path')}}");
-{%- else %}
-this.{{get_inst_name(node)}}.configure(this);
+{%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for a single uvm_reg_block instance, or for the array
+// element selected by the iterators (called by parent)
+//------------------------------------------------------------------------------
+{% macro build_element(node) -%}
+{%- set inst_ref = get_inst_name(node) ~ utils.array_iterator_suffix(node) -%}
+{%- set hdl_path = node.get_property('hdl_path') -%}
+{%- set hdl_path_gate = node.get_property('hdl_path_gate') -%}
+{%- if use_uvm_factory -%}
+this.{{inst_ref}} = {{get_class_name(node)}}::type_id::create({{utils.inst_name_expr(node)}});
+{%- else -%}
+this.{{inst_ref}} = new({{utils.inst_name_expr(node)}});
 {%- endif %}
-{%- if node.get_property('hdl_path_gate') %}
-this.{{get_inst_name(node)}}.add_hdl_path("{{node.get_property('hdl_path_gate')}}", "GATE");
+{%- if hdl_path %}
+this.{{inst_ref}}.configure(this, "{{hdl_path}}");
+{%- else %}
+this.{{inst_ref}}.configure(this);
 {%- endif %}
-this.{{get_inst_name(node)}}.build();
-this.default_map.add_submap(this.{{get_inst_name(node)}}.default_map, {{"'h%x" % node.raw_address_offset}});
+{%- if hdl_path_gate %}
+this.{{inst_ref}}.add_hdl_path("{{hdl_path_gate}}", "GATE");
 {%- endif %}
+this.{{inst_ref}}.build();
+{{- uvm_reg.apply_class_overrides(node, inst_ref)}}
+this.default_map.add_submap(this.{{inst_ref}}.default_map, {{get_array_address_offset_expr(node)}});
 {%- endmacro %}
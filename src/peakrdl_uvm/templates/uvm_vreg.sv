@@ -68,3 +68,24 @@ this.{{get_inst_name(node)}} = new("{{get_inst_name(node)}}");
 this.{{get_inst_name(node)}}.configure(this, this.m_mem, {{node.n_elements}});
 this.{{get_inst_name(node)}}.build();
 {%- endmacro %}
+
+
+//------------------------------------------------------------------------------
+// build() actions for a register array that is modeled as a virtual register
+// (called by parent)
+//------------------------------------------------------------------------------
+{% macro build_array_instance(node) -%}
+{%- set inst_name = get_inst_name(node) -%}
+{%- set regwidth = node.get_property('regwidth') -%}
+{%- set incr = node.array_stride // (regwidth // 8) %}
+this.{{inst_name}}_mem = new("{{inst_name}}_mem", {{node.n_elements * incr}}, {{regwidth}}, "{{"RW" if node.has_sw_writable else "RO"}}");
+this.{{inst_name}}_mem.configure(this);
+this.default_map.add_mem(this.{{inst_name}}_mem, {{"'h%x" % node.raw_address_offset}});
+{%- if use_uvm_factory %}
+this.{{inst_name}} = {{get_class_name(node)}}::type_id::create("{{inst_name}}");
+{%- else %}
+this.{{inst_name}} = new("{{inst_name}}");
+{%- endif %}
+this.{{inst_name}}.configure(this, this.{{inst_name}}_mem, {{node.n_elements}}, 0, {{incr}});
+this.{{inst_name}}.build();
+{%- endmacro %}
@@ -0,0 +1,187 @@
+import os
+import glob
+import time
+import socket
+import tempfile
+
+from systemrdl import RDLCompileError
+
+
+def get_watched_paths(input_files: list, incdirs: list) -> list:
+    """
+    Returns the files an export depends on: its input files, and the RDL
+    files next to them or in the include search paths, which `include
+    directives may refer to.
+    """
+    paths = set(os.path.abspath(path) for path in input_files)
+    dirs = set(os.path.dirname(path) for path in paths)
+    dirs.update(os.path.abspath(incdir) for incdir in incdirs or [])
+    for d in dirs:
+        paths.update(glob.glob(os.path.join(d, "*.rdl")))
+    return sorted(paths)
+
+
+class ExportWatcher:
+
+    def __init__(self, export_func, paths: list, poll_interval: float = 0.5):
+        """
+        Runs an export again whenever one of the files it depends on is
+        modified.
+
+        Parameters
+        ----------
+        export_func: callable
+            Compiles the input files and exports them. Called without
+            arguments. State kept by the callable, such as compiled
+            templates, is re-used by each export.
+        paths: list
+            Files to watch. See ``get_watched_paths()``
+        poll_interval: float
+            Time in seconds between checks of the file modification times
+        """
+        self.export_func = export_func
+        self.paths = paths
+        self.poll_interval = poll_interval
+
+        # Modification times of the watched files at the last export
+        # key = path
+        # value = modification time, or None if the file does not exist
+        self.stamps = None
+
+
+    def _get_stamps(self) -> dict:
+        stamps = {}
+        for path in self.paths:
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+
+    def update(self, force: bool = False) -> str:
+        """
+        Exports again if a watched file was modified since the last export,
+        or if force is set.
+
+        Returns a one-line status message
+        """
+        stamps = self._get_stamps()
+        if (stamps == self.stamps) and not force:
+            return "up-to-date"
+
+        start = time.perf_counter()
+        try:
+            self.export_func()
+        except RDLCompileError:
+            # The compiler already printed the errors. Try again on the next
+            # modification
+            self.stamps = stamps
+            return "error: compilation failed"
+        except Exception as e: # pylint: disable=broad-except
+            # Keep running, so that the error can be fixed in the input
+            self.stamps = stamps
+            return "error: %s" % e
+        self.stamps = stamps
+        return "exported in %.2fs" % (time.perf_counter() - start)
+
+
+    def watch(self) -> None:
+        """
+        Exports every time a watched file is modified, until interrupted
+        """
+        try:
+            while True:
+                status = self.update()
+                if status != "up-to-date":
+                    print(status, flush=True)
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+
+
+    def serve(self, address: str, watch: bool = False) -> None:
+        """
+        Accepts requests on a local socket until a "stop" request, or until
+        interrupted.
+
+        address is a TCP port number on the loopback interface, or the path
+        of a Unix domain socket.
+        Each connection sends a single line:
+
+        - ``export``: exports if a watched file was modified since the last
+          export. Returns once the outputs are up-to-date.
+        - ``force``: exports unconditionally.
+        - ``stop``: stops the server.
+
+        The server replies with a single status line, and closes the
+        connection. If watch is set, files are also exported when modified
+        between requests.
+        """
+        if address.isdigit():
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(("127.0.0.1", int(address)))
+        else:
+            if os.path.exists(address):
+                # Left behind by a server that was not stopped cleanly
+                os.unlink(address)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) # pylint: disable=no-member
+            server.bind(address)
+
+        if watch:
+            server.settimeout(self.poll_interval)
+        server.listen()
+        print("serving on %s" % address, flush=True)
+
+        try:
+            # Exports are always current when the server starts
+            print(self.update(), flush=True)
+            running = True
+            while running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    status = self.update()
+                    if status != "up-to-date":
+                        print(status, flush=True)
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    request = conn.makefile("r").readline().strip()
+                    if request == "export":
+                        status = self.update()
+                    elif request == "force":
+                        status = self.update(force=True)
+                    elif request == "stop":
+                        status = "stopped"
+                        running = False
+                    else:
+                        status = "error: unknown request '%s'" % request
+                    conn.sendall((status + "\n").encode("utf-8"))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if not address.isdigit():
+                os.unlink(address)
+
+
+def run_watcher(export_func, options) -> None:
+    """
+    Runs the --watch and --serve modes of the peakrdl command.
+
+    Exports are incremental. If no --state-dir was given, a temporary one is
+    used for as long as the watcher runs.
+    """
+    paths = get_watched_paths(options.input_files, options.incdirs)
+    watcher = ExportWatcher(export_func, paths, options.poll_interval)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if options.state_dir is None:
+            options.state_dir = tmp_dir
+        if options.serve:
+            watcher.serve(options.serve, watch=options.watch)
+        else:
+            print("watching %d files" % len(paths), flush=True)
+            watcher.watch()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Export benchmark for PeakRDL-uvm
+
+Builds a synthetic, parameterized SystemRDL design that resembles a large SoC
+register map, and measures how long each phase of UVMExporter.export() takes.
+
+Example:
+    python benchmark.py --preset soc --json soc_bench.json
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+import json
+import tracemalloc
+
+from systemrdl import RDLCompiler
+from peakrdl_uvm import UVMExporter, ExportProfiler
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PRESETS = {
+    # name: (addrmaps, block_types, regs, reg_types, depth, array_dims, mems, vregs)
+    "small":  (16,   4,  16,  4, 2, (2, 4),  2,  4),
+    "medium": (256,  16, 32,  16, 3, (4, 8),  16, 8),
+    "soc":    (2048, 64, 48,  64, 4, (4, 16), 256, 16),
+}
+
+#-------------------------------------------------------------------------------
+# Synthetic RDL generation
+#-------------------------------------------------------------------------------
+def gen_reg_type(idx):
+    """
+    Each register type gets a slightly different field layout so that the
+    exporter has distinct class definitions to emit
+    """
+    lines = ["reg reg%d_t {" % idx]
+    n_fields = 1 + idx % 8
+    width = 32 // n_fields
+    for i in range(n_fields):
+        lsb = i * width
+        msb = lsb + width - 1
+        sw = ("rw", "r", "w")[(idx + i) % 3]
+        onwrite = " onwrite=woclr;" if (sw == "rw" and (idx + i) % 5 == 0) else ""
+        lines.append(
+            "    field {sw=%s; hw=rw;%s} f%d[%d:%d] = %d;" % (sw, onwrite, i, msb, lsb, (idx + i) % 2)
+        )
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def gen_regfile_type(name, depth, args):
+    """
+    Generate a chain of nested regfiles, 'depth' levels deep.
+    Each level contains a multi-dimensional register array
+    """
+    dims = "".join("[%d]" % d for d in args.array_dims)
+    lines = []
+    for level in range(depth):
+        lines.append("regfile %s_l%d_t {" % (name, level))
+        lines.append("    reg%d_t ctrl;" % (level % args.reg_types))
+        lines.append("    reg%d_t arr%s;" % ((level + 1) % args.reg_types, dims))
+        if level:
+            lines.append("    %s_l%d_t sub;" % (name, level - 1))
+        lines.append("};")
+    return "\n".join(lines)
+
+
+def gen_block_type(idx, args):
+    lines = []
+    if args.depth:
+        lines.append(gen_regfile_type("blk%d_rf" % idx, args.depth, args))
+    lines.append("addrmap blk%d_t {" % idx)
+    for i in range(args.regs):
+        lines.append("    reg%d_t r%d;" % ((idx + i) % args.reg_types, i))
+    if args.depth:
+        lines.append("    blk%d_rf_l%d_t rf;" % (idx, args.depth - 1))
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def gen_mem_type(args):
+    lines = ["mem mem_t {"]
+    lines.append("    mementries = %d;" % max(args.vregs * 4, 16))
+    lines.append("    memwidth = 32;")
+    for i in range(args.vregs):
+        lines.append("    reg%d_t v%d[4];" % (i % args.reg_types, i))
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def gen_rdl(args):
+    parts = []
+    for i in range(args.reg_types):
+        parts.append(gen_reg_type(i))
+    for i in range(args.block_types):
+        parts.append(gen_block_type(i, args))
+    if args.mems:
+        parts.append(gen_mem_type(args))
+
+    parts.append("addrmap soc {")
+    for i in range(args.addrmaps):
+        parts.append("    blk%d_t blk%d;" % (i % args.block_types, i))
+    for i in range(args.mems):
+        parts.append("    external mem_t mem%d;" % i)
+    parts.append("};")
+    return "\n\n".join(parts) + "\n"
+
+#-------------------------------------------------------------------------------
+# Measurement
+#-------------------------------------------------------------------------------
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # macOS reports bytes
+        return rss / (1024 * 1024)
+    return rss / 1024
+
+
+def run_export(top, path, args, profiler=None):
+    UVMExporter().export(
+        top, path,
+        export_as_package=(args.file_type == "package"),
+        reuse_class_definitions=(args.type_style == "lexical"),
+        use_uvm_factory=args.use_factory,
+        profiler=profiler,
+    )
+
+
+def run_benchmark(args):
+    results = {}
+
+    rdl_src = gen_rdl(args)
+    rdl_path = os.path.join(args.output_dir, "bench_soc.rdl")
+    with open(rdl_path, "w", encoding="utf-8") as f:
+        f.write(rdl_src)
+
+    # Elaborate
+    start = time.perf_counter()
+    rdlc = RDLCompiler()
+    rdlc.compile_file(rdl_path)
+    top = rdlc.elaborate().top
+    results["elaborate"] = time.perf_counter() - start
+
+    stats = {"addrmap": 0, "regfile": 0, "reg": 0, "reg_elements": 0, "mem": 0, "field": 0}
+    for node in top.descendants():
+        kind = node.component_type_name
+        stats[kind] = stats.get(kind, 0) + 1
+        if kind == "reg":
+            n = 1
+            if node.is_array:
+                for dim in node.array_dimensions:
+                    n *= dim
+            stats["reg_elements"] += n
+
+    out_path = os.path.join(args.output_dir, "bench_soc_uvm.sv")
+    best = None
+    for _ in range(args.repeat):
+        profiler = ExportProfiler()
+        start = time.perf_counter()
+        run_export(top, out_path, args, profiler)
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best[0]):
+            best = (elapsed, profiler.report())
+
+    results["export"] = best[0]
+    for name, stat in best[1]["phases"].items():
+        results[name] = stat["time"]
+
+    if args.tracemalloc:
+        tracemalloc.start()
+        run_export(top, out_path, args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["export_peak_alloc_mb"] = peak / (1024 * 1024)
+
+    results["peak_rss_mb"] = peak_rss_mb()
+    results["output_bytes"] = os.path.getsize(out_path)
+
+    report = {
+        "config": {
+            "addrmaps": args.addrmaps,
+            "block_types": args.block_types,
+            "regs": args.regs,
+            "reg_types": args.reg_types,
+            "depth": args.depth,
+            "array_dims": list(args.array_dims),
+            "mems": args.mems,
+            "vregs": args.vregs,
+            "file_type": args.file_type,
+            "type_style": args.type_style,
+            "use_factory": args.use_factory,
+            "repeat": args.repeat,
+        },
+        "design": stats,
+        "results": results,
+        "profile": best[1],
+    }
+    return report
+
+
+def print_report(report, n_top):
+    print("Design:")
+    for k, v in report["design"].items():
+        print("    %-24s %d" % (k, v))
+    print("Results:")
+    for k, v in report["results"].items():
+        if v is None:
+            continue
+        if isinstance(v, float):
+            unit = "MB" if k.endswith("_mb") else "s"
+            print("    %-24s %.3f %s" % (k, v, unit))
+        else:
+            print("    %-24s %d" % (k, v))
+
+    if n_top:
+        print("Slowest template macros:")
+        for name, stat in list(report["profile"]["macros"].items())[:n_top]:
+            print("    %-40s %8d calls %10.3f s" % (name, stat["calls"], stat["time"]))
+        print("Slowest template helpers:")
+        for name, stat in list(report["profile"]["helpers"].items())[:n_top]:
+            print("    %-40s %8d calls %10.3f s" % (name, stat["calls"], stat["time"]))
+
+#-------------------------------------------------------------------------------
+def parse_dims(s):
+    return tuple(int(d) for d in s.lower().split("x") if d)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS.keys(), default="small",
+        help="Starting point for the design size. Individual options below override it. [small]")
+    parser.add_argument("--addrmaps", type=int, help="Number of addrmap instances in the top-level map")
+    parser.add_argument("--block-types", type=int, help="Number of distinct addrmap types")
+    parser.add_argument("--regs", type=int, help="Number of registers directly in each addrmap")
+    parser.add_argument("--reg-types", type=int, help="Number of distinct register types")
+    parser.add_argument("--depth", type=int, help="Regfile nesting depth within each addrmap")
+    parser.add_argument("--array-dims", type=parse_dims, help="Dimensions of register arrays, for example 4x16")
+    parser.add_argument("--mems", type=int, help="Number of external memories")
+    parser.add_argument("--vregs", type=int, help="Number of virtual register arrays per memory")
+
+    parser.add_argument("--file-type", choices=['package', 'header'], default="package")
+    parser.add_argument("--type-style", choices=['lexical', 'hier'], default="lexical")
+    parser.add_argument("--use-factory", default=False, action="store_true")
+
+    parser.add_argument("--repeat", type=int, default=1,
+        help="Number of times to repeat each measurement. The best time is reported")
+    parser.add_argument("--tracemalloc", default=False, action="store_true",
+        help="Also measure peak Python heap allocations during export. This slows down the export")
+    parser.add_argument("--top", type=int, default=5,
+        help="Number of slowest template macros and helpers to list. [5]")
+    parser.add_argument("--output-dir", default=None,
+        help="Directory for generated files. A temporary directory is used if not set")
+    parser.add_argument("--json", dest="json_path", default=None,
+        help="Write a machine-readable report to this file")
+    args = parser.parse_args()
+
+    preset = PRESETS[args.preset]
+    for name, value in zip(
+        ("addrmaps", "block_types", "regs", "reg_types", "depth", "array_dims", "mems", "vregs"),
+        preset
+    ):
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+    args.block_types = max(1, min(args.block_types, args.addrmaps))
+    args.reg_types = max(1, args.reg_types)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        report = run_benchmark(args)
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            args.output_dir = tmpdir
+            report = run_benchmark(args)
+
+    print_report(report, args.top)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
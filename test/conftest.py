@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from systemrdl import RDLCompiler
+
+
+@pytest.fixture
+def compile_rdl(tmp_path):
+    """
+    Compiles SystemRDL source text, and returns the elaborated top-level node
+    """
+    def _compile(src: str, top_def_name: str = None):
+        rdl_file = os.path.join(str(tmp_path), "input.rdl")
+        with open(rdl_file, "w", encoding="utf-8") as f:
+            f.write(src)
+        rdlc = RDLCompiler()
+        rdlc.compile_file(rdl_file)
+        return rdlc.elaborate(top_def_name).top
+    return _compile
@@ -2,6 +2,8 @@
 
 import sys
 import os
+import shutil
+import tempfile
 
 import jinja2 as jj
 
@@ -19,34 +21,29 @@ rdlc = RDLCompiler()
 rdlc.compile_file(rdl_file)
 root = rdlc.elaborate().top
 
-uvm_exportname = os.path.join(output_dir, testcase_name + "_uvm.sv")
+# All variants share the same package name, so each one is exported to its own
+# temporary directory before being renamed
+variants = [
+    ("nofac_reuse", {"use_uvm_factory": False, "reuse_class_definitions": True}),
+    ("fac_reuse", {"use_uvm_factory": True, "reuse_class_definitions": True}),
+    ("nofac_noreuse", {"use_uvm_factory": True, "reuse_class_definitions": False}),
+    ("build_table", {"use_uvm_factory": True, "reuse_class_definitions": True, "build_table_threshold": 2}),
+    ("coverage", {"use_uvm_factory": True, "reuse_class_definitions": True, "include_coverage": True}),
+    ("burst", {"use_uvm_factory": True, "reuse_class_definitions": True, "burst_helpers": True}),
+    ("masks", {"use_uvm_factory": True, "reuse_class_definitions": True, "register_masks": True, "fast_mirror_check": True}),
+]
+with tempfile.TemporaryDirectory() as tmpdir:
+    targets = []
+    for variant, options in variants:
+        os.mkdir(os.path.join(tmpdir, variant))
+        uvm_exportname = os.path.join(tmpdir, variant, testcase_name + "_uvm.sv")
+        targets.append((uvm_exportname, dict(options, export_as_package=True)))
 
-uvm_file = os.path.join(output_dir, testcase_name + "_uvm_nofac_reuse_pkg.sv")
-UVMExporter().export(
-    root, uvm_exportname,
-    use_uvm_factory=False,
-    reuse_class_definitions=True,
-    export_as_package=True,
-)
-os.rename(uvm_exportname, uvm_file)
+    UVMExporter().export_many(root, targets)
 
-uvm_file = os.path.join(output_dir, testcase_name + "_uvm_fac_reuse_pkg.sv")
-UVMExporter().export(
-    root, uvm_exportname,
-    use_uvm_factory=True,
-    reuse_class_definitions=True,
-    export_as_package=True,
-)
-os.rename(uvm_exportname, uvm_file)
-
-uvm_file = os.path.join(output_dir, testcase_name + "_uvm_nofac_noreuse_pkg.sv")
-UVMExporter().export(
-    root, uvm_exportname,
-    use_uvm_factory=True,
-    reuse_class_definitions=False,
-    export_as_package=True,
-)
-os.rename(uvm_exportname, uvm_file)
+    for (variant, _), (uvm_exportname, _) in zip(variants, targets):
+        uvm_file = os.path.join(output_dir, testcase_name + "_uvm_" + variant + "_pkg.sv")
+        shutil.move(uvm_exportname, uvm_file)
 
 #-------------------------------------------------------------------------------
 # Generate test logic
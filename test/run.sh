@@ -18,7 +18,7 @@ pylint=$venv_bin/pylint
 
 
 # Install test dependencies
-$python -m pip install -U pylint setuptools pip
+$python -m pip install -U pylint pytest setuptools pip
 
 
 # Install dut
@@ -27,6 +27,10 @@ $python setup.py install
 cd $this_dir
 
 
+# Run unit tests
+$python -m pytest $this_dir
+
+
 # Generate testcase verilog files
 $python generate_testcase_data.py basic testcases/basic.rdl
 
@@ -36,6 +40,10 @@ if exists vsim; then
     ./vsim_test.sh testcases/basic_uvm_nofac_reuse_pkg.sv testcases/basic_test.sv
     ./vsim_test.sh testcases/basic_uvm_fac_reuse_pkg.sv testcases/basic_test.sv
     ./vsim_test.sh testcases/basic_uvm_nofac_noreuse_pkg.sv testcases/basic_test.sv
+    ./vsim_test.sh testcases/basic_uvm_build_table_pkg.sv testcases/basic_test.sv
+    ./vsim_test.sh testcases/basic_uvm_coverage_pkg.sv testcases/basic_test.sv
+    ./vsim_test.sh testcases/basic_uvm_burst_pkg.sv testcases/basic_test.sv
+    ./vsim_test.sh testcases/basic_uvm_masks_pkg.sv testcases/basic_test.sv
 fi
 
 
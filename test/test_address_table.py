@@ -0,0 +1,102 @@
+import random
+
+from peakrdl_uvm import AddressTable
+
+
+STRIDED_RDL = """
+    regfile rf_t {
+        reg { field {} f[32]; } ctrl @ 0x0;
+        reg { field {} f[32]; } data[3] @ 0x8 += 0x8;
+    };
+    addrmap top {
+        rf_t rf[2] @ 0x100 += 0x40;
+        reg { field {} f[32]; } grid[2][3] @ 0x400 += 0x10;
+    };
+"""
+
+
+def test_strided_lookup(compile_rdl):
+    table = AddressTable(compile_rdl(STRIDED_RDL))
+
+    match = table.lookup(0x100 + 1 * 0x40 + 0x8 + 2 * 0x8 + 2)
+    assert match.path == "top.rf[1].data[2]"
+    assert match.node.inst_name == "data"
+    assert match.address == 0x158
+    assert match.offset == 2
+
+    match = table.lookup(0x100)
+    assert match.path == "top.rf[0].ctrl"
+    assert match.offset == 0
+
+    # grid[i][j] is at 0x400 + (i*3 + j) * 0x10
+    match = table.lookup(0x400 + 5 * 0x10 + 3)
+    assert match.path == "top.grid[1][2]"
+    assert match.address == 0x450
+
+    # Between array elements, past the last element, and before the first
+    assert table.lookup(0x104) is None
+    assert table.lookup(0x100 + 0x8 + 0x4) is None
+    assert table.lookup(0x404) is None
+    assert table.lookup(0x460) is None
+    assert table.lookup(0x180) is None
+    assert table.lookup(0x0) is None
+
+
+def test_overlap(compile_rdl):
+    # A read-only and a write-only register may share an address
+    table = AddressTable(compile_rdl("""
+        regfile rf_t {
+            reg { field {sw=r; hw=w;} f[32]; } status @ 0x0;
+            reg { field {sw=w; hw=r;} f[32]; } cmd @ 0x0;
+            reg { field {} f[32]; } other @ 0x4;
+        };
+        addrmap top {
+            rf_t rf[4] @ 0x0 += 0x10;
+            reg { field {} f[32]; } last @ 0x40;
+        };
+    """))
+    assert table.find_overlaps() == [("top.rf.status", "top.rf.cmd")]
+    assert table.lookup(0x34).path == "top.rf[3].other"
+    assert table.lookup(0x30).path in ("top.rf[3].status", "top.rf[3].cmd")
+
+    assert AddressTable(compile_rdl(STRIDED_RDL)).find_overlaps() == []
+
+
+def make_random_rdl(seed: int) -> str:
+    """
+    Generates a regfile array of register arrays, with gaps between array
+    elements and between components
+    """
+    rng = random.Random(seed)
+    regs = []
+    offset = 0
+    for i in range(rng.randint(2, 4)):
+        n_elements = rng.randint(1, 4)
+        stride = 4 * rng.randint(1, 3)
+        regs.append(
+            "reg { field {} f[32]; } r%d[%d] @ 0x%x += 0x%x;"
+            % (i, n_elements, offset, stride)
+        )
+        offset += n_elements * stride + 4 * rng.randint(0, 2)
+    return """
+        regfile rf_t { %s };
+        addrmap top {
+            reg { field {} f[32]; } first @ 0x%x;
+            rf_t rf[%d] @ 0x100 += 0x%x;
+        };
+    """ % (" ".join(regs), 4 * rng.randint(0, 4), rng.randint(1, 3), offset + 4 * rng.randint(0, 4))
+
+
+def test_lookup_matches_flat_map(compile_rdl):
+    for seed in range(8):
+        table = AddressTable(compile_rdl(make_random_rdl(seed)))
+        expected = {}
+        for path, address, size, _ in table.iter_flat():
+            for offset in range(size):
+                expected[address + offset] = (path, address, offset)
+        for address in range(max(expected) + 8):
+            match = table.lookup(address)
+            if address in expected:
+                assert (match.path, match.address, match.offset) == expected[address], (seed, address)
+            else:
+                assert match is None, (seed, address)
@@ -0,0 +1,52 @@
+import re
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        reg {
+            field {sw=rw; hw=r; hdl_path_slice = '{"q[3]", "q[2]", "q[1]", "q[0]"};} plain[4];
+            field {sw=rw; hw=r; hdl_path_slice = '{"u.q[3]", "u.q[2]"};} hier[2];
+            field {sw=rw; hw=r; hdl_path_slice = '{"m[1][1]", "m[1][0]"};} multi[2];
+            field {sw=rw; hw=r; hdl_path_slice = '{"a[1]", "b[0]"};} mixed[2];
+            field {sw=rw; hw=r; hdl_path_slice = '{"c[5]", "c[3]"};} gap[2];
+            field {sw=rw; hw=r; hdl_path_slice = '{"e[2]", "e[1]", "e_x", "e[0]"};} partial[4];
+            field {sw=rw; hw=r; hdl_path_slice = '{"d[7:0]"};} whole[8];
+        } r1;
+    };
+"""
+
+
+def get_slices(compile_rdl, tmp_path) -> list:
+    path = str(tmp_path / "top_uvm.sv")
+    UVMExporter().export(compile_rdl(RDL_SRC), path, compact_hdl_paths=True)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return [
+        (slice_path, int(lsb), int(width))
+        for slice_path, lsb, width in re.findall(r'add_hdl_path_slice\("([^"]*)", (\d+), (\d+)\)', text)
+    ]
+
+
+def test_compact_slices(compile_rdl, tmp_path):
+    assert get_slices(compile_rdl, tmp_path) == [
+        # Consecutive bits of a signal are merged
+        ("q[3:0]", 0, 4),
+        # Hierarchical paths, multi-dimensional selects, different signals and
+        # non-consecutive bits are kept as they are
+        ("u.q[3]", 5, 1),
+        ("u.q[2]", 4, 1),
+        ("m[1][1]", 7, 1),
+        ("m[1][0]", 6, 1),
+        ("a[1]", 9, 1),
+        ("b[0]", 8, 1),
+        ("c[5]", 11, 1),
+        ("c[3]", 10, 1),
+        # A field is only merged if all of its slices can be
+        ("e[2]", 15, 1),
+        ("e[1]", 14, 1),
+        ("e_x", 13, 1),
+        ("e[0]", 12, 1),
+        ("d[7:0]", 16, 8),
+    ]
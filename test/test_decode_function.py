@@ -0,0 +1,67 @@
+import os
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {} f[32]; } ctrl @ 0x0;
+        reg { field {sw=r; hw=w;} f[32]; } status @ 0x8;
+        reg { field {sw=w; hw=r;} f[32]; } cmd @ 0x8;
+        reg { field {} f[32]; } arr[4] @ 0x10 += 0x8;
+        regfile { reg { field {} f[32]; } r1 @ 0x0; } sub @ 0x40;
+        external mem { mementries = 4; memwidth = 32; } buf @ 0x80;
+        reg { field {} f[32]; } grid[2][3] @ 0x100 += 0x4;
+    };
+"""
+
+
+def get_group_names(groups: list) -> list:
+    return [(start, end, [child.inst_name for child in children]) for start, end, children in groups]
+
+
+def test_decode_groups(compile_rdl):
+    top = compile_rdl(RDL_SRC)
+    exporter = UVMExporter()
+
+    # Registers that share an address share a group. Memories are not
+    # decoded
+    assert get_group_names(exporter._get_decode_groups(top)) == [
+        (0x0, 0x4, ["ctrl"]),
+        (0x8, 0xc, ["status", "cmd"]),
+        (0x10, 0x30, ["arr"]),
+        (0x40, 0x44, ["sub"]),
+        (0x100, 0x118, ["grid"]),
+    ]
+
+    # Nor are registers modeled as virtual registers
+    exporter = UVMExporter()
+    exporter.vreg_array_threshold = 4
+    assert get_group_names(exporter._get_decode_groups(top)) == [
+        (0x0, 0x4, ["ctrl"]),
+        (0x8, 0xc, ["status", "cmd"]),
+        (0x40, 0x44, ["sub"]),
+    ]
+
+
+def test_array_index_exprs(compile_rdl):
+    top = compile_rdl(RDL_SRC)
+    exporter = UVMExporter()
+    grid = top.get_child_by_name("grid")
+    assert exporter._get_array_index_exprs(grid, "rel") == ["rel / 'hc", "(rel / 'h4) % 3"]
+    arr = top.get_child_by_name("arr")
+    assert exporter._get_array_index_exprs(arr, "rel") == ["rel / 'h8"]
+
+
+def test_export(compile_rdl, tmp_path):
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(compile_rdl(RDL_SRC), path, decode_function=True)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    decode_reg = text[text.index("class top extends"):]
+    decode_reg = decode_reg[decode_reg.index("decode_reg("):decode_reg.index("endfunction : decode_reg")]
+    assert "if (rel % 'h8 < 'h4) return this.arr[rel / 'h8];" in decode_reg
+    assert "return this.grid[rel / 'hc][(rel / 'h4) % 3];" in decode_reg
+    assert "return this.sub.decode_reg(offset - 'h40);" in decode_reg
+    assert "this.buf" not in decode_reg
@@ -0,0 +1,65 @@
+import os
+import re
+import json
+import hashlib
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        regfile { reg { field {} f[32]; } ctrl @ 0x0; } sub[2] @ 0x100 += 0x10;
+        reg { field {} f[%d]; } status @ 0x0;
+    };
+"""
+
+
+def export(top, out_dir: str, **kwargs) -> tuple:
+    """
+    Returns the exported text and manifest
+    """
+    os.mkdir(out_dir)
+    path = os.path.join(out_dir, "top_uvm.sv")
+    UVMExporter().export(top, path, deterministic=True, **kwargs)
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    with open(path + ".manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return text, manifest
+
+
+def test_sorted_classes(compile_rdl, tmp_path):
+    text, manifest = export(compile_rdl(RDL_SRC % 32), str(tmp_path / "out"))
+
+    # Classes are sorted by name, and declared before any of them is defined
+    classes = re.findall(r"^\s*class (\w+) extends", text, re.M)
+    assert classes == sorted(classes) == ["top", "top__status", "top__sub", "top__sub__ctrl"]
+    declarations = re.findall(r"^\s*typedef class (\w+);", text, re.M)
+    assert declarations == classes
+    assert text.index("typedef class") < text.index("class top extends")
+
+    assert sorted(manifest["classes"]) == classes
+    with open(str(tmp_path / "out" / "top_uvm.sv"), "rb") as f:
+        assert manifest["files"] == {"top_uvm.sv": hashlib.sha256(f.read()).hexdigest()}
+
+
+def test_manifest_class_hashes(compile_rdl, tmp_path):
+    # Only the hashes of the classes that changed differ between exports
+    _, first = export(compile_rdl(RDL_SRC % 32), str(tmp_path / "first"))
+    _, second = export(compile_rdl(RDL_SRC % 16), str(tmp_path / "second"))
+
+    changed = sorted(name for name in first["classes"] if first["classes"][name] != second["classes"][name])
+    assert changed == ["top__status"]
+
+
+def test_split_files(compile_rdl, tmp_path):
+    text, manifest = export(compile_rdl(RDL_SRC % 32), str(tmp_path / "out"), split_by="class")
+
+    # Split files are included in order of their names, and each one is
+    # listed in the manifest
+    includes = re.findall(r'`include "(top_uvm__\w+\.svh)"', text)
+    assert includes == sorted(includes)
+    assert sorted(manifest["files"]) == sorted(includes + ["top_uvm.sv"])
+    for name in includes:
+        with open(str(tmp_path / "out" / name), "rb") as f:
+            assert manifest["files"][name] == hashlib.sha256(f.read()).hexdigest()
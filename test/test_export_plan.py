@@ -0,0 +1,140 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from systemrdl import RDLCompiler
+
+import peakrdl_uvm
+from peakrdl_uvm import UVMExporter, ExportPlan
+
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+
+# (class naming options the plan is built with, other export options)
+VARIANTS = [
+    ({}, {}),
+    ({"reuse_class_definitions": False}, {"use_uvm_factory": True}),
+    ({"structural_class_names": True}, {"compact_hdl_paths": True, "include_coverage": True}),
+    ({"merge_similar_classes": True}, {"decode_function": True}),
+    ({}, {"burst_helpers": True, "register_masks": True, "build_table_threshold": 2}),
+]
+
+
+@pytest.fixture(scope="module")
+def basic_top():
+    rdlc = RDLCompiler()
+    rdlc.compile_file(os.path.join(this_dir, "testcases", "basic.rdl"))
+    return rdlc.elaborate().top
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("analysis_options,options", VARIANTS)
+def test_plan_export(basic_top, tmp_path, analysis_options, options):
+    direct_path = str(tmp_path / "direct" / "basic_uvm.sv")
+    plan_path = str(tmp_path / "plan" / "basic_uvm.sv")
+    os.mkdir(os.path.dirname(direct_path))
+    os.mkdir(os.path.dirname(plan_path))
+
+    UVMExporter().export(basic_top, direct_path, **analysis_options, **options)
+
+    UVMExporter().build_plan(basic_top, **analysis_options).save(str(tmp_path / "basic.plan"))
+    plan = ExportPlan.load(str(tmp_path / "basic.plan"))
+    UVMExporter().export(plan, plan_path, **options)
+
+    assert read_file(plan_path) == read_file(direct_path)
+
+
+def test_plan_export_in_other_process(basic_top, tmp_path):
+    direct_path = str(tmp_path / "direct" / "basic_uvm.sv")
+    plan_path = str(tmp_path / "plan" / "basic_uvm.sv")
+    os.mkdir(os.path.dirname(direct_path))
+    os.mkdir(os.path.dirname(plan_path))
+
+    UVMExporter().export(basic_top, direct_path, use_uvm_factory=True)
+
+    UVMExporter().build_plan(basic_top).save(str(tmp_path / "basic.plan"))
+    subprocess.run(
+        [
+            sys.executable, "-c",
+            "import sys\n"
+            "from peakrdl_uvm import UVMExporter, ExportPlan\n"
+            "plan = ExportPlan.load(sys.argv[1])\n"
+            "UVMExporter().export(plan, sys.argv[2], use_uvm_factory=True)\n",
+            str(tmp_path / "basic.plan"), plan_path,
+        ],
+        check=True
+    )
+
+    assert read_file(plan_path) == read_file(direct_path)
+
+
+def test_plan_reanalyzed(basic_top, tmp_path):
+    # Class naming options that differ from the plan's are applied by
+    # analyzing the plan again
+    direct_path = str(tmp_path / "direct" / "basic_uvm.sv")
+    plan_path = str(tmp_path / "plan" / "basic_uvm.sv")
+    os.mkdir(os.path.dirname(direct_path))
+    os.mkdir(os.path.dirname(plan_path))
+
+    UVMExporter().export(basic_top, direct_path, reuse_class_definitions=False)
+
+    UVMExporter().build_plan(basic_top).save(str(tmp_path / "basic.plan"))
+    plan = ExportPlan.load(str(tmp_path / "basic.plan"))
+    UVMExporter().export(plan, plan_path, reuse_class_definitions=False)
+
+    assert read_file(plan_path) == read_file(direct_path)
+
+
+def test_not_a_plan(tmp_path):
+    path = str(tmp_path / "basic.plan")
+    with open(path, "wb") as f:
+        f.write(b"not a plan")
+    with pytest.raises(ValueError):
+        ExportPlan.load(path)
+
+
+def test_user_defined_properties(compile_rdl, tmp_path):
+    # User templates render the same output from a plan, including the
+    # values of user-defined properties
+    top = compile_rdl("""
+        enum color_e { red = 0; green = 1; };
+        property my_udp { type = longint unsigned; component = field; };
+        property color_udp { type = color_e; component = reg; };
+        addrmap top {
+            reg { color_udp = color_e::green; field {my_udp = 3; encode = color_e;} f[1]; } first;
+            reg { field {} f[1]; } second;
+        };
+    """)
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    with open(os.path.join(os.path.dirname(peakrdl_uvm.__file__), "templates", "uvm_reg.sv"), "r", encoding="utf-8") as f:
+        template = f.read()
+    with open(str(template_dir / "uvm_reg.sv"), "w", encoding="utf-8") as f:
+        f.write(template.replace(
+            "// {{get_class_friendly_name(node)}}\n",
+            "// {{get_class_friendly_name(node)}} {{node.get_property('color_udp')}}"
+            "{% for field in node.fields() %} {{field.get_property('my_udp')}}{% endfor %}\n"
+        ))
+
+    direct_path = str(tmp_path / "direct" / "top_uvm.sv")
+    plan_path = str(tmp_path / "plan" / "top_uvm.sv")
+    os.mkdir(os.path.dirname(direct_path))
+    os.mkdir(os.path.dirname(plan_path))
+
+    UVMExporter(user_template_dir=str(template_dir)).export(top, direct_path)
+
+    UVMExporter().build_plan(top).save(str(tmp_path / "top.plan"))
+    plan = ExportPlan.load(str(tmp_path / "top.plan"))
+    UVMExporter(user_template_dir=str(template_dir)).export(plan, plan_path)
+
+    assert b"color_e.green 3" in read_file(direct_path)
+    assert read_file(plan_path) == read_file(direct_path)
+
+    field = plan.top.get_child_by_name("first").get_child_by_name("f")
+    assert field.get_property("encode").type_name == "color_e"
@@ -0,0 +1,115 @@
+from itertools import product
+
+from systemrdl.rdltypes import AccessType, OnReadType, OnWriteType
+
+from peakrdl_uvm import FIELD_ACCESS_TABLE, get_field_access
+
+
+def reference_field_access(sw, onread, onwrite):
+    """
+    The sw/onread/onwrite mapping UVMExporter used before FIELD_ACCESS_TABLE
+    """
+    if sw == AccessType.rw:
+        if (onwrite is None) and (onread is None):
+            return "RW"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.woset):
+            return "W1SRC"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wzs):
+            return "W0SRC"
+        elif (onread == OnReadType.rclr) and (onwrite == OnWriteType.wset):
+            return "WSRC"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.woclr):
+            return "W1CRS"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wzc):
+            return "W0CRS"
+        elif (onread == OnReadType.rset) and (onwrite == OnWriteType.wclr):
+            return "WCRS"
+        elif onwrite == OnWriteType.woclr:
+            return "W1C"
+        elif onwrite == OnWriteType.woset:
+            return "W1S"
+        elif onwrite == OnWriteType.wot:
+            return "W1T"
+        elif onwrite == OnWriteType.wzc:
+            return "W0C"
+        elif onwrite == OnWriteType.wzs:
+            return "W0S"
+        elif onwrite == OnWriteType.wzt:
+            return "W0T"
+        elif onwrite == OnWriteType.wclr:
+            return "WC"
+        elif onwrite == OnWriteType.wset:
+            return "WS"
+        elif onread == OnReadType.rclr:
+            return "WRC"
+        elif onread == OnReadType.rset:
+            return "WRS"
+        else:
+            return "RW"
+
+    elif sw == AccessType.r:
+        if onread is None:
+            return "RO"
+        elif onread == OnReadType.rclr:
+            return "RC"
+        elif onread == OnReadType.rset:
+            return "RS"
+        else:
+            return "RO"
+
+    elif sw == AccessType.w:
+        if onwrite is None:
+            return "WO"
+        elif onwrite == OnWriteType.wclr:
+            return "WOC"
+        elif onwrite == OnWriteType.wset:
+            return "WOS"
+        else:
+            return "WO"
+
+    elif sw == AccessType.rw1:
+        return "W1"
+
+    elif sw == AccessType.w1:
+        return "WO1"
+
+    else: # na
+        return "NOACCESS"
+
+
+def test_table_matches_reference():
+    combinations = list(product(
+        AccessType, [None] + list(OnReadType), [None] + list(OnWriteType)
+    ))
+    assert len(FIELD_ACCESS_TABLE) == len(combinations)
+    for key in combinations:
+        assert FIELD_ACCESS_TABLE[key] == reference_field_access(*key), key
+
+
+def test_get_field_access(compile_rdl):
+    top = compile_rdl("""
+        addrmap top {
+            reg {
+                field {sw=rw; hw=r;} f_rw[1];
+                field {sw=r; hw=w;} f_ro[1];
+                field {sw=w; hw=r;} f_wo[1];
+                field {sw=rw; hw=r; onwrite=woclr;} f_w1c[1];
+                field {sw=rw; hw=r; onread=rclr; onwrite=woset;} f_w1src[1];
+                field {sw=r; hw=w; onread=rset;} f_rs[1];
+                field {sw=w; hw=r; onwrite=wclr;} f_woc[1];
+                field {sw=rw1; hw=r;} f_w1[1];
+            } r1;
+        };
+    """)
+    expected = {
+        "f_rw": "RW",
+        "f_ro": "RO",
+        "f_wo": "WO",
+        "f_w1c": "W1C",
+        "f_w1src": "W1SRC",
+        "f_rs": "RS",
+        "f_woc": "WOC",
+        "f_w1": "W1",
+    }
+    fields = top.get_child_by_name("r1").fields()
+    assert {field.inst_name: get_field_access(field) for field in fields} == expected
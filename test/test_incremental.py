@@ -0,0 +1,48 @@
+import os
+
+from peakrdl_uvm import UVMExporter
+from peakrdl_uvm.incremental import ExportState
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {sw=rw; hw=r;} f[8] = 0; } r1 @ 0x0;
+        reg { field {sw=r; hw=w;} f[8]; } r2 @ 0x4;
+    };
+"""
+
+
+def test_state_path(tmp_path, monkeypatch):
+    state_dir = str(tmp_path / "state")
+    monkeypatch.chdir(str(tmp_path))
+
+    # Outputs with the same name in different directories have their own state
+    state_a = ExportState(state_dir, os.path.join("a", "top_uvm.sv"))
+    state_b = ExportState(state_dir, os.path.join("b", "top_uvm.sv"))
+    assert state_a.path != state_b.path
+    assert os.path.basename(state_a.path).startswith("top_uvm.sv.")
+
+    # The same output has the same state, however its path is written
+    state_abs = ExportState(state_dir, os.path.join(str(tmp_path), "a", "top_uvm.sv"))
+    assert state_abs.path == state_a.path
+
+
+def test_shared_state_dir(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    state_dir = str(tmp_path / "state")
+    paths = []
+    for name in ("a", "b"):
+        os.mkdir(str(tmp_path / name))
+        paths.append(str(tmp_path / name / "top_uvm.sv"))
+
+    UVMExporter().export(top, paths[0], state_dir=state_dir)
+    UVMExporter().export(top, paths[1], state_dir=state_dir, use_uvm_factory=True)
+    assert len(os.listdir(state_dir)) == 2
+
+    # Exporting again re-uses each output's own state
+    UVMExporter().export(top, str(tmp_path / "fresh_uvm.sv"))
+    with open(str(tmp_path / "fresh_uvm.sv"), "r", encoding="utf-8") as f:
+        expected = f.read()
+    UVMExporter().export(top, paths[0], state_dir=state_dir)
+    with open(paths[0], "r", encoding="utf-8") as f:
+        assert f.read() == expected.replace("fresh_uvm", "top_uvm")
@@ -0,0 +1,77 @@
+import os
+import re
+
+import pytest
+
+from systemrdl import RDLCompileError
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        regfile { reg { field {} f[32]; } ctrl @ 0x0; } sub[2] @ 0x100 += 0x10;
+        reg { field {} f[32]; } status @ 0x0;
+    };
+"""
+
+
+def read_export(top, tmp_path, **kwargs) -> str:
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, **kwargs)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def get_function_body(text: str, cls: str, name: str) -> str:
+    cls_body = re.search(r"class %s extends .*?endclass : %s" % (cls, cls), text, re.S).group(0)
+    return re.search(r"function .*?\b%s\(.*?endfunction : %s" % (name, name), cls_body, re.S).group(0)
+
+
+def test_accessors(compile_rdl, tmp_path):
+    text = read_export(compile_rdl(RDL_SRC), tmp_path, lazy_build=True)
+
+    # build() only creates the address map
+    build = get_function_body(text, "top", "build")
+    assert "create_map" in build
+    assert "status" not in build
+    assert "sub" not in build
+
+    # Children are built by their accessors, array elements one at a time
+    accessor = get_function_body(text, "top", "get_sub")
+    assert "virtual function top__sub get_sub(int i0);" in accessor
+    assert "if (this.sub[i0] == null) begin" in accessor
+    assert "this.default_map.add_submap(this.sub[i0].default_map, 'h100 + i0*'h10);" in accessor
+    assert "virtual function top__status get_status();" in text
+
+    build_all = get_function_body(text, "top", "build_all")
+    assert "void'(this.get_status());" in build_all
+    assert "this.sub[i0].build_all();" in build_all
+    assert "void'(this.get_ctrl());" in get_function_body(text, "top__sub", "build_all")
+
+    # Without lazy_build, build() creates all children
+    text = read_export(compile_rdl(RDL_SRC), tmp_path)
+    assert "get_status" not in text
+    assert "this.status = new(\"status\");" in get_function_body(text, "top", "build")
+
+
+def test_accessor_name_clash(compile_rdl, tmp_path):
+    top = compile_rdl("""
+        addrmap top {
+            reg { field {} f[32]; } maps @ 0x0;
+        };
+    """)
+
+    # get_maps() is only generated in lazy build mode
+    read_export(top, tmp_path)
+
+    with pytest.raises(RDLCompileError, match="get_maps"):
+        read_export(top, tmp_path, lazy_build=True)
+
+
+def test_invalid_options(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    with pytest.raises(ValueError, match="lazy_build"):
+        read_export(top, tmp_path, lazy_build=True, merge_similar_classes=True)
+    with pytest.raises(ValueError, match="lazy_build"):
+        read_export(top, tmp_path, lazy_build=True, burst_helpers=True)
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from systemrdl import RDLCompiler
+
+from peakrdl_uvm import UVMExporter
+from peakrdl_uvm.parallel import run_tasks, can_fork
+
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+
+VARIANTS = [
+    {},
+    {"split_depth": 2},
+    {"use_uvm_factory": True, "export_as_package": False},
+    {"deterministic": True},
+]
+
+
+@pytest.fixture(scope="module")
+def basic_top():
+    rdlc = RDLCompiler()
+    rdlc.compile_file(os.path.join(this_dir, "testcases", "basic.rdl"))
+    return rdlc.elaborate().top
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def square(state, i):
+    return state * i * i
+
+
+def test_run_tasks():
+    # Results are returned in task order, whether or not they are computed
+    # in worker processes
+    assert run_tasks(square, 2, 20, jobs=4) == [2 * i * i for i in range(20)]
+    assert run_tasks(square, 2, 20) == [2 * i * i for i in range(20)]
+    assert run_tasks(square, 2, 0, jobs=4) == []
+
+
+@pytest.mark.skipif(not can_fork(), reason="requires a platform that can fork processes")
+@pytest.mark.parametrize("options", VARIANTS)
+def test_parallel_export(basic_top, tmp_path, options):
+    # Classes are named before rendering starts, so the output is identical
+    # to the one of a single process
+    serial_path = str(tmp_path / "serial" / "basic_uvm.sv")
+    parallel_path = str(tmp_path / "parallel" / "basic_uvm.sv")
+    os.mkdir(os.path.dirname(serial_path))
+    os.mkdir(os.path.dirname(parallel_path))
+
+    UVMExporter().export(basic_top, serial_path, **options)
+    UVMExporter().export(basic_top, parallel_path, jobs=3, **options)
+
+    assert read_file(parallel_path) == read_file(serial_path)
+
+
+@pytest.mark.skipif(not can_fork(), reason="requires a platform that can fork processes")
+def test_parallel_export_many(basic_top, tmp_path):
+    targets = [
+        (str(tmp_path / "basic_uvm.sv"), {}),
+        (str(tmp_path / "basic_uvm_fac.sv"), {"use_uvm_factory": True}),
+        (str(tmp_path / "basic_uvm_noreuse.sv"), {"reuse_class_definitions": False}),
+    ]
+    os.mkdir(str(tmp_path / "serial"))
+    for path, options in targets:
+        UVMExporter().export(basic_top, str(tmp_path / "serial" / os.path.basename(path)), **options)
+
+    UVMExporter().export_many(basic_top, targets, jobs=3)
+
+    for path, _ in targets:
+        assert read_file(path) == read_file(str(tmp_path / "serial" / os.path.basename(path)))
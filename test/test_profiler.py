@@ -0,0 +1,59 @@
+import os
+import json
+
+from peakrdl_uvm import UVMExporter, ExportProfiler
+
+
+RDL_SRC = """
+    addrmap top {
+        regfile { reg { field {} f[32]; } ctrl @ 0x0; } sub[2] @ 0x100 += 0x10;
+        reg { field {} f[32]; } status @ 0x0;
+    };
+"""
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_report(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    profiler = ExportProfiler()
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"), profiler=profiler)
+
+    report = profiler.report()
+    assert set(report) == {"phases", "macros", "helpers"}
+    assert {"render", "write"} <= set(report["phases"])
+
+    # Two register classes, and one block class per regfile and addrmap
+    assert report["macros"]["uvm_reg.class_definition"]["calls"] == 2
+    assert report["macros"]["uvm_reg_block.class_definition"]["calls"] == 2
+    assert report["helpers"]["get_class_name"]["calls"] > 0
+    for section in report.values():
+        for stat in section.values():
+            assert stat["time"] >= 0
+
+    # Results are sorted by time
+    times = [stat["time"] for stat in report["macros"].values()]
+    assert times == sorted(times, reverse=True)
+
+    profiler.write_json(str(tmp_path / "report.json"))
+    with open(str(tmp_path / "report.json"), "r", encoding="utf-8") as f:
+        assert json.load(f) == report
+
+
+def test_accumulate(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    profiler = ExportProfiler()
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"), profiler=profiler)
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"), profiler=profiler)
+    assert profiler.report()["macros"]["uvm_reg.class_definition"]["calls"] == 4
+
+
+def test_output_unchanged(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    os.mkdir(str(tmp_path / "profiled"))
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"))
+    UVMExporter().export(top, str(tmp_path / "profiled" / "top_uvm.sv"), profiler=ExportProfiler())
+    assert read_file(str(tmp_path / "profiled" / "top_uvm.sv")) == read_file(str(tmp_path / "top_uvm.sv"))
@@ -0,0 +1,98 @@
+import json
+
+from peakrdl_uvm import UVMExporter, RegisterDB, get_field_access
+from peakrdl_uvm.register_db import RegisterRecord, FieldRecord
+from peakrdl_uvm.register_db import iter_register_records, write_register_db, write_register_db_json
+
+
+RDL_SRC = """
+    regfile rf_t {
+        reg {
+            field {sw=rw; hw=r;} en[1] = 1;
+            field {sw=r; hw=w;} status[8:1];
+        } ctrl @ 0x0;
+        reg {
+            field {sw=rw; hw=r; onwrite=woclr; hdl_path_slice = '{"irq"};} irq[16] = 0xABCD;
+        } intr[4] @ 0x10 += 0x8;
+    };
+    addrmap top {
+        rf_t rf[2] @ 0x1000 += 0x100;
+        external mem { mementries = 16; memwidth = 32; } buf @ 0x2000;
+        reg { regwidth = 64; field {sw=rw; hw=r;} wide[64] = 0x123456789ABCDEF0; } wide_reg @ 0x3000;
+    };
+"""
+
+
+def get_records(top) -> list:
+    return sorted(iter_register_records(top, get_field_access), key=lambda record: record.address)
+
+
+def test_binary_round_trip(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    records = get_records(top)
+    path = str(tmp_path / "top.regdb")
+    write_register_db(records, path)
+
+    with RegisterDB(path) as db:
+        assert len(db) == len(records) == 2 * (1 + 4) + 2
+        assert list(db) == records
+        assert db[-1] == records[-1]
+
+
+def test_json_round_trip(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    records = get_records(top)
+    path = str(tmp_path / "top.json")
+    write_register_db_json(records, path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    loaded = [
+        RegisterRecord(
+            reg["path"], reg["address"], reg["size"], reg["width"],
+            [FieldRecord(**field) for field in reg["fields"]]
+        )
+        for reg in data["registers"]
+    ]
+    assert loaded == records
+
+
+def test_lookup(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    path = str(tmp_path / "top.regdb")
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"), register_db=path)
+
+    with RegisterDB(path) as db:
+        # Hit
+        record = db.lookup(0x1000)
+        assert record.path == "top.rf[0].ctrl"
+        assert [field.name for field in record.fields] == ["en", "status"]
+        assert record.fields[0].reset == 1
+        assert record.fields[0].has_reset
+        assert record.fields[1].is_volatile
+        assert not record.fields[1].has_reset
+
+        # Array element, with an address inside the register
+        record = db.lookup(0x1100 + 0x10 + 2 * 0x8 + 3)
+        assert record.path == "top.rf[1].intr[2]"
+        assert record.address == 0x1120
+        assert record.fields[0].access == "W1C"
+        assert record.fields[0].reset == 0xABCD
+        assert record.fields[0].hdl_path == "irq"
+
+        # Memory
+        record = db.lookup(0x2000 + 0x3C)
+        assert record.path == "top.buf"
+        assert record.fields == []
+
+        record = db.lookup(0x3004)
+        assert record.path == "top.wide_reg"
+        assert record.fields[0].reset == 0x123456789ABCDEF0
+
+        # Misses: before the first register, between registers, between
+        # array elements and past the last register
+        assert db.lookup(0x0) is None
+        assert db.lookup(0x1004) is None
+        assert db.lookup(0x1014) is None
+        assert db.lookup(0x1200) is None
+        assert db.lookup(0x3008) is None
@@ -0,0 +1,44 @@
+import os
+import re
+
+from peakrdl_uvm import UVMExporter
+
+
+def get_register_masks(path: str) -> dict:
+    """
+    Returns the mask constants of each register class of the exported model
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    masks = {}
+    for cls, body in re.findall(r"class (\w+) extends uvm_reg;(.*?)endclass", text, re.S):
+        masks[cls] = dict(
+            (name, int(value, 16))
+            for name, value in re.findall(r"localparam uvm_reg_data_t (\w+) = 'h(\w+);", body)
+        )
+    return masks
+
+
+def test_gaps_between_fields(compile_rdl, tmp_path):
+    top = compile_rdl("""
+        addrmap top {
+            reg {
+                field {sw=rw; hw=r;} ctrl[3:0] = 0x5;
+                field {sw=r; hw=w;} status[11:8];
+                field {sw=w; hw=r;} cmd[19:16] = 0;
+                field {sw=rw; hw=r;} data[27:24] = 0xA;
+            } gaps;
+        };
+    """)
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, register_masks=True, fast_mirror_check=True)
+    masks = get_register_masks(path)["top__gaps"]
+
+    assert masks["RESET_VALUE"] == 0x0A000005
+    assert masks["HAS_RESET_MASK"] == 0x0F0F000F
+    assert masks["VOLATILE_MASK"] == 0x00000F00
+    assert masks["READ_MASK"] == 0x0F000F0F
+    assert masks["WRITE_MASK"] == 0x0F0F000F
+    # Only ctrl and data are compared. The volatile and write-only fields
+    # and the unimplemented bits are not
+    assert masks["DONT_CARE_MASK"] == 0xF0FFFFF0
@@ -0,0 +1,87 @@
+import os
+import re
+
+import pytest
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        regfile { reg { field {} f[32]; } ctrl @ 0x0; } sub[2] @ 0x100 += 0x10;
+        reg { field {} f[32]; } status @ 0x0;
+    };
+"""
+
+
+def read_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def get_includes(path: str) -> list:
+    return re.findall(r'`include "(top_uvm__\w+\.svh)"', read_file(path))
+
+
+def get_classes(text: str) -> list:
+    return re.findall(r"^\s*class (\w+) extends", text, re.M)
+
+
+def test_split_by_class(compile_rdl, tmp_path):
+    os.mkdir(str(tmp_path / "out"))
+    path = str(tmp_path / "out" / "top_uvm.sv")
+    UVMExporter().export(compile_rdl(RDL_SRC), path, split_by="class")
+
+    # Each class gets its own file, included in dependency order
+    includes = get_includes(path)
+    assert includes == [
+        "top_uvm__top__status.svh",
+        "top_uvm__top__sub__ctrl.svh",
+        "top_uvm__top__sub.svh",
+        "top_uvm__top.svh",
+    ]
+    assert sorted(os.listdir(str(tmp_path / "out"))) == sorted(includes + ["top_uvm.sv"])
+    assert get_classes(read_file(str(tmp_path / "out" / "top_uvm__top__sub.svh"))) == ["top__sub"]
+
+
+def test_split_by_block(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    single_path = str(tmp_path / "single" / "top_uvm.sv")
+    os.mkdir(os.path.dirname(single_path))
+    UVMExporter().export(top, single_path)
+
+    path = str(tmp_path / "top_uvm.sv")
+    UVMExporter().export(top, path, split_by="block")
+
+    # Classes are grouped by child of the top-level node
+    includes = get_includes(path)
+    assert includes == ["top_uvm__status.svh", "top_uvm__sub.svh", "top_uvm__top.svh"]
+    assert get_classes(read_file(str(tmp_path / "top_uvm__sub.svh"))) == ["top__sub__ctrl", "top__sub"]
+
+    # The split files hold the same classes as a single-file export, in the
+    # same order
+    classes = []
+    for include in includes:
+        classes.extend(get_classes(read_file(str(tmp_path / include))))
+    assert classes == get_classes(read_file(single_path))
+
+
+def test_split_in_parallel(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    for jobs in (1, 2):
+        os.mkdir(str(tmp_path / str(jobs)))
+        UVMExporter().export(top, str(tmp_path / str(jobs) / "top_uvm.sv"), split_by="class", jobs=jobs)
+
+    files = sorted(os.listdir(str(tmp_path / "1")))
+    assert sorted(os.listdir(str(tmp_path / "2"))) == files
+    for name in files:
+        assert read_file(str(tmp_path / "2" / name)) == read_file(str(tmp_path / "1" / name))
+
+
+def test_invalid_options(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    path = str(tmp_path / "top_uvm.sv")
+    with pytest.raises(ValueError, match="split_by"):
+        UVMExporter().export(top, path, split_by="file")
+    with pytest.raises(ValueError, match="split_depth"):
+        UVMExporter().export(top, path, split_by="block", split_depth=0)
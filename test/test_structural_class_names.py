@@ -0,0 +1,76 @@
+import os
+import re
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {sw=rw;} f[1]; } explicit_default;
+        reg { field {} f[1]; } implicit_default;
+        reg { field {rclr;} f[1]; } rclr_reg;
+        reg { field {onread=rclr;} f[1]; } onread_reg;
+        reg { field {sw=r; hw=w;} f[1]; } read_only;
+    };
+"""
+
+
+def get_member_classes(path: str) -> dict:
+    """
+    Returns the class names of the registers of the exported block
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return dict(
+        (name, cls) for cls, name in re.findall(r"rand (\w+) (\w+);", text)
+        if not cls.startswith("uvm_")
+    )
+
+
+def test_resolved_properties(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, structural_class_names=True)
+    classes = get_member_classes(path)
+
+    # Properties are compared by their resolved value
+    assert classes["explicit_default"] == classes["implicit_default"]
+    assert classes["rclr_reg"] == classes["onread_reg"]
+    assert classes["explicit_default"] != classes["read_only"]
+    assert classes["explicit_default"] != classes["rclr_reg"]
+
+
+def test_merge_similar_classes(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, reuse_class_definitions=False, merge_similar_classes=True)
+    classes = get_member_classes(path)
+
+    assert classes["explicit_default"] == classes["implicit_default"]
+    assert classes["rclr_reg"] == classes["onread_reg"]
+    assert len(set(classes.values())) == 3
+
+
+def test_user_defined_properties(compile_rdl, tmp_path):
+    # User templates can render user-defined properties, so they split
+    # classes. Struct values are compared by their members
+    top = compile_rdl("""
+        struct my_s { longint unsigned a; };
+        property my_udp { type = longint unsigned; component = field; };
+        property my_struct_udp { type = my_s; component = reg; };
+        addrmap top {
+            reg { field {my_udp = 1;} f[1]; } first;
+            reg { field {my_udp = 2;} f[1]; } second;
+            reg { field {my_udp = 1;} f[1]; } third;
+            reg { my_struct_udp = my_s'{a: 1}; field {} f[1]; } struct_first;
+            reg { my_struct_udp = my_s'{a: 1}; field {} f[1]; } struct_second;
+            reg { my_struct_udp = my_s'{a: 2}; field {} f[1]; } struct_third;
+        };
+    """)
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, structural_class_names=True)
+    classes = get_member_classes(path)
+    assert classes["first"] != classes["second"]
+    assert classes["first"] == classes["third"]
+    assert classes["struct_first"] == classes["struct_second"]
+    assert classes["struct_first"] != classes["struct_third"]
@@ -0,0 +1,39 @@
+import os
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {} f[32]; } status @ 0x0;
+    };
+"""
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_shared_environment(tmp_path):
+    # Exporters with the same template directories share their compiled
+    # templates
+    assert UVMExporter().jj_env is UVMExporter().jj_env
+    cache_dir = str(tmp_path / "cache")
+    assert UVMExporter(template_cache_dir=cache_dir).jj_env is UVMExporter(template_cache_dir=cache_dir).jj_env
+    assert UVMExporter(template_cache_dir=cache_dir).jj_env is not UVMExporter().jj_env
+    assert UVMExporter(user_template_dir=str(tmp_path)).jj_env is not UVMExporter().jj_env
+
+
+def test_bytecode_cache(compile_rdl, tmp_path):
+    top = compile_rdl(RDL_SRC)
+    cache_dir = str(tmp_path / "cache")
+    os.mkdir(str(tmp_path / "out"))
+
+    UVMExporter().export(top, str(tmp_path / "top_uvm.sv"))
+    UVMExporter(template_cache_dir=cache_dir).export(top, str(tmp_path / "out" / "top_uvm.sv"))
+
+    # Compiled templates are written to the cache directory, and do not
+    # change the output
+    assert any(name.startswith("peakrdl_uvm_") for name in os.listdir(cache_dir))
+    assert read_file(str(tmp_path / "out" / "top_uvm.sv")) == read_file(str(tmp_path / "top_uvm.sv"))
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from systemrdl import RDLCompileError
+
+from peakrdl_uvm import UVMExporter
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {} f[32]; } arr[8] @ 0x0 += 0x4;
+        reg { field {} f[32]; } small[2] @ 0x100 += 0x4;
+    };
+"""
+
+
+def read_export(top, tmp_path, **kwargs) -> str:
+    path = os.path.join(str(tmp_path), "top_uvm.sv")
+    UVMExporter().export(top, path, **kwargs)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_threshold(compile_rdl, tmp_path):
+    text = read_export(compile_rdl(RDL_SRC), tmp_path, vreg_array_threshold=4)
+
+    # Only arrays with at least 4 elements are modeled as virtual registers
+    assert "rand uvm_mem arr_mem;" in text
+    assert "this.default_map.add_mem(this.arr_mem, 'h0);" in text
+    assert "this.arr.configure(this, this.arr_mem, 8, 0, 1);" in text
+    assert "small_mem" not in text
+    assert "[2];" in text
+
+    text = read_export(compile_rdl(RDL_SRC), tmp_path)
+    assert "uvm_mem" not in text
+
+
+def test_mem_name_clash(compile_rdl, tmp_path):
+    top = compile_rdl("""
+        addrmap top {
+            reg { field {} f[32]; } arr[8] @ 0x0 += 0x4;
+            reg { field {} f[32]; } arr_mem @ 0x100;
+        };
+    """)
+
+    # Not a clash unless the array is modeled as a virtual register
+    read_export(top, tmp_path)
+
+    with pytest.raises(RDLCompileError, match="arr_mem"):
+        read_export(top, tmp_path, vreg_array_threshold=4)
@@ -0,0 +1,119 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from systemrdl import RDLCompiler
+
+from peakrdl_uvm import UVMExporter
+from peakrdl_uvm.watch import ExportWatcher, get_watched_paths
+
+
+RDL_SRC = """
+    addrmap top {
+        reg { field {} f[%d]; } status @ 0x0;
+    };
+"""
+
+
+def touch(path: str, stamp: int) -> None:
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_watched_paths(tmp_path):
+    for name in ("top.rdl", "other.rdl", "notes.txt", os.path.join("inc", "defs.rdl"), os.path.join("unused", "x.rdl")):
+        os.makedirs(os.path.dirname(str(tmp_path / name)), exist_ok=True)
+        with open(str(tmp_path / name), "w", encoding="utf-8") as f:
+            f.write("")
+
+    # Input files, and the RDL files next to them or in include paths
+    assert get_watched_paths([str(tmp_path / "top.rdl")], [str(tmp_path / "inc")]) == sorted([
+        str(tmp_path / "top.rdl"),
+        str(tmp_path / "other.rdl"),
+        str(tmp_path / "inc" / "defs.rdl"),
+    ])
+    assert get_watched_paths([str(tmp_path / "top.rdl")], None) == sorted([
+        str(tmp_path / "top.rdl"),
+        str(tmp_path / "other.rdl"),
+    ])
+
+
+def test_update(tmp_path):
+    rdl_path = str(tmp_path / "top.rdl")
+    out_path = str(tmp_path / "top_uvm.sv")
+    exporter = UVMExporter()
+    exports = []
+
+    def export():
+        rdlc = RDLCompiler()
+        rdlc.compile_file(rdl_path)
+        exporter.export(rdlc.elaborate(), out_path)
+        exports.append(out_path)
+
+    with open(rdl_path, "w", encoding="utf-8") as f:
+        f.write(RDL_SRC % 32)
+    touch(rdl_path, 1000000000)
+    watcher = ExportWatcher(export, [rdl_path, str(tmp_path / "missing.rdl")])
+
+    assert watcher.update().startswith("exported in")
+    assert watcher.update() == "up-to-date"
+    assert watcher.update(force=True).startswith("exported in")
+    assert len(exports) == 2
+
+    # Modified input
+    with open(rdl_path, "w", encoding="utf-8") as f:
+        f.write(RDL_SRC % 16)
+    touch(rdl_path, 2000000000)
+    assert watcher.update().startswith("exported in")
+    with open(out_path, "r", encoding="utf-8") as f:
+        assert "this.f.configure(this, 16, 0" in f.read()
+
+    # Errors are reported, and the export is retried on the next
+    # modification
+    with open(rdl_path, "w", encoding="utf-8") as f:
+        f.write("addrmap top {")
+    touch(rdl_path, 3000000000)
+    assert watcher.update() == "error: compilation failed"
+    assert watcher.update() == "up-to-date"
+    assert len(exports) == 3
+
+
+def test_export_error():
+    def export():
+        raise OSError("disk full")
+    watcher = ExportWatcher(export, [])
+    assert watcher.update() == "error: disk full"
+
+
+def send_request(path: str, request: str) -> str:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) # pylint: disable=no-member
+    with client:
+        client.connect(path)
+        client.sendall((request + "\n").encode("utf-8"))
+        return client.makefile("r").readline().strip()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+def test_serve(tmp_path):
+    exports = []
+    watcher = ExportWatcher(lambda: exports.append(1), [])
+    address = str(tmp_path / "uvm.sock")
+    thread = threading.Thread(target=watcher.serve, args=(address,))
+    thread.start()
+    try:
+        for _ in range(100):
+            if os.path.exists(address):
+                break
+            time.sleep(0.05)
+
+        # The server exports when it starts
+        assert send_request(address, "export") == "up-to-date"
+        assert send_request(address, "force").startswith("exported in")
+        assert send_request(address, "rebuild") == "error: unknown request 'rebuild'"
+        assert len(exports) == 2
+    finally:
+        assert send_request(address, "stop") == "stopped"
+        thread.join()
+    assert not os.path.exists(address)